@@ -0,0 +1,263 @@
+import argparse
+import glob
+import gzip
+import hashlib
+import logging
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from UTILS.CONFIGURATION import (
+    DATABASE_BACKUP_LOCATION, DATABASE_BACKUP_KEEP,
+    DATABASE_BACKUP_PAGES_PER_STEP, DATABASE_BACKUP_STEP_SLEEP, DATABASE_BACKUP_MAX_RESTARTS
+)
+
+BACKUP_SUFFIX = '.db.gz'
+CHECKSUM_SUFFIX = '.sha256'
+CHUNK_SIZE = 1024 * 1024
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _integrity_check(db_path):
+    """Return (ok, schema_version) for a plain database file"""
+    conn = sqlite3.connect(db_path)
+    try:
+        result = conn.execute('PRAGMA integrity_check').fetchone()[0]
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+    finally:
+        conn.close()
+    return result == 'ok', version
+
+
+class _BackupRestarted(Exception):
+    """Raised from the progress callback to abandon a paged copy that keeps restarting"""
+
+
+class DatabaseBackup:
+    """
+    Online backups of stats.db through SQLite's backup API.
+
+    Pages are copied DATABASE_BACKUP_PAGES_PER_STEP at a time with a short
+    sleep between steps, so writers only wait for one step rather than the
+    whole copy. A write from another connection restarts a paged copy, so
+    after DATABASE_BACKUP_MAX_RESTARTS restarts it falls back to copying in
+    a single step. Each snapshot is integrity-checked, gzipped, written with a
+    sha256sum-compatible checksum file, and rotated to the newest
+    DATABASE_BACKUP_KEEP copies.
+    """
+
+    def __init__(self, db_path='stats.db', backup_dir=DATABASE_BACKUP_LOCATION, keep=DATABASE_BACKUP_KEEP,
+                 pages_per_step=DATABASE_BACKUP_PAGES_PER_STEP, step_sleep=DATABASE_BACKUP_STEP_SLEEP,
+                 max_restarts=DATABASE_BACKUP_MAX_RESTARTS):
+        self.db_path = db_path
+        self.backup_dir = backup_dir
+        self.keep = keep
+        self.pages_per_step = pages_per_step
+        self.step_sleep = step_sleep
+        self.max_restarts = max_restarts
+
+    def create_backup(self):
+        """Snapshot, verify, compress and rotate. Blocking; run it in an executor from the bot"""
+        os.makedirs(self.backup_dir, exist_ok=True)
+        started = time.perf_counter()
+        name = f"stats_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        snapshot_path = os.path.join(self.backup_dir, f"{name}.db.tmp")
+        backup_path = os.path.join(self.backup_dir, f"{name}{BACKUP_SUFFIX}")
+        steps = {'steps': 0, 'restarts': 0, 'remaining': None}
+
+        def progress(status, remaining, total):
+            steps['steps'] += 1
+            if steps['remaining'] is not None and remaining > steps['remaining']:
+                steps['restarts'] += 1
+                if steps['restarts'] > self.max_restarts:
+                    raise _BackupRestarted()
+            steps['remaining'] = remaining
+
+        try:
+            source = sqlite3.connect(self.db_path)
+            target = sqlite3.connect(snapshot_path)
+            try:
+                try:
+                    source.backup(target, pages=self.pages_per_step, progress=progress, sleep=self.step_sleep)
+                except _BackupRestarted:
+                    logging.warning(f"⚠️ Database backup restarted {steps['restarts']} times under writes, "
+                                    f"copying in one step")
+                    source.backup(target)
+            finally:
+                target.close()
+                source.close()
+
+            ok, version = _integrity_check(snapshot_path)
+            if not ok:
+                raise RuntimeError("snapshot failed integrity check")
+            db_size = os.path.getsize(snapshot_path)
+
+            with open(snapshot_path, 'rb') as raw, gzip.open(backup_path + '.tmp', 'wb') as compressed:
+                shutil.copyfileobj(raw, compressed, CHUNK_SIZE)
+            os.replace(backup_path + '.tmp', backup_path)
+
+            checksum = _sha256(backup_path)
+            with open(backup_path + CHECKSUM_SUFFIX, 'w') as file:
+                file.write(f"{checksum}  {os.path.basename(backup_path)}\n")
+
+        except Exception as e:
+            logging.error(f"❌ Database backup failed: {e}")
+            for path in (backup_path + '.tmp', backup_path, backup_path + CHECKSUM_SUFFIX):
+                if os.path.exists(path):
+                    os.remove(path)
+            return None
+
+        finally:
+            if os.path.exists(snapshot_path):
+                os.remove(snapshot_path)
+
+        removed = self.rotate()
+        result = {
+            'path': backup_path,
+            'size': os.path.getsize(backup_path),
+            'db_size': db_size,
+            'schema_version': version,
+            'sha256': checksum,
+            'steps': steps['steps'],
+            'restarts': steps['restarts'],
+            'seconds': time.perf_counter() - started,
+            'rotated': removed
+        }
+        logging.info(f"✅ Database backed up to {backup_path} ({result['size']:,} bytes from {db_size:,}, "
+                     f"{result['steps']} steps, {result['seconds']:.2f}s)")
+        return result
+
+    def list_backups(self):
+        """Backups newest first, as {'path', 'size', 'created'}"""
+        backups = []
+        for path in glob.glob(os.path.join(self.backup_dir, f"*{BACKUP_SUFFIX}")):
+            backups.append({
+                'path': path,
+                'size': os.path.getsize(path),
+                'created': datetime.fromtimestamp(os.path.getmtime(path))
+            })
+        return sorted(backups, key=lambda backup: backup['created'], reverse=True)
+
+    def latest_backup_time(self):
+        backups = self.list_backups()
+        return backups[0]['created'] if backups else None
+
+    def rotate(self):
+        """Delete all but the newest self.keep backups; returns how many were removed"""
+        removed = 0
+        for backup in self.list_backups()[self.keep:]:
+            for path in (backup['path'], backup['path'] + CHECKSUM_SUFFIX):
+                if os.path.exists(path):
+                    os.remove(path)
+            removed += 1
+        return removed
+
+    def verify_backup(self, backup_path):
+        """Check the checksum, then decompress and integrity-check. Returns (ok, message)"""
+        checksum_path = backup_path + CHECKSUM_SUFFIX
+        if not os.path.exists(backup_path):
+            return False, "backup not found"
+        if not os.path.exists(checksum_path):
+            return False, "checksum file missing"
+
+        with open(checksum_path) as file:
+            expected = file.read().split()[0]
+        if _sha256(backup_path) != expected:
+            return False, "checksum mismatch"
+
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                db_path = self._decompress(backup_path, temp_dir)
+                ok, version = _integrity_check(db_path)
+        except Exception as e:
+            return False, f"unreadable: {e}"
+
+        if not ok:
+            return False, "integrity check failed"
+        return True, f"ok (schema version {version})"
+
+    def restore_backup(self, backup_path, db_path=None):
+        """
+        Verify a backup and copy it over db_path (default: this instance's database)
+        through the backup API. Stop the bot first; open connections would see the
+        database change underneath them.
+        """
+        db_path = db_path or self.db_path
+        ok, message = self.verify_backup(backup_path)
+        if not ok:
+            raise ValueError(f"Refusing to restore {backup_path}: {message}")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            source = sqlite3.connect(self._decompress(backup_path, temp_dir))
+            target = sqlite3.connect(db_path)
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+                source.close()
+
+        logging.info(f"✅ Restored {db_path} from {backup_path}")
+        return message
+
+    def _decompress(self, backup_path, temp_dir):
+        db_path = os.path.join(temp_dir, 'restore.db')
+        with gzip.open(backup_path, 'rb') as compressed, open(db_path, 'wb') as raw:
+            shutil.copyfileobj(compressed, raw, CHUNK_SIZE)
+        return db_path
+
+
+def main(argv=None):
+    """python -m BOT.BACKUP {create,list,verify,restore}"""
+    parser = argparse.ArgumentParser(description="stats.db backup tooling")
+    parser.add_argument('--db', default='stats.db')
+    parser.add_argument('--dir', default=DATABASE_BACKUP_LOCATION)
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('create')
+    commands.add_parser('list')
+    verify = commands.add_parser('verify')
+    verify.add_argument('backup', nargs='?', help="defaults to the newest backup")
+    restore = commands.add_parser('restore')
+    restore.add_argument('backup')
+    args = parser.parse_args(argv)
+
+    backup = DatabaseBackup(db_path=args.db, backup_dir=args.dir)
+
+    if args.command == 'create':
+        result = backup.create_backup()
+        if not result:
+            return 1
+        print(f"{result['path']} {result['size']} bytes sha256={result['sha256']}")
+
+    elif args.command == 'list':
+        for entry in backup.list_backups():
+            print(f"{entry['created']:%Y-%m-%d %H:%M:%S}  {entry['size']:>12,}  {entry['path']}")
+
+    elif args.command == 'verify':
+        backups = backup.list_backups()
+        path = args.backup or (backups[0]['path'] if backups else None)
+        if not path:
+            print("No backups found")
+            return 1
+        ok, message = backup.verify_backup(path)
+        print(f"{path}: {message}")
+        return 0 if ok else 1
+
+    elif args.command == 'restore':
+        print(backup.restore_backup(args.backup))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
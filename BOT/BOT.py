@@ -10,6 +10,9 @@ from .EVENTS import EventHandler
 from .TASKS import TaskManager
 from .DEBUG_COMMANDS import DebugCommands
 from .HOSPITAL_INTEGRATION import HospitalIntegration
+from .MIGRATIONS import SchemaMigrator
+
+from cogs._EVENTS import EVENT_BUS
 
 from UTILS.TOKEN import TOKEN
 
@@ -28,6 +31,8 @@ class NewAustraliaBot(commands.Bot):
         self.task_manager = TaskManager(self)
         self.debug_commands = DebugCommands(self)
         self.hospital_integration = HospitalIntegration(self)
+        self.migrator = SchemaMigrator()
+        self.events = EVENT_BUS
         
         # Set log IDs
         self.HEALTH_LOG_ID = self.config.HEALTH_LOG_ID
@@ -38,9 +43,30 @@ class NewAustraliaBot(commands.Bot):
 
     async def setup_hook(self):
         """Setup hook for bot initialization"""
+        self._migrate_database()
         await self._load_cogs()
+        self.events.start()
         await self._sync_commands()
 
+    async def close(self):
+        """Stop event bus workers before the connection closes"""
+        self.events.stop()
+        await super().close()
+
+    def _migrate_database(self):
+        """
+        Bring stats.db up to the latest schema before any cog touches it.
+        A failed migration stops startup; cogs must never run against a half-migrated schema.
+        """
+        try:
+            applied = self.migrator.migrate()
+            if applied:
+                logging.info(f"✅ Applied {applied} database migrations (schema version {self.migrator.latest_version})")
+        except Exception as e:
+            logging.error(f"❌ Database migration failed, aborting startup: {e}")
+            traceback.print_exc()
+            raise
+
     async def _load_cogs(self):
         """Load all cogs with enhanced logging"""
         from pathlib import Path
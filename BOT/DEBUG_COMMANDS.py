@@ -1,12 +1,16 @@
+import asyncio
 import discord
 import traceback
 import logging
 from pathlib import Path
 from discord.ext import commands
 
+from BOT.BACKUP import DatabaseBackup
+
 class DebugCommands:
     def __init__(self, bot):
         self.bot = bot
+        self.backup = DatabaseBackup()
         self._register_commands()
 
     def _register_commands(self):
@@ -36,6 +40,26 @@ class DebugCommands:
         async def clear_commands(ctx):
             await self._clear_commands(ctx)
 
+        @self.bot.command(name="schema_info")
+        @commands.is_owner()
+        async def schema_info(ctx):
+            await self._schema_info(ctx)
+
+        @self.bot.command(name="event_bus")
+        @commands.is_owner()
+        async def event_bus(ctx):
+            await self._event_bus(ctx)
+
+        @self.bot.command(name="db_backup")
+        @commands.is_owner()
+        async def db_backup(ctx):
+            await self._db_backup(ctx)
+
+        @self.bot.command(name="db_backups")
+        @commands.is_owner()
+        async def db_backups(ctx):
+            await self._db_backups(ctx)
+
     async def _debug_tree(self, ctx):
         """Debug command tree contents"""
         guild_commands = self.bot.tree.get_commands(guild=self.bot.config.GUILD)
@@ -176,4 +200,89 @@ class DebugCommands:
             # await self.bot.clear_all_commands()
             await ctx.send("✅ All commands cleared. Restart the bot to re-sync.")
         except Exception as e:
-            await ctx.send(f"❌ Error clearing commands: {e}")
\ No newline at end of file
+            await ctx.send(f"❌ Error clearing commands: {e}")
+
+    async def _schema_info(self, ctx):
+        """Show the database schema version and applied migrations"""
+        migrator = self.bot.migrator
+        current_version = migrator.get_version()
+
+        embed = discord.Embed(
+            title="🗄️ Database Schema",
+            color=0x00ff00 if current_version >= migrator.latest_version else 0xff9900
+        )
+        embed.add_field(name="Current Version", value=str(current_version), inline=True)
+        embed.add_field(name="Latest Version", value=str(migrator.latest_version), inline=True)
+
+        history = migrator.get_history()
+        if history:
+            lines = [f"`{version}` {name} — {applied_at[:19]}" for version, name, applied_at in history]
+            embed.add_field(name="Applied Migrations", value="\n".join(lines[-15:]), inline=False)
+        else:
+            embed.add_field(name="Applied Migrations", value="None recorded", inline=False)
+
+        await ctx.send(embed=embed)
+
+    async def _event_bus(self, ctx):
+        """Show events published per type and each subscriber's queue health"""
+        metrics = self.bot.events.get_metrics()
+
+        embed = discord.Embed(title="📡 Event Bus", color=0x00ff00)
+        embed.add_field(
+            name="Published",
+            value="\n".join(f"{name}: {count}" for name, count in metrics['published'].items()),
+            inline=False
+        )
+
+        lines = []
+        unhealthy = False
+        for name, sub in metrics['subscribers'].items():
+            unhealthy = unhealthy or sub['dropped'] or sub['errors']
+            lines.append(
+                f"**{name}** ({sub['event']}): {sub['delivered']} delivered, {sub['queued']} queued "
+                f"(max {sub['max_depth']}), {sub['dropped']} dropped, {sub['errors']} errors, "
+                f"{sub['avg_handler_ms']:.1f} ms avg"
+            )
+        embed.add_field(name="Subscribers", value="\n".join(lines)[:1024] or "None", inline=False)
+        if unhealthy:
+            embed.color = 0xff9900
+
+        await ctx.send(embed=embed)
+
+    async def _db_backup(self, ctx):
+        """Take an online backup of stats.db now"""
+        await ctx.send("💾 Backing up database...")
+        result = await asyncio.get_running_loop().run_in_executor(None, self.backup.create_backup)
+        if not result:
+            await ctx.send("❌ Database backup failed, see logs")
+            return
+
+        await ctx.send(
+            f"✅ Backed up to `{result['path']}`\n"
+            f"{result['db_size']:,} → {result['size']:,} bytes in {result['seconds']:.1f}s "
+            f"({result['steps']} steps), schema v{result['schema_version']}, {result['rotated']} rotated out\n"
+            f"sha256 `{result['sha256'][:16]}…`"
+        )
+
+    async def _db_backups(self, ctx):
+        """List database backups and verify the newest one"""
+        backups = self.backup.list_backups()
+        if not backups:
+            await ctx.send("No database backups found")
+            return
+
+        ok, message = await asyncio.get_running_loop().run_in_executor(
+            None, self.backup.verify_backup, backups[0]['path']
+        )
+        embed = discord.Embed(title="💾 Database Backups", color=0x00ff00 if ok else 0xff0000)
+        embed.add_field(
+            name=f"Backups ({len(backups)} kept, max {self.backup.keep})",
+            value="\n".join(
+                f"`{Path(backup['path']).name}` {backup['size'] / (1024 * 1024):.2f} MB"
+                for backup in backups
+            )[:1024],
+            inline=False
+        )
+        embed.add_field(name="Newest Backup Check", value=message, inline=False)
+        embed.set_footer(text="Restore with the bot stopped: python -m BOT.BACKUP restore <file>")
+        await ctx.send(embed=embed)
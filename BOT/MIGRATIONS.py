@@ -0,0 +1,366 @@
+import sqlite3
+import logging
+from datetime import datetime
+
+
+def _baseline_tables(cursor):
+    """Tables previously created ad hoc by each cog's init_database"""
+    from cogs.STATS_CORE import DEFAULT_LEVEL_COSTS
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_stats (
+            user_id INTEGER PRIMARY KEY,
+            username TEXT,
+            strength INTEGER,
+            dexterity INTEGER,
+            constitution INTEGER,
+            intelligence INTEGER,
+            wisdom INTEGER,
+            charisma INTEGER,
+            health INTEGER,
+            level INTEGER DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS level_costs (
+            level INTEGER PRIMARY KEY,
+            cost INTEGER NOT NULL
+        )
+    ''')
+
+    cursor.execute('SELECT COUNT(*) FROM level_costs')
+    if cursor.fetchone()[0] == 0:
+        cursor.executemany(
+            'INSERT INTO level_costs (level, cost) VALUES (?, ?)',
+            DEFAULT_LEVEL_COSTS.items()
+        )
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS combat_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            attacker_id INTEGER,
+            defender_id INTEGER,
+            damage INTEGER,
+            hit BOOLEAN,
+            critical_hit BOOLEAN,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS hospital_locations (
+            user_id INTEGER PRIMARY KEY,
+            in_hospital BOOLEAN DEFAULT FALSE,
+            transport_time TIMESTAMP,
+            last_healing_attempt TIMESTAMP
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS hospital_action_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER,
+            username TEXT,
+            action_type TEXT,
+            amount INTEGER,
+            cost INTEGER,
+            payment_method TEXT,
+            success BOOLEAN,
+            health_before INTEGER,
+            health_after INTEGER,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            details TEXT
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS stabilization (
+            user_id INTEGER PRIMARY KEY,
+            is_unstable BOOLEAN DEFAULT FALSE,
+            successes INTEGER DEFAULT 0,
+            failures INTEGER DEFAULT 0,
+            next_roll_time TIMESTAMP,
+            last_recovery_time TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+def _user_stats_previous_health(cursor):
+    """Column used by the atomic health mutation API"""
+    # Databases touched by the pre-migration StatsCore already have it
+    cursor.execute('PRAGMA table_info(user_stats)')
+    columns = [row[1] for row in cursor.fetchall()]
+    if 'previous_health' not in columns:
+        cursor.execute('ALTER TABLE user_stats ADD COLUMN previous_health INTEGER')
+
+
+def _subsystem_indexes(cursor):
+    """Indexes for combat history, hospital logs/locations and stabilization polling"""
+    indexes = [
+        # Combat history per player
+        "CREATE INDEX IF NOT EXISTS idx_combat_log_attacker ON combat_log(attacker_id, timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_combat_log_defender ON combat_log(defender_id, timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_combat_log_timestamp ON combat_log(timestamp)",
+
+        # Hospital action log (previously created by HospitalLogMaintenance)
+        "CREATE INDEX IF NOT EXISTS idx_hospital_log_user_id ON hospital_action_log(user_id)",
+        "CREATE INDEX IF NOT EXISTS idx_hospital_log_timestamp ON hospital_action_log(timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_hospital_log_action_type ON hospital_action_log(action_type)",
+        "CREATE INDEX IF NOT EXISTS idx_hospital_log_success ON hospital_action_log(success)",
+        "CREATE INDEX IF NOT EXISTS idx_hospital_log_user_timestamp ON hospital_action_log(user_id, timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_hospital_log_type_timestamp ON hospital_action_log(action_type, timestamp)",
+
+        # Hospital locations
+        "CREATE INDEX IF NOT EXISTS idx_hospital_locations_status ON hospital_locations(in_hospital)",
+        "CREATE INDEX IF NOT EXISTS idx_hospital_locations_transport_time ON hospital_locations(transport_time)",
+
+        # Stabilization polling (previously created by StabilizationDatabase)
+        "CREATE INDEX IF NOT EXISTS idx_stabilization_next_roll ON stabilization(next_roll_time, is_unstable)",
+    ]
+
+    for index_sql in indexes:
+        cursor.execute(index_sql)
+
+
+def _user_stats_rank_indexes(cursor):
+    """Indexes on every ranked stat column for leaderboards and rank queries"""
+    for stat in ('level', 'health', 'strength', 'dexterity', 'constitution', 'intelligence', 'wisdom', 'charisma'):
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_user_stats_{stat} ON user_stats({stat} DESC)")
+
+
+def _user_stats_overall_index(cursor):
+    """Composite index matching the overall (level, then health) leaderboard order"""
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_stats_level_health ON user_stats(level DESC, health DESC)")
+
+
+def _combat_daily_stats(cursor):
+    """Per-user, per-day combat totals that pruned combat_log rows are rolled into"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS combat_daily_stats (
+            user_id INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            attacks INTEGER NOT NULL DEFAULT 0,
+            hits INTEGER NOT NULL DEFAULT 0,
+            crits INTEGER NOT NULL DEFAULT 0,
+            damage_dealt INTEGER NOT NULL DEFAULT 0,
+            attacks_received INTEGER NOT NULL DEFAULT 0,
+            hits_taken INTEGER NOT NULL DEFAULT 0,
+            crits_taken INTEGER NOT NULL DEFAULT 0,
+            damage_taken INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, day)
+        ) WITHOUT ROWID
+    ''')
+
+
+def _combat_running_totals(cursor):
+    """Lifetime per-player and per-pair combat counters, backfilled from existing history"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS combat_player_totals (
+            user_id INTEGER PRIMARY KEY,
+            attacks INTEGER NOT NULL DEFAULT 0,
+            hits INTEGER NOT NULL DEFAULT 0,
+            crits INTEGER NOT NULL DEFAULT 0,
+            damage_dealt INTEGER NOT NULL DEFAULT 0,
+            attacks_received INTEGER NOT NULL DEFAULT 0,
+            hits_taken INTEGER NOT NULL DEFAULT 0,
+            crits_taken INTEGER NOT NULL DEFAULT 0,
+            damage_taken INTEGER NOT NULL DEFAULT 0,
+            knockouts INTEGER NOT NULL DEFAULT 0,
+            times_knocked_out INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS combat_pair_totals (
+            attacker_id INTEGER NOT NULL,
+            defender_id INTEGER NOT NULL,
+            attacks INTEGER NOT NULL DEFAULT 0,
+            hits INTEGER NOT NULL DEFAULT 0,
+            crits INTEGER NOT NULL DEFAULT 0,
+            damage INTEGER NOT NULL DEFAULT 0,
+            knockouts INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (attacker_id, defender_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_combat_pair_totals_defender ON combat_pair_totals(defender_id)")
+
+    # Legacy combat_log tables predate the hit/critical_hit/damage columns; count their
+    # attacks and backfill zeros for whatever they never recorded
+    cursor.execute('PRAGMA table_info(combat_log)')
+    columns = {row[1] for row in cursor.fetchall()}
+    hit = 'COALESCE(hit, 0)' if 'hit' in columns else '0'
+    crit = 'COALESCE(critical_hit, 0)' if 'critical_hit' in columns else '0'
+    damage = 'COALESCE(damage, 0)' if 'damage' in columns else '0'
+
+    # Knockouts were never logged, so history only contributes attack counters
+    cursor.execute(f'''
+        INSERT OR REPLACE INTO combat_player_totals
+            (user_id, attacks, hits, crits, damage_dealt, attacks_received, hits_taken, crits_taken, damage_taken)
+        SELECT user_id, SUM(attacks), SUM(hits), SUM(crits), SUM(damage_dealt),
+               SUM(attacks_received), SUM(hits_taken), SUM(crits_taken), SUM(damage_taken)
+        FROM (
+            SELECT user_id, attacks, hits, crits, damage_dealt, attacks_received, hits_taken, crits_taken, damage_taken
+            FROM combat_daily_stats
+
+            UNION ALL
+
+            SELECT attacker_id, 1, {hit}, {crit}, {damage}, 0, 0, 0, 0
+            FROM combat_log
+
+            UNION ALL
+
+            SELECT defender_id, 0, 0, 0, 0, 1, {hit}, {crit}, {damage}
+            FROM combat_log
+        )
+        GROUP BY user_id
+    ''')
+
+    cursor.execute(f'''
+        INSERT OR REPLACE INTO combat_pair_totals (attacker_id, defender_id, attacks, hits, crits, damage)
+        SELECT attacker_id, defender_id, COUNT(*), SUM({hit}), SUM({crit}), SUM({damage})
+        FROM combat_log
+        GROUP BY attacker_id, defender_id
+    ''')
+
+
+def _hospital_stats_rollups(cursor):
+    """Hourly and daily hospital action totals, backfilled from the existing action log"""
+    for table, period, length in (('hospital_stats_hourly', 'hour', 13), ('hospital_stats_daily', 'day', 10)):
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS {table} (
+                {period} TEXT NOT NULL,
+                action_type TEXT NOT NULL,
+                success INTEGER NOT NULL,
+                actions INTEGER NOT NULL DEFAULT 0,
+                amount INTEGER NOT NULL DEFAULT 0,
+                cost INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY ({period}, action_type, success)
+            ) WITHOUT ROWID
+        ''')
+
+        cursor.execute(f'''
+            INSERT OR REPLACE INTO {table} ({period}, action_type, success, actions, amount, cost)
+            SELECT substr(timestamp, 1, {length}), action_type, CASE WHEN success THEN 1 ELSE 0 END,
+                   COUNT(*), SUM(COALESCE(amount, 0)), SUM(COALESCE(cost, 0))
+            FROM hospital_action_log
+            WHERE timestamp IS NOT NULL AND action_type IS NOT NULL
+            GROUP BY 1, 2, 3
+        ''')
+
+
+def _hospital_admission_queue(cursor):
+    """Pending event-driven hospital admissions, one per user, kept across restarts"""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS hospital_admission_queue (
+            user_id INTEGER PRIMARY KEY,
+            due_at REAL NOT NULL,
+            queued_at REAL NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_hospital_admission_queue_due ON hospital_admission_queue(due_at)")
+
+
+def _combat_log_attack_columns(cursor):
+    """Add the per-attack columns that legacy combat_log tables (whole-fight rows) never had"""
+    cursor.execute('PRAGMA table_info(combat_log)')
+    columns = {row[1] for row in cursor.fetchall()}
+    for column, definition in (('damage', 'INTEGER DEFAULT 0'), ('hit', 'BOOLEAN DEFAULT 0'),
+                               ('critical_hit', 'BOOLEAN DEFAULT 0')):
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE combat_log ADD COLUMN {column} {definition}")
+
+
+# Ordered list of (version, name, function). Append new migrations; never edit applied ones.
+MIGRATIONS = [
+    (1, "baseline tables", _baseline_tables),
+    (2, "user_stats.previous_health", _user_stats_previous_health),
+    (3, "subsystem indexes", _subsystem_indexes),
+    (4, "user_stats rank indexes", _user_stats_rank_indexes),
+    (5, "user_stats overall leaderboard index", _user_stats_overall_index),
+    (6, "combat_daily_stats rollups", _combat_daily_stats),
+    (7, "combat running totals", _combat_running_totals),
+    (8, "hospital stats rollups", _hospital_stats_rollups),
+    (9, "hospital admission queue", _hospital_admission_queue),
+    (10, "combat_log attack columns", _combat_log_attack_columns),
+]
+
+
+class SchemaMigrator:
+    """Applies ordered schema migrations to stats.db exactly once"""
+
+    def __init__(self, db_path='stats.db', migrations=None):
+        self.db_path = db_path
+        self.migrations = sorted(migrations or MIGRATIONS, key=lambda migration: migration[0])
+
+    @property
+    def latest_version(self):
+        return self.migrations[-1][0] if self.migrations else 0
+
+    def get_version(self):
+        """Read the schema version recorded in the database header"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute('PRAGMA user_version').fetchone()[0]
+        finally:
+            conn.close()
+
+    def migrate(self):
+        """Apply pending migrations; returns the number applied"""
+        current_version = self.get_version()
+        pending = [migration for migration in self.migrations if migration[0] > current_version]
+
+        if not pending:
+            # Normal startup: schema is current, no DDL runs
+            logging.info(f"✅ Database schema up to date (version {current_version})")
+            return 0
+
+        logging.info(f"🔧 Migrating database from version {current_version} to {self.latest_version}")
+
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            cursor = conn.cursor()
+            for version, name, migration in pending:
+                cursor.execute('BEGIN IMMEDIATE')
+                try:
+                    cursor.execute('''
+                        CREATE TABLE IF NOT EXISTS schema_migrations (
+                            version INTEGER PRIMARY KEY,
+                            name TEXT NOT NULL,
+                            applied_at TIMESTAMP NOT NULL
+                        )
+                    ''')
+                    migration(cursor)
+                    cursor.execute(
+                        'INSERT OR REPLACE INTO schema_migrations (version, name, applied_at) VALUES (?, ?, ?)',
+                        (version, name, datetime.now().isoformat())
+                    )
+                    # PRAGMA arguments cannot be bound parameters
+                    cursor.execute(f'PRAGMA user_version = {int(version)}')
+                    cursor.execute('COMMIT')
+                except Exception:
+                    cursor.execute('ROLLBACK')
+                    logging.error(f"❌ Migration {version} ({name}) failed - schema left at version {self.get_version()}")
+                    raise
+
+                logging.info(f"✅ Applied migration {version}: {name}")
+        finally:
+            conn.close()
+
+        return len(pending)
+
+    def get_history(self):
+        """Get applied migrations, oldest first"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute('SELECT version, name, applied_at FROM schema_migrations ORDER BY version')
+            results = cursor.fetchall()
+            conn.close()
+            return results
+        except sqlite3.OperationalError:
+            return []
@@ -102,15 +102,7 @@ class TaskManager:
         
         hospital_system = self.bot.get_cog('HospitalSystem')
         if hospital_system:
-            # Send cycle start message
-            try:
-                await hospital_system.core.send_text_to_health_log(
-                    "Automatic hospital cycle triggered by scheduled task",
-                    "⏰ Scheduled Hospital Update"
-                )
-            except Exception as log_error:
-                logging.error(f"Failed to log hospital cycle start: {log_error}")
-            
+            # Admissions are event-driven; this sweep only reports when it finds work
             try:
                 await hospital_system.process_unconscious_users()
             except Exception as e:
@@ -0,0 +1,198 @@
+"""
+Offline combat balance simulator.
+
+Runs vectorized duels between random standard-array characters at every
+pair of levels 1-20 using the same formulas as StatsCombatCore, and reports
+expected DPS, time-to-knockout and win-probability matrices.
+
+    python -m UTILS.COMBAT_SIMULATOR
+    python -m UTILS.COMBAT_SIMULATOR --duels 10000 --rule crit_multiplier=3 --compare
+    python -m UTILS.COMBAT_SIMULATOR --csv simulation_results/
+
+Requires numpy (not needed by the bot itself).
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+from UTILS.CONFIGURATION import COMBAT_RULES, ACTION_COOLDOWN_SECONDS
+from cogs.STATS_CORE import STANDARD_ARRAY
+
+MAX_LEVEL = 20
+MAX_ROUNDS = 1000  # Safety cap; a fight that never ends counts as a loss for both sides
+
+STRENGTH, DEXTERITY, CONSTITUTION = 0, 1, 2
+
+
+def ability_modifier(scores):
+    """Vectorized StatsCombatCore.get_ability_modifier"""
+    return (scores - 10) // 2
+
+
+def generate_profiles(rng, count):
+    """Vectorized StatsCore.generate_stats: one shuffled standard array per row"""
+    order = np.argsort(rng.random((count, len(STANDARD_ARRAY))), axis=1)
+    return np.asarray(STANDARD_ARRAY)[order]
+
+
+def max_health(constitution, level):
+    """Vectorized StatsCore.calculate_health"""
+    con_modifier = ability_modifier(constitution)
+    return np.maximum(level, 8 + con_modifier + (level - 1) * (5 + con_modifier))
+
+
+def attack_profile(rules, attacker, attacker_level, defender, defender_level):
+    """Per-duel constants from make_attack_roll + calculate_damage: (attack bonus, target AC, damage bonus)"""
+    str_modifier = ability_modifier(attacker[:, STRENGTH])
+    proficiency_bonus = rules['base_proficiency'] + (attacker_level - 1) // rules['proficiency_levels']
+    natural_armor = (defender_level - 1) // rules['natural_armor_levels']
+    target_ac = rules['base_ac'] + ability_modifier(defender[:, DEXTERITY]) + natural_armor
+    damage_bonus = str_modifier + (attacker_level - 1) // rules['damage_bonus_levels']
+    return str_modifier + proficiency_bonus, target_ac, damage_bonus
+
+
+def resolve_attacks(rng, rules, attack_bonus, target_ac, damage_bonus):
+    """One attack per row; returns damage dealt (0 on a miss)"""
+    count = len(attack_bonus)
+    roll = rng.integers(1, rules['attack_die'] + 1, size=count)
+
+    critical_hit = roll == rules['attack_die']
+    hit = ((roll + attack_bonus >= target_ac) & (roll != 1)) | critical_hit
+
+    damage = np.maximum(rules['min_damage'], rng.integers(1, rules['damage_die'] + 1, size=count) + damage_bonus)
+    damage = np.where(critical_hit, damage * rules['crit_multiplier'], damage)
+    return np.where(hit, damage, 0)
+
+
+def simulate(rules, duels_per_pair=5000, seed=None):
+    """
+    Simulate duels for every (attacker level, defender level) pair.
+    The attacker strikes first each round; a round lasts ACTION_COOLDOWN_SECONDS.
+    Returns a dict of (MAX_LEVEL, MAX_LEVEL) matrices indexed [attacker_level - 1, defender_level - 1].
+    """
+    rng = np.random.default_rng(seed)
+    pair_count = MAX_LEVEL * MAX_LEVEL
+    total = pair_count * duels_per_pair
+
+    pair = np.repeat(np.arange(pair_count), duels_per_pair)
+    level_a = pair // MAX_LEVEL + 1
+    level_b = pair % MAX_LEVEL + 1
+    profile_a = generate_profiles(rng, total)
+    profile_b = generate_profiles(rng, total)
+    health_a = max_health(profile_a[:, CONSTITUTION], level_a)
+    health_b = max_health(profile_b[:, CONSTITUTION], level_b)
+    bonus_a, ac_b, damage_bonus_a = attack_profile(rules, profile_a, level_a, profile_b, level_b)
+    bonus_b, ac_a, damage_bonus_b = attack_profile(rules, profile_b, level_b, profile_a, level_a)
+
+    # Damage never depends on current health, so each side's rounds-to-knockout can be
+    # tracked independently; A wins if it needs no more rounds than B because it acts first.
+    rounds_a = np.full(total, MAX_ROUNDS + 1)
+    rounds_b = np.full(total, MAX_ROUNDS + 1)
+    damage_a = np.zeros(pair_count)
+    attacks_a = np.zeros(pair_count)
+
+    active = np.arange(total)
+    for round_number in range(1, MAX_ROUNDS + 1):
+        if not len(active):
+            break
+
+        hit_a = resolve_attacks(rng, rules, bonus_a[active], ac_b[active], damage_bonus_a[active])
+        hit_b = resolve_attacks(rng, rules, bonus_b[active], ac_a[active], damage_bonus_b[active])
+
+        # Only count A's attacks until it knocks B out, so DPS reflects real fights
+        attacking = rounds_a[active] > MAX_ROUNDS
+        damage_a += np.bincount(pair[active], weights=np.where(attacking, hit_a, 0), minlength=pair_count)
+        attacks_a += np.bincount(pair[active], weights=attacking, minlength=pair_count)
+
+        health_b[active] -= hit_a
+        health_a[active] -= hit_b
+        rounds_a[active[(health_b[active] <= 0) & attacking]] = round_number
+        rounds_b[active[(health_a[active] <= 0) & (rounds_b[active] > MAX_ROUNDS)]] = round_number
+
+        active = active[(rounds_a[active] > MAX_ROUNDS) | (rounds_b[active] > MAX_ROUNDS)]
+
+    shape = (MAX_LEVEL, MAX_LEVEL)
+    wins_a = (rounds_a <= rounds_b) & (rounds_a <= MAX_ROUNDS)
+    return {
+        'dps': (damage_a / np.maximum(attacks_a, 1) / ACTION_COOLDOWN_SECONDS).reshape(shape),
+        'time_to_knockout': (np.bincount(pair, weights=np.minimum(rounds_a, MAX_ROUNDS), minlength=pair_count)
+                             / duels_per_pair * ACTION_COOLDOWN_SECONDS).reshape(shape),
+        'win_probability': (np.bincount(pair, weights=wins_a, minlength=pair_count) / duels_per_pair).reshape(shape),
+        'duels': total
+    }
+
+
+def format_matrix(title, matrix, fmt):
+    """Render a level x level matrix with attacker levels as rows"""
+    width = max(len(fmt.format(value)) for value in matrix.flat) + 1
+    lines = [title, "atk\\def" + "".join(f"{level:>{width}}" for level in range(1, MAX_LEVEL + 1))]
+    for level, row in enumerate(matrix, 1):
+        lines.append(f"{level:>7}" + "".join(f"{fmt.format(value):>{width}}" for value in row))
+    return "\n".join(lines)
+
+
+def parse_rules(overrides):
+    """Apply key=value overrides to a copy of COMBAT_RULES"""
+    rules = dict(COMBAT_RULES)
+    for override in overrides:
+        key, _, value = override.partition('=')
+        if key not in rules:
+            raise SystemExit(f"Unknown rule '{key}'. Known rules: {', '.join(sorted(rules))}")
+        rules[key] = int(value)
+    return rules
+
+
+def write_csv(directory, results, prefix=''):
+    os.makedirs(directory, exist_ok=True)
+    for name in ('dps', 'time_to_knockout', 'win_probability'):
+        path = os.path.join(directory, f"{prefix}{name}.csv")
+        np.savetxt(path, results[name], delimiter=',', fmt='%.4f',
+                   header=','.join(f"def_level_{level}" for level in range(1, MAX_LEVEL + 1)))
+        print(f"Wrote {path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate combat balance across levels 1-20")
+    parser.add_argument('--duels', type=int, default=5000, help="Duels per level pair (default 5000, i.e. 2M duels)")
+    parser.add_argument('--seed', type=int, default=None, help="Random seed for reproducible runs")
+    parser.add_argument('--rule', action='append', default=[], metavar='KEY=VALUE',
+                        help="Override a COMBAT_RULES entry (repeatable)")
+    parser.add_argument('--compare', action='store_true',
+                        help="Also run the deployed rules with the same seed and print the differences")
+    parser.add_argument('--csv', metavar='DIR', help="Write the matrices as CSV files to DIR")
+    args = parser.parse_args(argv)
+
+    rules = parse_rules(args.rule)
+    seed = args.seed if args.seed is not None else int(time.time())
+
+    started = time.perf_counter()
+    results = simulate(rules, args.duels, seed)
+    elapsed = time.perf_counter() - started
+
+    print(f"Simulated {results['duels']:,} duels in {elapsed:.1f}s (seed {seed})")
+    print(f"Rules: {rules}\n")
+    print(format_matrix("Expected DPS (damage per second, attacker vs defender)", results['dps'], "{:.2f}"), "\n")
+    print(format_matrix("Mean time to knockout (seconds of uninterrupted attacks)", results['time_to_knockout'], "{:.0f}"), "\n")
+    print(format_matrix("Win probability (attacker strikes first)", results['win_probability'], "{:.2f}"))
+
+    if args.csv:
+        write_csv(args.csv, results)
+
+    if args.compare:
+        baseline = simulate(dict(COMBAT_RULES), args.duels, seed)
+        delta = results['win_probability'] - baseline['win_probability']
+        print()
+        print(format_matrix("Win probability change vs deployed rules", delta, "{:+.2f}"))
+        worst = np.unravel_index(np.abs(delta).argmax(), delta.shape)
+        print(f"\nLargest shift: level {worst[0] + 1} vs level {worst[1] + 1} ({delta[worst]:+.3f})")
+        if args.csv:
+            write_csv(args.csv, baseline, prefix='baseline_')
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,6 +19,12 @@ HOSPITAL_HEALING_COST_PER_HP = 1000  # Cost in shekels per health point healed
 # Hospital System Settings
 HOSPITAL_CYCLE_INTERVAL = 300  # Seconds between hospital cycles (default: 5 minutes)
 HOSPITAL_MAX_HEALING_SESSIONS = 10  # Maximum healing sessions per user per cycle
+HOSPITAL_CYCLE_CONCURRENCY = 8  # Patients processed at once during a hospital cycle
+HOSPITAL_CYCLE_BUDGET = 240  # Seconds a cycle may spend on patients before deferring the rest to the next cycle
+HOSPITAL_CYCLE_METRICS_HISTORY = 48  # Cycle timing records kept for $hospital_metrics (48 cycles = 4 hours)
+HOSPITAL_ADMISSION_GRACE_SECONDS = 30  # Delay between a knockout and emergency transport
+HOSPITAL_ADMISSION_RETRY_SECONDS = 60  # Delay before retrying an admission blocked by combat
+HOSPITAL_ADMISSION_MAX_ATTEMPTS = 10  # Combat-blocked retries before leaving the patient to the periodic sweep
 
 # Hospital Log Retention Settings
 HOSPITAL_LOG_RETENTION_DAYS = None  # Set to None for indefinite retention, or number of days
@@ -28,11 +34,61 @@ HOSPITAL_LOG_CLEANUP_INTERVAL_DAYS = 7  # How often to run cleanup (if enabled)
 # Database Performance Settings (for indefinite logs)
 HOSPITAL_LOG_INDEX_OPTIMIZATION = True  # Create database indexes for better performance
 HOSPITAL_LOG_BATCH_SIZE = 1000  # Batch size for bulk operations
+HOSPITAL_LOG_FLUSH_SECONDS = 30  # Longest a buffered hospital log row waits before being written
+HOSPITAL_STATS_HOURLY_RETENTION_DAYS = 7  # Hourly stats rollups kept; daily rollups are kept indefinitely
+HOSPITAL_LOG_PAGE_SIZE = 15  # Rows per /hospital_log page
+HOSPITAL_LOG_EXPORT_CHUNK_SIZE = 1000  # Rows read per query while streaming a log export
+HOSPITAL_LOG_EXPORT_MAX_BYTES = 8 * 1024 * 1024  # Largest compressed export sent as an attachment (Discord upload limit)
 
 # Backup Settings (recommended for indefinite retention)
 HOSPITAL_ENABLE_LOG_BACKUP = True  # Enable periodic log backups
 HOSPITAL_BACKUP_INTERVAL_DAYS = 30  # Days between backups
-HOSPITAL_BACKUP_LOCATION = "backups/hospital_logs/"  # Directory for log backups
+
+# Database Backup Settings (online backups of all of stats.db, see BOT/BACKUP.py)
+DATABASE_BACKUP_LOCATION = "backups/stats/"  # Directory for compressed database backups
+DATABASE_BACKUP_KEEP = 10  # Newest backups kept; older ones are rotated out
+DATABASE_BACKUP_PAGES_PER_STEP = 1024  # Pages copied per backup step; writers only wait for one step
+DATABASE_BACKUP_STEP_SLEEP = 0.05  # Seconds paused between backup steps
+DATABASE_BACKUP_MAX_RESTARTS = 5  # Restarts caused by concurrent writes before copying in one step
+
+# Health Log Output Settings
+HEALTH_LOG_FLUSH_SECONDS = 3  # Debounce before buffered health log entries are sent
+HEALTH_LOG_MAX_BUFFER = 500  # Entries held before the oldest are dropped
+HEALTH_LOG_RATE_LIMIT = 4  # Messages allowed per HEALTH_LOG_RATE_PERIOD (Discord allows 5 per 5s per channel)
+HEALTH_LOG_RATE_PERIOD = 5  # Seconds
+
+# Combat Log Retention Settings
+COMBAT_LOG_RETENTION_DAYS = 30  # Raw attacks older than this are rolled into daily totals, or None to keep everything
+COMBAT_LOG_PRUNE_BATCH_SIZE = 1000  # Rows rolled up and deleted per transaction
+COMBAT_LOG_PRUNE_INTERVAL_HOURS = 24  # How often the retention pass runs
+
+# Combat Formula Settings (shared by StatsCombatCore and UTILS/COMBAT_SIMULATOR.py)
+# Edits take effect on restart, or in a running bot through the owner command $reload_combat_rules
+COMBAT_RULES = {
+    'attack_die': 20,  # Attack roll die; a natural max is a critical hit, a natural 1 always misses
+    'damage_die': 6,  # Weapon damage die
+    'crit_multiplier': 2,  # Damage multiplier on critical hits
+    'min_damage': 1,  # Damage floor for a successful hit
+    'base_proficiency': 2,  # Proficiency bonus at level 1
+    'proficiency_levels': 4,  # +1 proficiency every N levels
+    'base_ac': 10,  # Armor class before dexterity and natural armor
+    'natural_armor_levels': 4,  # +1 AC every N levels
+    'damage_bonus_levels': 2,  # +1 damage every N levels
+}
+ACTION_COOLDOWN_SECONDS = 6  # Seconds between combat actions (one combat round)
+
+# Encounter Mode Settings
+ENCOUNTER_TICK_SECONDS = 6  # Queued encounter actions resolve together once per tick
+ENCOUNTER_IDLE_TICKS = 20  # Encounters end after this many ticks without queued actions
+ENCOUNTER_SUMMARY_LINES = 25  # Action lines shown per tick summary before the rest are collapsed
+
+# Combat Feed Settings
+COMBAT_FEED_LINES = 10  # Latest actions kept in each channel's live combat message
+COMBAT_FEED_EDIT_INTERVAL = 2  # Minimum seconds between updates to a channel's combat message
+COMBAT_FEED_PING_COOLDOWN = 60  # Seconds before the feed pings the same user again in a channel
+
+# Event Bus Settings
+EVENT_QUEUE_SIZE = 1000  # Pending events per subscriber before new ones are dropped
 
 # Define intents
 intents = discord.Intents.all()
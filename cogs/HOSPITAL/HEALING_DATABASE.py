@@ -3,6 +3,8 @@ import sqlite3
 import logging
 from datetime import datetime
 
+from cogs._STATS_CACHE import STATS_CACHE
+
 class HealingDatabase:
     """Handles healing-related database operations"""
     
@@ -21,6 +23,8 @@ class HealingDatabase:
             
             conn.commit()
             conn.close()
+            
+            STATS_CACHE.update_fields(user_id, health=new_health)
             return True
         except Exception as e:
             logging.error(f"Failed to update health for user {user_id}: {e}")
@@ -0,0 +1,307 @@
+import asyncio
+import atexit
+import logging
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+from UTILS.CONFIGURATION import (
+    HOSPITAL_LOG_BATCH_SIZE, HOSPITAL_LOG_FLUSH_SECONDS, HOSPITAL_LOG_PAGE_SIZE, HOSPITAL_LOG_EXPORT_CHUNK_SIZE
+)
+from .HOSPITAL_CYCLE_METRICS import track_db
+
+LOG_COLUMNS = ('id', 'timestamp', 'user_id', 'username', 'action_type', 'amount', 'cost',
+               'payment_method', 'success', 'health_before', 'health_after', 'details')
+
+INSERT_ACTION_SQL = '''
+    INSERT INTO hospital_action_log
+    (user_id, username, action_type, amount, cost, payment_method,
+     success, health_before, health_after, details, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Adds a batch's totals onto whatever is already rolled up for that period
+ROLLUP_UPSERT_SQL = '''
+    INSERT INTO {table} ({period}, action_type, success, actions, amount, cost)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT({period}, action_type, success) DO UPDATE SET
+        actions = actions + excluded.actions,
+        amount = amount + excluded.amount,
+        cost = cost + excluded.cost
+'''
+
+HOURLY_ROLLUP_SQL = ROLLUP_UPSERT_SQL.format(table='hospital_stats_hourly', period='hour')
+DAILY_ROLLUP_SQL = ROLLUP_UPSERT_SQL.format(table='hospital_stats_daily', period='day')
+
+
+def action_row(user_id, username, action_type, amount=0, cost=0, payment_method="",
+               success=True, health_before=0, health_after=0, details=""):
+    """Build an INSERT_ACTION_SQL row stamped with the current time"""
+    # Same format as the column's CURRENT_TIMESTAMP default
+    logged_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+    return (user_id, username, action_type, amount, cost, payment_method,
+            success, health_before, health_after, details, logged_at)
+
+
+def record_actions(cursor, rows):
+    """Insert action rows and add them to the hourly and daily rollups on the caller's transaction"""
+    cursor.executemany(INSERT_ACTION_SQL, rows)
+
+    hourly = {}
+    for row in rows:
+        action_type, amount, cost, success, logged_at = row[2], row[3], row[4], row[6], row[10]
+        totals = hourly.setdefault((logged_at[:13], action_type, 1 if success else 0), [0, 0, 0])
+        totals[0] += 1
+        totals[1] += amount or 0
+        totals[2] += cost or 0
+
+    daily = {}
+    for (hour, action_type, success), (actions, amount, cost) in hourly.items():
+        totals = daily.setdefault((hour[:10], action_type, success), [0, 0, 0])
+        totals[0] += actions
+        totals[1] += amount
+        totals[2] += cost
+
+    cursor.executemany(HOURLY_ROLLUP_SQL, [key + tuple(totals) for key, totals in hourly.items()])
+    cursor.executemany(DAILY_ROLLUP_SQL, [key + tuple(totals) for key, totals in daily.items()])
+
+
+def get_action_totals(since_hours=None, db_path='stats.db'):
+    """
+    Action totals from the rollups, keyed by (action_type, success).
+    since_hours reads the hourly rollup for the last N hours (the current hour
+    counts in full); None reads the daily rollup for all time.
+    Returns {(action_type, success): {'actions', 'amount', 'cost'}}, or None on error.
+    """
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+        if since_hours is None:
+            cursor.execute('''
+                SELECT action_type, success, SUM(actions), SUM(amount), SUM(cost)
+                FROM hospital_stats_daily
+                GROUP BY action_type, success
+            ''')
+        else:
+            since = (datetime.now(timezone.utc) - timedelta(hours=since_hours)).strftime('%Y-%m-%d %H')
+            cursor.execute('''
+                SELECT action_type, success, SUM(actions), SUM(amount), SUM(cost)
+                FROM hospital_stats_hourly
+                WHERE hour >= ?
+                GROUP BY action_type, success
+            ''', (since,))
+        rows = cursor.fetchall()
+        conn.close()
+    except Exception as e:
+        logging.error(f"❌ Failed to read hospital stats rollups: {e}")
+        return None
+
+    return {
+        (action_type, success): {'actions': actions, 'amount': amount, 'cost': cost}
+        for action_type, success, actions, amount, cost in rows
+    }
+
+
+def sum_totals(totals, action_type, success=None, partial=False):
+    """Fold get_action_totals() entries for one action type (or every type containing it, if partial)"""
+    result = {'actions': 0, 'amount': 0, 'cost': 0}
+    for (row_type, row_success), row in (totals or {}).items():
+        matched = action_type in row_type if partial else row_type == action_type
+        if matched and (success is None or row_success == success):
+            for key in result:
+                result[key] += row[key]
+    return result
+
+
+def _action_filter(user_id=None, since=None):
+    conditions, params = ['timestamp IS NOT NULL'], []
+    if user_id is not None:
+        conditions.append('user_id = ?')
+        params.append(user_id)
+    if since is not None:
+        conditions.append('timestamp >= ?')
+        params.append(since)
+    return conditions, params
+
+
+def fetch_action_page(user_id=None, since=None, before=None, after=None, limit=HOSPITAL_LOG_PAGE_SIZE, db_path='stats.db'):
+    """
+    One keyset page of log rows as dicts, newest first.
+    before/after are (timestamp, id) cursors taken from the last/first row of
+    the page being left; the (timestamp) and (user_id, timestamp) indexes carry
+    id as their rowid, so each page is an index range scan, not an OFFSET.
+    Fetches limit + 1 rows; returns (rows, has_more) where has_more means
+    another page exists in the direction travelled. None on error.
+    """
+    conditions, params = _action_filter(user_id, since)
+    if before is not None:
+        conditions.append('(timestamp, id) < (?, ?)')
+        params.extend(before)
+    if after is not None:
+        conditions.append('(timestamp, id) > (?, ?)')
+        params.extend(after)
+    order = 'ASC' if after is not None else 'DESC'
+
+    try:
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(f'''
+            SELECT {', '.join(LOG_COLUMNS)}
+            FROM hospital_action_log
+            WHERE {' AND '.join(conditions)}
+            ORDER BY timestamp {order}, id {order}
+            LIMIT ?
+        ''', params + [limit + 1]).fetchall()
+        conn.close()
+    except Exception as e:
+        logging.error(f"❌ Failed to read hospital log page: {e}")
+        return None
+
+    has_more = len(rows) > limit
+    rows = [dict(row) for row in rows[:limit]]
+    if after is not None:
+        rows.reverse()
+    return rows, has_more
+
+
+def iter_actions(user_id=None, since=None, chunk_size=HOSPITAL_LOG_EXPORT_CHUNK_SIZE, db_path='stats.db'):
+    """
+    Yield every matching log row as a dict, oldest first, chunk_size rows per query.
+    Each chunk is its own short read, so a long export never holds a lock that
+    would stall hospital writes, and memory stays at one chunk.
+    """
+    conditions, params = _action_filter(user_id, since)
+    where = ' AND '.join(conditions)
+    cursor_key = None
+
+    while True:
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        if cursor_key is None:
+            rows = conn.execute(f'''
+                SELECT {', '.join(LOG_COLUMNS)} FROM hospital_action_log
+                WHERE {where}
+                ORDER BY timestamp, id LIMIT ?
+            ''', params + [chunk_size]).fetchall()
+        else:
+            rows = conn.execute(f'''
+                SELECT {', '.join(LOG_COLUMNS)} FROM hospital_action_log
+                WHERE {where} AND (timestamp, id) > (?, ?)
+                ORDER BY timestamp, id LIMIT ?
+            ''', params + list(cursor_key) + [chunk_size]).fetchall()
+        conn.close()
+
+        for row in rows:
+            yield dict(row)
+        if len(rows) < chunk_size:
+            return
+        cursor_key = (rows[-1]['timestamp'], rows[-1]['id'])
+
+
+def prune_hourly_rollups(days, db_path='stats.db'):
+    """Drop hourly rollup rows older than days; the daily rollup keeps their totals"""
+    try:
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).strftime('%Y-%m-%d %H')
+        conn = sqlite3.connect(db_path)
+        try:
+            with conn:
+                deleted = conn.execute('DELETE FROM hospital_stats_hourly WHERE hour < ?', (cutoff,)).rowcount
+        finally:
+            conn.close()
+        return deleted
+    except Exception as e:
+        logging.error(f"❌ Failed to prune hourly hospital stats: {e}")
+        return 0
+
+
+class HospitalActionLogBuffer:
+    """
+    Append buffer for hospital_action_log rows.
+
+    Rows are written with one executemany per flush: when the buffer reaches
+    HOSPITAL_LOG_BATCH_SIZE, when the oldest row is HOSPITAL_LOG_FLUSH_SECONDS
+    old, at the end of each hospital cycle, and at shutdown. Each row keeps the
+    time it was logged, so late flushes don't shift timestamps, and each
+    flush updates the hourly and daily rollups in the same transaction.
+    """
+
+    def __init__(self, db_path='stats.db', batch_size=HOSPITAL_LOG_BATCH_SIZE, flush_seconds=HOSPITAL_LOG_FLUSH_SECONDS):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.rows = []
+        self.first_row_at = None
+        self.timer = None
+        self.rows_written = 0
+        self.flushes = 0
+        self.failures = 0
+        atexit.register(self.flush)
+
+    def add(self, user_id, username, action_type, amount, cost, payment_method,
+            success, health_before, health_after, details):
+        """Buffer one action row"""
+        self.rows.append(action_row(user_id, username, action_type, amount, cost, payment_method,
+                                    success, health_before, health_after, details))
+
+        if self.first_row_at is None:
+            self.first_row_at = time.monotonic()
+        if self.timer is None:
+            self._schedule_timer()
+
+        if len(self.rows) >= self.batch_size or time.monotonic() - self.first_row_at >= self.flush_seconds:
+            self.flush()
+
+    def _schedule_timer(self):
+        """Flush idle rows after flush_seconds even if nothing else is logged"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop (scripts, shutdown); size threshold and explicit flushes still apply
+        delay = max(0, self.first_row_at + self.flush_seconds - time.monotonic())
+        self.timer = loop.call_later(delay, self.flush)
+
+    def flush(self):
+        """Write every buffered row in one transaction; returns the number written"""
+        if self.timer:
+            self.timer.cancel()
+            self.timer = None
+        if not self.rows:
+            return 0
+
+        rows, self.rows = self.rows, []
+        self.first_row_at = None
+        try:
+            with track_db():
+                conn = sqlite3.connect(self.db_path)
+                try:
+                    with conn:
+                        record_actions(conn.cursor(), rows)
+                finally:
+                    conn.close()
+        except Exception as e:
+            # Keep the rows for the next flush, capped so a broken database can't grow memory forever
+            self.failures += 1
+            self.rows = (rows + self.rows)[-self.batch_size * 10:]
+            self.first_row_at = time.monotonic()
+            logging.error(f"❌ Failed to write {len(rows)} hospital log rows: {e}")
+            # Retry once flush_seconds have passed rather than waiting for the next logged action
+            self._schedule_timer()
+            return 0
+
+        self.rows_written += len(rows)
+        self.flushes += 1
+        return len(rows)
+
+    def close(self):
+        """Final flush when the hospital system unloads"""
+        self.flush()
+        atexit.unregister(self.flush)
+
+    def get_metrics(self):
+        return {
+            'buffered': len(self.rows),
+            'rows_written': self.rows_written,
+            'flushes': self.flushes,
+            'rows_per_flush': self.rows_written / self.flushes if self.flushes else 0.0,
+            'failures': self.failures
+        }
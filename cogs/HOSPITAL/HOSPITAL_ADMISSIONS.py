@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import sqlite3
+import time
+
+from UTILS.CONFIGURATION import (
+    HOSPITAL_ADMISSION_GRACE_SECONDS, HOSPITAL_ADMISSION_RETRY_SECONDS, HOSPITAL_ADMISSION_MAX_ATTEMPTS
+)
+from cogs._EVENTS import EVENT_BUS, BecameUnconscious
+
+
+class HospitalAdmissions:
+    """
+    Event-driven hospital admission.
+
+    A knockout queues an admission job due after HOSPITAL_ADMISSION_GRACE_SECONDS.
+    Jobs live in hospital_admission_queue, so pending admissions survive a
+    restart, and a single worker sleeps until the earliest one is due. The
+    periodic hospital cycle stays as a safety sweep for anything missed.
+    """
+
+    def __init__(self, hospital_core, cycle_manager, db_path='stats.db'):
+        self.core = hospital_core
+        self.cycle_manager = cycle_manager
+        self.db_path = db_path
+        self.subscription = None
+        self.worker = None
+        self.wakeup = asyncio.Event()
+        self.outcomes = {}  # outcome: count
+
+    def start(self):
+        """Subscribe to knockouts and start the worker; needs a running event loop"""
+        if self.subscription is None:
+            self.subscription = EVENT_BUS.subscribe(BecameUnconscious, self.on_unconscious, name="HospitalAdmissions")
+        if self.worker is None or self.worker.done():
+            self.worker = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self):
+        """Stop admitting; queued jobs stay in the database for the next start"""
+        if self.subscription:
+            EVENT_BUS.unsubscribe(self.subscription)
+            self.subscription = None
+        if self.worker:
+            self.worker.cancel()
+            self.worker = None
+
+    def on_unconscious(self, event):
+        self.schedule(event.user_id)
+
+    def schedule(self, user_id, delay=HOSPITAL_ADMISSION_GRACE_SECONDS, attempts=0):
+        """Queue an admission; an already queued user keeps their earlier slot"""
+        now = time.time()
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute('''
+                    INSERT INTO hospital_admission_queue (user_id, due_at, queued_at, attempts)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(user_id) DO UPDATE SET
+                        due_at = MIN(due_at, excluded.due_at),
+                        attempts = MAX(attempts, excluded.attempts)
+                ''', (user_id, now + delay, now, attempts))
+            conn.close()
+        except Exception as e:
+            logging.error(f"❌ Failed to queue hospital admission for user {user_id}: {e}")
+            return False
+
+        self.wakeup.set()
+        return True
+
+    def _next_due(self):
+        conn = sqlite3.connect(self.db_path)
+        row = conn.execute('SELECT MIN(due_at) FROM hospital_admission_queue').fetchone()
+        conn.close()
+        return row[0]
+
+    def _pop_due(self):
+        """Claim every job that is due"""
+        with sqlite3.connect(self.db_path) as conn:
+            jobs = conn.execute('''
+                DELETE FROM hospital_admission_queue
+                WHERE due_at <= ?
+                RETURNING user_id, attempts
+            ''', (time.time(),)).fetchall()
+        conn.close()
+        return jobs
+
+    def get_queue(self):
+        """Pending jobs as (user_id, seconds_until_due, attempts), soonest first"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            rows = conn.execute('''
+                SELECT user_id, due_at, attempts FROM hospital_admission_queue ORDER BY due_at
+            ''').fetchall()
+            conn.close()
+        except Exception as e:
+            logging.error(f"❌ Failed to read hospital admission queue: {e}")
+            return []
+        now = time.time()
+        return [(user_id, max(0.0, due_at - now), attempts) for user_id, due_at, attempts in rows]
+
+    async def _run(self):
+        while True:
+            try:
+                self.wakeup.clear()
+                next_due = self._next_due()
+                if next_due is None:
+                    await self.wakeup.wait()
+                    continue
+
+                delay = next_due - time.time()
+                if delay > 0:
+                    # A newly queued, earlier job sets wakeup and cuts the sleep short
+                    try:
+                        await asyncio.wait_for(self.wakeup.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                for user_id, attempts in self._pop_due():
+                    await self._admit(user_id, attempts)
+
+                self.core.flush_action_log()
+                await self.core.flush_health_log()
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"❌ Hospital admission worker error: {e}")
+                await asyncio.sleep(HOSPITAL_ADMISSION_RETRY_SECONDS)
+
+    async def _admit(self, user_id, attempts):
+        try:
+            outcome = await self.cycle_manager.admit_patient(user_id)
+        except Exception as e:
+            logging.error(f"❌ Event-driven admission failed for user {user_id}: {e}")
+            outcome = 'FAILED'
+
+        if outcome == 'IN_COMBAT' and attempts + 1 < HOSPITAL_ADMISSION_MAX_ATTEMPTS:
+            self.schedule(user_id, HOSPITAL_ADMISSION_RETRY_SECONDS, attempts + 1)
+            outcome = 'REQUEUED'
+
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        logging.info(f"🚑 Admission for user {user_id}: {outcome}")
+
+    def get_metrics(self):
+        return {
+            'queued': len(self.get_queue()),
+            'running': bool(self.worker and not self.worker.done()),
+            'outcomes': dict(self.outcomes)
+        }
@@ -79,13 +79,13 @@ class HospitalCommands(commands.Cog):
         if in_hospital:
             embed.add_field(
                 name="ℹ️ Hospital Services",
-                value="• Automatic comprehensive healing when unconscious\n• Heals as much as you can afford\n• Multiple healing sessions per cycle\n• Leave automatically when conscious\n• Cannot be attacked while in hospital\n• No taxes on medical services",
+                value="• Automatic comprehensive healing when unconscious\n• Heals as much as you can afford\n• One charge and one heal per stabilization\n• Leave automatically when conscious\n• Cannot be attacked while in hospital\n• No taxes on medical services",
                 inline=False
             )
         else:
             embed.add_field(
                 name="ℹ️ Emergency Services",
-                value="• Automatic transport when unconscious\n• Payment via cash or credit\n• Comprehensive healing until conscious or funds exhausted\n• No taxes on emergency services\n• Tax credits not applicable",
+                value="• Automatic transport as soon as you are knocked out\n• Payment via cash or credit\n• Comprehensive healing until conscious or funds exhausted\n• No taxes on emergency services\n• Tax credits not applicable",
                 inline=False
             )
         
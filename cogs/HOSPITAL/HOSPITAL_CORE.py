@@ -1,24 +1,85 @@
+import asyncio
 import discord
 from discord.ext import commands
 import sqlite3
 import logging
+import weakref
 from datetime import datetime
 
-from UTILS.CONFIGURATION import GUILD_ID
+from UTILS.CONFIGURATION import GUILD_ID, HEALTH_LOG_ID, MONEY_LOG_ID
 from SHEKELS.BALANCE import BALANCE
 from SHEKELS.TRANSFERS import UPDATE_BALANCE, WITHDRAW
+from cogs._HEALTH import apply_health_delta, apply_health_deltas
+from .HOSPITAL_LOG_SINK import HealthLogSink
+from .HOSPITAL_ACTION_LOG import HospitalActionLogBuffer, action_row, record_actions
+from .HOSPITAL_CYCLE_METRICS import track_db
 
 GUILD = discord.Object(id=GUILD_ID)
 TRANSPORT_COST = 1000  # Cost in shekels for hospital transport
 HEALING_COST_PER_HP = 1000   # Cost in shekels per HP healed
 
+# Everything the cycle needs per patient, joined in one pass. The WHERE clauses
+# are served by idx_user_stats_health and idx_hospital_locations_status, so both
+# queries touch only patients.
+PATIENT_COLUMNS = '''
+    s.user_id, s.username, s.health, s.constitution, s.level,
+    COALESCE(h.in_hospital, 0) AS in_hospital, h.transport_time, h.last_healing_attempt,
+    COALESCE(st.is_unstable, 0) AS is_unstable, COALESCE(st.successes, 0) AS successes,
+    COALESCE(st.failures, 0) AS failures, st.next_roll_time
+'''
+
+UNCONSCIOUS_PATIENTS_SQL = f'''
+    SELECT {PATIENT_COLUMNS}
+    FROM user_stats s
+    LEFT JOIN hospital_locations h ON h.user_id = s.user_id
+    LEFT JOIN stabilization st ON st.user_id = s.user_id
+    WHERE s.health <= 0
+    ORDER BY s.health
+'''
+
+# The periodic sweep leaves patients whose event-driven admission is not yet due
+# alone; overdue jobs (worker stopped or behind) are swept up as usual
+SWEEP_PATIENTS_SQL = f'''
+    SELECT {PATIENT_COLUMNS}
+    FROM user_stats s
+    LEFT JOIN hospital_locations h ON h.user_id = s.user_id
+    LEFT JOIN stabilization st ON st.user_id = s.user_id
+    WHERE s.health <= 0
+      AND s.user_id NOT IN (
+          SELECT user_id FROM hospital_admission_queue
+          WHERE due_at > (julianday('now') - 2440587.5) * 86400.0
+      )
+    ORDER BY s.health
+'''
+
+PATIENT_SQL = f'''
+    SELECT {PATIENT_COLUMNS}
+    FROM user_stats s
+    LEFT JOIN hospital_locations h ON h.user_id = s.user_id
+    LEFT JOIN stabilization st ON st.user_id = s.user_id
+    WHERE s.user_id = ?
+'''
+
+CONSCIOUS_PATIENTS_SQL = f'''
+    SELECT {PATIENT_COLUMNS}
+    FROM hospital_locations h
+    JOIN user_stats s ON s.user_id = h.user_id
+    LEFT JOIN stabilization st ON st.user_id = s.user_id
+    WHERE h.in_hospital = 1 AND s.health > 0
+'''
+
 
 class HospitalCore:
     """Core hospital functionality - database operations and basic logic"""
     
     def __init__(self, bot):
         self.bot = bot
-        self.init_database()
+        self._health_log_channel = None
+        self.health_log = HealthLogSink(self.get_health_log_channel)
+        # user_id: asyncio.Lock; an entry lives while a holder or waiter references it,
+        # so a woken waiter can never find its lock replaced by a fresh one
+        self.patient_locks = weakref.WeakValueDictionary()
+        self.action_log = HospitalActionLogBuffer()
         
         # Initialize maintenance system
         try:
@@ -28,78 +89,86 @@ class HospitalCore:
             logging.warning("🏥 Hospital maintenance system not available")
             self.maintenance = None
     
-    def init_database(self):
-        """Initialize hospital location tracking database"""
-        try:
-            conn = sqlite3.connect('stats.db')
-            cursor = conn.cursor()
-            
-            # Create hospital locations table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS hospital_locations (
-                    user_id INTEGER PRIMARY KEY,
-                    in_hospital BOOLEAN DEFAULT FALSE,
-                    transport_time TIMESTAMP,
-                    last_healing_attempt TIMESTAMP
-                )
-            ''')
-            
-            # Create hospital action log table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS hospital_action_log (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER,
-                    username TEXT,
-                    action_type TEXT,
-                    amount INTEGER,
-                    cost INTEGER,
-                    payment_method TEXT,
-                    success BOOLEAN,
-                    health_before INTEGER,
-                    health_after INTEGER,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    details TEXT
-                )
-            ''')
-            
-            conn.commit()
-            conn.close()
-            logging.info("✅ Hospital database initialized successfully")
-            
-        except Exception as e:
-            logging.error(f"❌ Failed to initialize hospital database: {e}")
+    def patient_lock(self, user_id):
+        """Lock that keeps one patient's transport, healing and discharge steps in order"""
+        lock = self.patient_locks.get(user_id)
+        if lock is None:
+            lock = self.patient_locks[user_id] = asyncio.Lock()
+        return lock
     
     def is_in_hospital(self, user_id):
         """Check if user is currently in hospital"""
         try:
-            conn = sqlite3.connect('stats.db')
-            cursor = conn.cursor()
-            cursor.execute('SELECT in_hospital FROM hospital_locations WHERE user_id = ?', (user_id,))
-            result = cursor.fetchone()
-            conn.close()
-            return result and result[0]
+            with track_db():
+                conn = sqlite3.connect('stats.db')
+                cursor = conn.cursor()
+                cursor.execute('SELECT in_hospital FROM hospital_locations WHERE user_id = ?', (user_id,))
+                result = cursor.fetchone()
+                conn.close()
+                return result and result[0]
         except Exception as e:
             logging.error(f"❌ Failed to check hospital status: {e}")
             return False
     
+    def _query_patients(self, sql, params=()):
+        with track_db():
+            conn = sqlite3.connect('stats.db')
+            try:
+                conn.row_factory = sqlite3.Row
+                cursor = conn.cursor()
+                cursor.execute(sql, params)
+                return [dict(row) for row in cursor.fetchall()]
+            finally:
+                conn.close()
+    
+    def _fetch_patients(self, sql, params=()):
+        try:
+            return self._query_patients(sql, params)
+        except Exception as e:
+            logging.error(f"❌ Failed to fetch hospital patients: {e}")
+            return []
+    
+    def get_unconscious_patients(self, include_queued=True):
+        """
+        Unconscious users with their hospital location and stabilization state, most critical first.
+        include_queued=False skips users waiting on an event-driven admission; if the
+        admission queue can't be read, it returns everyone unconscious rather than no one.
+        """
+        if not include_queued:
+            try:
+                return self._query_patients(SWEEP_PATIENTS_SQL)
+            except Exception as e:
+                logging.error(f"❌ Filtered hospital sweep query failed, sweeping all unconscious users: {e}")
+        return self._fetch_patients(UNCONSCIOUS_PATIENTS_SQL)
+    
+    def get_patient(self, user_id):
+        """One user's patient row (any health), or None"""
+        patients = self._fetch_patients(PATIENT_SQL, (user_id,))
+        return patients[0] if patients else None
+    
+    def get_conscious_patients(self):
+        """In-hospital patients who have regained consciousness and can be discharged"""
+        return self._fetch_patients(CONSCIOUS_PATIENTS_SQL)
+    
     def set_hospital_status(self, user_id, in_hospital, transport_time=None):
         """Set user's hospital status"""
         try:
-            conn = sqlite3.connect('stats.db')
-            cursor = conn.cursor()
-            
-            if transport_time is None:
-                transport_time = datetime.now()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO hospital_locations 
-                (user_id, in_hospital, transport_time) 
-                VALUES (?, ?, ?)
-            ''', (user_id, in_hospital, transport_time))
-            
-            conn.commit()
-            conn.close()
-            return True
+            with track_db():
+                conn = sqlite3.connect('stats.db')
+                cursor = conn.cursor()
+                
+                if transport_time is None:
+                    transport_time = datetime.now()
+                
+                cursor.execute('''
+                    INSERT OR REPLACE INTO hospital_locations 
+                    (user_id, in_hospital, transport_time) 
+                    VALUES (?, ?, ?)
+                ''', (user_id, in_hospital, transport_time))
+                
+                conn.commit()
+                conn.close()
+                return True
         except Exception as e:
             logging.error(f"❌ Failed to set hospital status: {e}")
             return False
@@ -107,48 +176,40 @@ class HospitalCore:
     def update_healing_attempt(self, user_id):
         """Update the last healing attempt timestamp"""
         try:
-            conn = sqlite3.connect('stats.db')
-            cursor = conn.cursor()
-            cursor.execute('''
-                UPDATE hospital_locations 
-                SET last_healing_attempt = ? 
-                WHERE user_id = ?
-            ''', (datetime.now(), user_id))
-            conn.commit()
-            conn.close()
+            with track_db():
+                conn = sqlite3.connect('stats.db')
+                cursor = conn.cursor()
+                cursor.execute('''
+                    UPDATE hospital_locations 
+                    SET last_healing_attempt = ? 
+                    WHERE user_id = ?
+                ''', (datetime.now(), user_id))
+                conn.commit()
+                conn.close()
         except Exception as e:
             logging.error(f"❌ Failed to update healing attempt: {e}")
     
     def log_hospital_action(self, user_id, username, action_type, amount=0, cost=0, 
                            payment_method="", success=True, health_before=0, health_after=0, details=""):
-        """Log hospital action to database (indefinitely by default)"""
-        try:
-            conn = sqlite3.connect('stats.db')
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO hospital_action_log 
-                (user_id, username, action_type, amount, cost, payment_method, 
-                 success, health_before, health_after, details)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (user_id, username, action_type, amount, cost, payment_method, 
-                  success, health_before, health_after, details))
-            
-            conn.commit()
-            conn.close()
-            return True
-        except Exception as e:
-            logging.error(f"❌ Failed to log hospital action: {e}")
-            return False
+        """Buffer a hospital action for the action log (indefinitely retained by default)"""
+        self.action_log.add(user_id, username, action_type, amount, cost,
+                            payment_method, success, health_before, health_after, details)
+        return True
+    
+    def flush_action_log(self):
+        """Write buffered action log rows now"""
+        return self.action_log.flush()
     
     def get_log_statistics(self):
         """Get hospital log statistics"""
+        self.flush_action_log()
         if self.maintenance:
             return self.maintenance.get_log_statistics()
         return None
     
     def perform_maintenance(self, force_backup=False):
         """Perform log maintenance (backup, optimization, etc.)"""
+        self.flush_action_log()
         if self.maintenance:
             return self.maintenance.perform_maintenance(force_backup)
         return False
@@ -169,59 +230,43 @@ class HospitalCore:
         return False
     
     async def get_health_log_channel(self):
-        """Get the health log channel, fallback to money log if not available"""
-        # Try to get HEALTH_LOG_ID from configuration first
-        health_log_id = getattr(self.bot, 'HEALTH_LOG_ID', None)
-        
-        # Also try to import from configuration
-        if not health_log_id:
-            try:
-                from UTILS.CONFIGURATION import HEALTH_LOG_ID
-                health_log_id = HEALTH_LOG_ID
-                logging.info(f"🏥 Found HEALTH_LOG_ID in configuration: {health_log_id}")
-            except ImportError:
-                logging.warning("❌ Could not import HEALTH_LOG_ID from configuration")
+        """Get the health log channel, fallback to money log if not available. Cached once resolved."""
+        if self._health_log_channel is not None:
+            return self._health_log_channel
         
+        # Try to get HEALTH_LOG_ID from the bot, then from configuration
+        health_log_id = getattr(self.bot, 'HEALTH_LOG_ID', None) or HEALTH_LOG_ID
         if health_log_id:
             health_log = self.bot.get_channel(health_log_id)
             if health_log:
                 logging.info(f"🏥 Using health log channel: {health_log.name} ({health_log_id})")
+                self._health_log_channel = health_log
                 return health_log
             else:
                 logging.warning(f"❌ Health log channel {health_log_id} not found or bot cannot access it")
         
         # Fallback to money log
-        money_log_id = getattr(self.bot, 'MONEY_LOG_ID', None)
-        
-        # Also try to import MONEY_LOG_ID from configuration
-        if not money_log_id:
-            try:
-                from UTILS.CONFIGURATION import MONEY_LOG_ID
-                money_log_id = MONEY_LOG_ID
-                logging.info(f"🏥 Found MONEY_LOG_ID in configuration: {money_log_id}")
-            except ImportError:
-                logging.warning("❌ Could not import MONEY_LOG_ID from configuration")
-        
+        money_log_id = getattr(self.bot, 'MONEY_LOG_ID', None) or MONEY_LOG_ID
         if money_log_id:
             money_log = self.bot.get_channel(money_log_id)
             if money_log:
                 logging.info(f"🏥 Using money log channel as health log fallback: {money_log.name} ({money_log_id})")
+                self._health_log_channel = money_log
                 return money_log
             else:
                 logging.warning(f"❌ Money log channel {money_log_id} not found or bot cannot access it")
         
-        # If no log channels available, log to console
+        # If no log channels available, log to console; resolution is retried on the next flush
         logging.warning("❌ No health log or money log channel available for hospital system - using console only")
         return None
     
     async def send_to_health_log(self, embed):
-        """Send embed to health log channel"""
-        log_channel = await self.get_health_log_channel()
-        if log_channel:
-            try:
-                await log_channel.send(embed=embed)
-            except Exception as e:
-                logging.error(f"❌ Failed to send to health log: {e}")
+        """Queue an embed for the health log; sent in batches by the log sink"""
+        self.health_log.add(embed)
+    
+    async def flush_health_log(self):
+        """Send everything queued for the health log now (end of a cycle, shutdown)"""
+        await self.health_log.flush()
     
     async def send_text_to_health_log(self, message, title="🏥 Hospital System", color=0x3498db):
         """Send a text message to health log channel as an embed"""
@@ -282,50 +327,45 @@ class HospitalCore:
     
     def heal_user(self, user_id, health_points):
         """Heal user by specified amount in the database"""
-        try:
-            conn = sqlite3.connect('stats.db')
-            cursor = conn.cursor()
-            
-            # Ensure parameters are the correct types
-            user_id = int(user_id)  # Convert to int in case it's a string
-            health_points = int(health_points)  # Ensure it's an integer
-            
-            # Get current health
-            cursor.execute('SELECT health FROM user_stats WHERE user_id = ?', (user_id,))
-            result = cursor.fetchone()
-            if not result:
-                conn.close()
-                logging.error(f"❌ User {user_id} not found in user_stats table")
-                return False
-            
-            current_health = int(result[0])  # Ensure current health is an integer
-            new_health = current_health + health_points
-            
-            # Update with properly typed parameters
-            cursor.execute('UPDATE user_stats SET health = ? WHERE user_id = ?', (new_health, user_id))
-            
-            # Verify the update was successful
-            if cursor.rowcount == 0:
-                conn.close()
-                logging.error(f"❌ No rows updated when healing user {user_id}")
-                return False
-            
-            conn.commit()
-            conn.close()
-            
-            logging.info(f"✅ Healed user {user_id}: {current_health} → {new_health} HP (+{health_points})")
-            return new_health
-            
-        except sqlite3.Error as e:
-            logging.error(f"❌ SQLite error when healing user {user_id}: {e}")
-            if 'conn' in locals():
-                conn.close()
-            return False
-        except Exception as e:
-            logging.error(f"❌ Failed to heal user {user_id}: {e}")
-            if 'conn' in locals():
-                conn.close()
+        # Single atomic UPDATE so concurrent combat/stabilization changes are never lost
+        with track_db():
+            change = apply_health_delta(int(user_id), int(health_points))
+        if not change:
+            logging.error(f"❌ Failed to heal user {user_id}")
             return False
+        
+        logging.info(f"✅ Healed user {user_id}: {change['old_health']} → {change['new_health']} HP (+{health_points})")
+        return change['new_health']
+    
+    def apply_hospital_healing(self, user_id, username, health_points, cost, payment_method, details=""):
+        """
+        Heal a patient, log the HEALING action and stamp the healing attempt in one transaction.
+        Returns the health change record, or None if nothing was written.
+        """
+        def write_log(cursor, changes):
+            if not changes:
+                return
+            change = changes[0]
+            record_actions(cursor, [action_row(
+                user_id, username, "HEALING", amount=change['applied'], cost=cost,
+                payment_method=payment_method, success=True,
+                health_before=change['old_health'], health_after=change['new_health'], details=details
+            )])
+            cursor.execute('''
+                UPDATE hospital_locations 
+                SET last_healing_attempt = ? 
+                WHERE user_id = ?
+            ''', (datetime.now(), user_id))
+        
+        with track_db():
+            changes = apply_health_deltas([(int(user_id), int(health_points))], in_transaction=write_log)
+        if not changes:
+            logging.error(f"❌ Failed to heal user {user_id}")
+            return None
+        
+        change = changes[0]
+        logging.info(f"✅ Healed user {user_id}: {change['old_health']} → {change['new_health']} HP (+{health_points})")
+        return change
 
     async def log_hospital_failures(self, failures_summary):
         """Send hospital failure summary to health log channel"""
@@ -414,7 +454,8 @@ class HospitalCore:
         # Add cycle info
         embed.add_field(
             name="⚡ Cycle Info",
-            value=f"Duration: {cycle_stats.get('duration', 0):.2f}s\nTotal actions: {cycle_stats.get('total_actions', 0)}",
+            value=f"Duration: {cycle_stats.get('duration', 0):.2f}s\nTotal actions: {cycle_stats.get('total_actions', 0)}"
+                  + (f"\nDeferred to next cycle: {cycle_stats['deferred']}" if cycle_stats.get('deferred') else ""),
             inline=False
         )
         
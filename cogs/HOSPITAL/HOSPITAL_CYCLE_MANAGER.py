@@ -1,8 +1,12 @@
+import asyncio
 import logging
 import time
 import sqlite3
+from contextlib import nullcontext
 from datetime import datetime, timedelta
+from UTILS.CONFIGURATION import HOSPITAL_CYCLE_CONCURRENCY, HOSPITAL_CYCLE_BUDGET
 from .HOSPITAL_CYCLE_LOGGER import HospitalCycleLogger
+from .HOSPITAL_CYCLE_METRICS import HospitalCycleMetrics, track_db
 
 class HospitalCycleManager:
     """Manages the main hospital processing cycle"""
@@ -11,9 +15,13 @@ class HospitalCycleManager:
         self.core = hospital_core
         self.treatment = hospital_treatment
         self.logger = HospitalCycleLogger(hospital_core)
+        self.metrics = HospitalCycleMetrics()
     
     async def run_full_cycle(self):
-        """Main cycle logic - Process all unconscious users"""
+        """
+        Periodic safety sweep - process unconscious users that event-driven
+        admission has not picked up. Stays quiet when there is nothing to do.
+        """
         cycle_start = time.time()
         cycle_stats = {
             'unconscious_count': 0,
@@ -25,67 +33,74 @@ class HospitalCycleManager:
             'total_actions': 0,
             'transport_failures': [],
             'healing_failures': [],
+            'deferred': 0,
             'duration': 0
         }
+        trace = self.metrics.start()
         
         try:
-            # Log cycle start
-            await self.core.send_info_to_health_log(
-                "Hospital cycle initiated - checking for unconscious users",
-                "🔄 Hospital Cycle Started"
-            )
-            
-            # Get StatsCore to check user health
-            stats_core = self.core.get_stats_core()
-            if not stats_core:
-                await self.core.send_error_to_health_log(
-                    "Hospital cycle aborted - StatsCore not available",
-                    "Cannot access user health statistics"
-                )
-                return cycle_stats
-            
-            # Get all users with stats
-            all_users = stats_core.get_all_users_with_stats()
+            await self._run_cycle(cycle_start, cycle_stats, trace)
+        finally:
+            cycle_stats['metrics'] = self.metrics.finish(trace, cycle_stats)
+        return cycle_stats
+    
+    async def _run_cycle(self, cycle_start, cycle_stats, trace):
+        try:
+            # One joined query returns only the unconscious users, with their hospital
+            # location and stabilization state; anyone with a pending admission is skipped
             unconscious_users = []
-            
-            # Find unconscious users
-            for user_id in all_users:
-                stats = stats_core.get_user_stats(user_id)
-                if stats and stats['health'] <= 0:
+            with trace.phase('discovery'):
+                for stats in self.core.get_unconscious_patients(include_queued=False):
                     cycle_stats['unconscious_count'] += 1
-                    user = self.core.bot.get_user(user_id)
+                    user = self.core.bot.get_user(stats['user_id'])
                     if user:
-                        unconscious_users.append((user_id, user, stats))
+                        unconscious_users.append((stats['user_id'], user, stats))
                         logging.info(f"🏥 Found unconscious user: {user.display_name} ({stats['health']} HP)")
             
             if not unconscious_users:
-                await self.core.send_info_to_health_log(
-                    "No unconscious users found - all patients are stable",
-                    "✅ Hospital Cycle Complete"
-                )
+                # Nothing to treat; only release patients who have recovered
+                with trace.phase('discharge'):
+                    discharged_count, discharged_patients = await self.treatment.discharge_all_conscious_patients()
+                cycle_stats['discharged'] = discharged_count
+                cycle_stats['total_actions'] += discharged_count
+                if discharged_count > 0:
+                    await self.core.send_info_to_health_log(
+                        f"Discharged {discharged_count} conscious patients: {', '.join(discharged_patients)}",
+                        "🚪 Automatic Discharge Complete"
+                    )
+                
+                logging.debug("🏥 Hospital sweep: no unconscious users")
                 cycle_stats['duration'] = time.time() - cycle_start
-                return cycle_stats
+                with trace.phase('logging'):
+                    self.core.flush_action_log()
+                    await self.core.flush_health_log()
+                return
             
             await self.core.send_info_to_health_log(
-                f"Found {len(unconscious_users)} unconscious users requiring medical attention",
+                f"Hospital sweep found {len(unconscious_users)} unconscious users requiring medical attention",
                 f"🚨 Emergency Response Needed"
             )
             
-            # Process each unconscious user
-            for user_id, user, stats in unconscious_users:
-                try:
-                    result = await self._process_single_user(user_id, user, stats, cycle_stats)
-                    cycle_stats.update(result)
-                except Exception as e:
-                    logging.error(f"❌ Error processing user {user.display_name}: {e}")
-                    await self.core.send_error_to_health_log(
-                        f"Error processing **{user.display_name}**: {str(e)}",
-                        "Individual user processing failed"
-                    )
+            # Process unconscious users through a bounded worker pool; anyone not
+            # started within the cycle budget waits for the next cycle
+            semaphore = asyncio.Semaphore(HOSPITAL_CYCLE_CONCURRENCY)
+            deadline = cycle_start + HOSPITAL_CYCLE_BUDGET
+            with trace.phase('patients'):
+                await asyncio.gather(*(
+                    self._process_with_limits(user_id, user, stats, cycle_stats, semaphore, deadline, trace)
+                    for user_id, user, stats in unconscious_users
+                ))
+            
+            if cycle_stats['deferred']:
+                await self.core.send_warning_to_health_log(
+                    f"Cycle budget of {HOSPITAL_CYCLE_BUDGET}s reached; {cycle_stats['deferred']} patients deferred to the next cycle",
+                    f"Processed {len(unconscious_users) - cycle_stats['deferred']} of {len(unconscious_users)} patients, {HOSPITAL_CYCLE_CONCURRENCY} at a time"
+                )
             
             # Discharge conscious patients
             try:
-                discharged_count, discharged_patients = await self.treatment.discharge_all_conscious_patients()
+                with trace.phase('discharge'):
+                    discharged_count, discharged_patients = await self.treatment.discharge_all_conscious_patients()
                 cycle_stats['discharged'] = discharged_count
                 cycle_stats['total_actions'] += discharged_count
                 
@@ -104,15 +119,16 @@ class HospitalCycleManager:
             # Calculate cycle duration
             cycle_stats['duration'] = time.time() - cycle_start
             
-            # Log failures if any
-            if cycle_stats['transport_failures'] or cycle_stats['healing_failures']:
-                await self.core.log_hospital_failures({
-                    'transport_failures': cycle_stats['transport_failures'],
-                    'healing_failures': cycle_stats['healing_failures']
-                })
-            
-            # Log cycle summary
-            await self.core.log_hospital_cycle_summary(cycle_stats)
+            with trace.phase('logging'):
+                # Log failures if any
+                if cycle_stats['transport_failures'] or cycle_stats['healing_failures']:
+                    await self.core.log_hospital_failures({
+                        'transport_failures': cycle_stats['transport_failures'],
+                        'healing_failures': cycle_stats['healing_failures']
+                    })
+                
+                # Log cycle summary
+                await self.core.log_hospital_cycle_summary(cycle_stats)
             
             logging.info(f"🏥 Hospital cycle complete: {cycle_stats['total_actions']} actions, {cycle_stats['duration']:.2f}s")
             
@@ -124,10 +140,69 @@ class HospitalCycleManager:
             )
             cycle_stats['duration'] = time.time() - cycle_start
         
-        return cycle_stats
+        # Write the cycle's action log rows in one transaction and deliver its health log entries together
+        with trace.phase('logging'):
+            self.core.flush_action_log()
+            await self.core.flush_health_log()
+    
+    async def _process_with_limits(self, user_id, user, stats, cycle_stats, semaphore, deadline, trace):
+        """Run one patient inside the worker pool, holding that patient's lock"""
+        async with semaphore:
+            if time.time() >= deadline:
+                cycle_stats['deferred'] += 1
+                return
+            
+            started = time.perf_counter()
+            try:
+                async with self.core.patient_lock(user_id):
+                    result = await self._process_single_user(user_id, user, stats, cycle_stats, trace)
+                for key, value in result.items():
+                    cycle_stats[key] += value
+            except Exception as e:
+                logging.error(f"❌ Error processing user {user.display_name}: {e}")
+                await self.core.send_error_to_health_log(
+                    f"Error processing **{user.display_name}**: {str(e)}",
+                    "Individual user processing failed"
+                )
+            
+            trace.record_patient(time.perf_counter() - started)
+            
+            # Let the gateway and other tasks run between patients
+            await asyncio.sleep(0)
     
-    async def _process_single_user(self, user_id, user, stats, cycle_stats):
-        """Process individual unconscious user"""
+    async def admit_patient(self, user_id):
+        """
+        Event-driven admission for one newly unconscious user: transport, stabilize,
+        and discharge if that brought them round.
+        Returns 'ADMITTED', 'RECOVERED', 'IN_COMBAT', 'UNKNOWN_USER' or 'FAILED'.
+        """
+        async with self.core.patient_lock(user_id):
+            stats = self.core.get_patient(user_id)
+            if not stats or stats['health'] > 0:
+                return 'RECOVERED'
+            
+            user = self.core.bot.get_user(user_id)
+            if not user:
+                return 'UNKNOWN_USER'
+            
+            if not stats['in_hospital'] and self.core.is_user_in_combat(user_id):
+                return 'IN_COMBAT'
+            
+            failures = {'transport_failures': [], 'healing_failures': []}
+            result = await self._process_single_user(user_id, user, stats, failures)
+            if failures['transport_failures'] or failures['healing_failures']:
+                await self.core.log_hospital_failures(failures)
+            
+            patient = self.core.get_patient(user_id)
+            if patient and patient['in_hospital'] and patient['health'] > 0:
+                await self.treatment.discharge.discharge_patient(user_id, "AUTO")
+        
+        return 'ADMITTED' if result['transported'] or result['healed_users'] else 'FAILED'
+    
+    async def _process_single_user(self, user_id, user, stats, cycle_stats, trace=None):
+        """Process individual unconscious user; trace times the transport and healing phases"""
+        transport_phase = trace.phase('transport') if trace else nullcontext()
+        healing_phase = trace.phase('healing') if trace else nullcontext()
         result_stats = {
             'transported': 0,
             'healed_users': 0,
@@ -137,7 +212,7 @@ class HospitalCycleManager:
         }
         
         current_health = stats['health']
-        in_hospital = self.core.is_in_hospital(user_id)
+        in_hospital = bool(stats['in_hospital'])
         in_combat = self.core.is_user_in_combat(user_id)
         
         logging.info(f"🏥 Processing {user.display_name}: {current_health} HP, in_hospital={in_hospital}, in_combat={in_combat}")
@@ -145,11 +220,13 @@ class HospitalCycleManager:
         # Step 1: Transport if needed and possible
         if not in_hospital and not in_combat:
             try:
-                transport_success = await self.treatment.transport_to_hospital(user_id)
+                with transport_phase:
+                    transport_success = await self.treatment.transport_to_hospital(user_id)
                 if transport_success:
                     result_stats['transported'] = 1
                     result_stats['total_actions'] += 1
                     result_stats['total_cost'] += 1000  # TRANSPORT_COST
+                    in_hospital = True
                     logging.info(f"✅ Transported {user.display_name} to hospital")
                 else:
                     # Transport failed - add to failures
@@ -166,12 +243,13 @@ class HospitalCycleManager:
             return result_stats
         
         # Step 2: Heal if in hospital
-        if self.core.is_in_hospital(user_id):
+        if in_hospital:
             try:
                 # Count healing sessions in the last 5 minutes to track multiple sessions
-                sessions_before = await self._count_recent_healing_sessions(user_id, datetime.now() - timedelta(minutes=5))
-                
-                healing_success = await self.treatment.attempt_stabilization_healing(user_id)
+                with healing_phase:
+                    sessions_before = await self._count_recent_healing_sessions(user_id, datetime.now() - timedelta(minutes=5))
+                    
+                    healing_success = await self.treatment.attempt_stabilization_healing(user_id)
                 
                 if healing_success:
                     # Count sessions after healing to see how many were added
@@ -199,30 +277,31 @@ class HospitalCycleManager:
     async def _count_recent_healing_sessions(self, user_id, since_time, include_cost=False):
         """Count healing sessions for tracking"""
         try:
-            conn = sqlite3.connect('stats.db')
-            cursor = conn.cursor()
-            
-            if include_cost:
-                cursor.execute('''
-                    SELECT COUNT(*), SUM(cost) 
-                    FROM hospital_action_log 
-                    WHERE user_id = ? AND action_type = "HEALING" AND success = 1 AND timestamp >= ?
-                ''', (user_id, since_time))
-                result = cursor.fetchone()
-                conn.close()
-                return {'count': result[0] if result[0] else 0, 'cost': result[1] if result[1] else 0}
-            else:
-                cursor.execute('''
-                    SELECT COUNT(*) 
-                    FROM hospital_action_log 
-                    WHERE user_id = ? AND action_type = "HEALING" AND success = 1 AND timestamp >= ?
-                ''', (user_id, since_time))
-                result = cursor.fetchone()
-                conn.close()
-                return result[0] if result[0] else 0
+            with track_db():
+                conn = sqlite3.connect('stats.db')
+                cursor = conn.cursor()
+                
+                if include_cost:
+                    cursor.execute('''
+                        SELECT COUNT(*), SUM(cost) 
+                        FROM hospital_action_log 
+                        WHERE user_id = ? AND action_type = "HEALING" AND success = 1 AND timestamp >= ?
+                    ''', (user_id, since_time))
+                    result = cursor.fetchone()
+                    conn.close()
+                    return {'count': result[0] if result[0] else 0, 'cost': result[1] if result[1] else 0}
+                else:
+                    cursor.execute('''
+                        SELECT COUNT(*) 
+                        FROM hospital_action_log 
+                        WHERE user_id = ? AND action_type = "HEALING" AND success = 1 AND timestamp >= ?
+                    ''', (user_id, since_time))
+                    result = cursor.fetchone()
+                    conn.close()
+                    return result[0] if result[0] else 0
         except Exception as e:
             logging.error(f"❌ Failed to count healing sessions: {e}")
             if include_cost:
                 return {'count': 0, 'cost': 0}
             else:
-                return 0
\ No newline at end of file
+                return 0
@@ -0,0 +1,159 @@
+import contextvars
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from UTILS.CONFIGURATION import HOSPITAL_CYCLE_METRICS_HISTORY
+
+# Upper bounds (seconds) of the per-patient latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# The trace of the cycle running in the current task; gather() copies it into patient tasks
+_CURRENT_TRACE = contextvars.ContextVar('hospital_cycle_trace', default=None)
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def latency_histogram(latencies):
+    """Bucket counts keyed by upper bound label, plus an overflow bucket"""
+    histogram = {f"≤{bound}s": 0 for bound in LATENCY_BUCKETS}
+    histogram[f">{LATENCY_BUCKETS[-1]}s"] = 0
+    for latency in latencies:
+        for bound in LATENCY_BUCKETS:
+            if latency <= bound:
+                histogram[f"≤{bound}s"] += 1
+                break
+        else:
+            histogram[f">{LATENCY_BUCKETS[-1]}s"] += 1
+    return histogram
+
+
+@contextmanager
+def track_db():
+    """Count and time a database operation against the running cycle, if any"""
+    trace = _CURRENT_TRACE.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.db['queries'] += 1
+        trace.db['seconds'] += time.perf_counter() - started
+
+
+@contextmanager
+def track_api(wait_seconds=0.0):
+    """Count and time a Discord API call against the running cycle; wait_seconds is time spent pacing before it"""
+    trace = _CURRENT_TRACE.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.api['calls'] += 1
+        trace.api['seconds'] += time.perf_counter() - started
+        trace.api['wait_seconds'] += wait_seconds
+
+
+class CycleTrace:
+    """Timings gathered while one hospital cycle runs"""
+
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        self.started = time.perf_counter()
+        self.phases = {}  # phase: seconds
+        self.latencies = []  # seconds per processed patient
+        self.db = {'queries': 0, 'seconds': 0.0}
+        self.api = {'calls': 0, 'seconds': 0.0, 'wait_seconds': 0.0}
+        self.token = None
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a phase. Phases run by concurrent patient workers (transport,
+        healing) add up, so they measure work done rather than wall time.
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def record_patient(self, seconds):
+        self.latencies.append(seconds)
+
+    def to_record(self, cycle_stats):
+        return {
+            'started_at': self.started_at,
+            'duration': time.perf_counter() - self.started,
+            'phases': {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            'patients': {
+                'processed': len(self.latencies),
+                'p50': _percentile(self.latencies, 0.5),
+                'p95': _percentile(self.latencies, 0.95),
+                'max': max(self.latencies, default=0.0),
+                'histogram': latency_histogram(self.latencies)
+            },
+            'db': dict(self.db),
+            'api': dict(self.api),
+            'unconscious': cycle_stats.get('unconscious_count', 0),
+            'actions': cycle_stats.get('total_actions', 0),
+            'deferred': cycle_stats.get('deferred', 0)
+        }
+
+
+class HospitalCycleMetrics:
+    """
+    Ring buffer of per-cycle instrumentation records, newest last.
+    The cycle manager opens a trace per cycle; track_db() and track_api()
+    calls made anywhere inside that cycle's tasks are charged to it.
+    """
+
+    def __init__(self, history=HOSPITAL_CYCLE_METRICS_HISTORY):
+        self.history = deque(maxlen=history)
+
+    def start(self):
+        trace = CycleTrace()
+        trace.token = _CURRENT_TRACE.set(trace)
+        return trace
+
+    def finish(self, trace, cycle_stats):
+        """Close a trace and keep its record; must run in the task that started it"""
+        _CURRENT_TRACE.reset(trace.token)
+        record = trace.to_record(cycle_stats)
+        self.history.append(record)
+        return record
+
+    def last(self):
+        return self.history[-1] if self.history else None
+
+    def get_metrics(self):
+        """The whole buffer plus aggregates across it"""
+        records = list(self.history)
+        latencies_p95 = [record['patients']['p95'] for record in records if record['patients']['processed']]
+        phase_totals = {}
+        for record in records:
+            for name, seconds in record['phases'].items():
+                phase_totals[name] = phase_totals.get(name, 0.0) + seconds
+
+        return {
+            'cycles': len(records),
+            'capacity': self.history.maxlen,
+            'avg_duration': sum(record['duration'] for record in records) / len(records) if records else 0.0,
+            'max_duration': max((record['duration'] for record in records), default=0.0),
+            'avg_phases': {name: seconds / len(records) for name, seconds in phase_totals.items()},
+            'worst_patient_p95': max(latencies_p95, default=0.0),
+            'db_queries': sum(record['db']['queries'] for record in records),
+            'api_calls': sum(record['api']['calls'] for record in records),
+            'history': records
+        }
@@ -173,26 +173,19 @@ class HospitalDischarge:
         discharged_patients = []
         
         try:
-            import sqlite3
-            conn = sqlite3.connect('stats.db')
-            cursor = conn.cursor()
-            cursor.execute('SELECT user_id FROM hospital_locations WHERE in_hospital = 1')
-            hospital_patients = cursor.fetchall()
-            conn.close()
-            
-            stats_core = self.core.get_stats_core()
-            if not stats_core:
-                return discharged_count, discharged_patients
-            
-            for (user_id,) in hospital_patients:
-                stats = stats_core.get_user_stats(user_id)
-                if stats and stats['health'] > 0:
-                    user = self.core.bot.get_user(user_id)
-                    if user:
-                        success = await self.discharge_patient(user_id, "AUTO")
-                        if success:
-                            discharged_count += 1
-                            discharged_patients.append(user.display_name)
+            # Conscious in-hospital patients come back from a single joined query
+            for patient in self.core.get_conscious_patients():
+                user = self.core.bot.get_user(patient['user_id'])
+                if user:
+                    async with self.core.patient_lock(patient['user_id']):
+                        # An event-driven admission may have discharged them since the query ran
+                        current = self.core.get_patient(patient['user_id'])
+                        if not current or not current['in_hospital'] or current['health'] <= 0:
+                            continue
+                        success = await self.discharge_patient(patient['user_id'], "AUTO")
+                    if success:
+                        discharged_count += 1
+                        discharged_patients.append(user.display_name)
             
         except Exception as e:
             logging.error(f"❌ Error in discharge_all_conscious_patients: {e}")
@@ -13,30 +13,14 @@ class HospitalEmergencyChecker:
         emergency_cases = []
         
         try:
-            stats_core = self.core.get_stats_core()
-            if not stats_core:
-                await self.core.send_error_to_health_log(
-                    "Emergency check failed - StatsCore not available",
-                    "Cannot assess emergency situations"
-                )
-                return emergency_cases
-            
-            all_users = stats_core.get_all_users_with_stats()
-            
-            for user_id in all_users:
-                user_stats = stats_core.get_user_stats(user_id)
-                if not user_stats:
-                    continue
-                
-                current_health = user_stats['health']
-                
-                # Only check unconscious users
-                if current_health <= 0:
-                    user = self.core.bot.get_user(user_id)
-                    if user:
-                        emergency_case = await self.categorize_emergency_case(user_id, user, user_stats)
-                        if emergency_case:
-                            emergency_cases.append(emergency_case)
+            # Only unconscious users can be emergencies; fetch just those
+            for user_stats in self.core.get_unconscious_patients():
+                user_id = user_stats['user_id']
+                user = self.core.bot.get_user(user_id)
+                if user:
+                    emergency_case = await self.categorize_emergency_case(user_id, user, user_stats)
+                    if emergency_case:
+                        emergency_cases.append(emergency_case)
             
             # Log emergency summary if any cases found
             if emergency_cases:
@@ -64,7 +48,7 @@ class HospitalEmergencyChecker:
         """Categorize individual emergency case"""
         try:
             current_health = stats['health']
-            in_hospital = self.core.is_in_hospital(user_id)
+            in_hospital = bool(stats['in_hospital']) if 'in_hospital' in stats else self.core.is_in_hospital(user_id)
             in_combat = self.core.is_user_in_combat(user_id)
             
             # Calculate max affordable healing to assess if they can be helped
@@ -164,34 +148,36 @@ class HospitalEmergencyChecker:
             user_id = emergency_case['user_id']
             action_needed = emergency_case['action_needed']
             
-            if action_needed == 'TRANSPORT_AND_HEAL':
-                # Transport then heal
-                transport_success = await self.treatment.transport_to_hospital(user_id)
-                if transport_success:
-                    healing_success = await self.treatment.attempt_stabilization_healing(user_id)
-                    return {'transport': transport_success, 'healing': healing_success}
-                else:
-                    return {'transport': False, 'healing': False}
+            # Serialized with the hospital cycle's work on the same patient
+            async with self.core.patient_lock(user_id):
+                if action_needed == 'TRANSPORT_AND_HEAL':
+                    # Transport then heal
+                    transport_success = await self.treatment.transport_to_hospital(user_id)
+                    if transport_success:
+                        healing_success = await self.treatment.attempt_stabilization_healing(user_id)
+                        return {'transport': transport_success, 'healing': healing_success}
+                    else:
+                        return {'transport': False, 'healing': False}
                     
-            elif action_needed == 'TRANSPORT_ONLY':
-                # Transport only
-                transport_success = await self.treatment.transport_to_hospital(user_id)
-                return {'transport': transport_success, 'healing': None}
+                elif action_needed == 'TRANSPORT_ONLY':
+                    # Transport only
+                    transport_success = await self.treatment.transport_to_hospital(user_id)
+                    return {'transport': transport_success, 'healing': None}
                 
-            elif action_needed == 'HEAL':
-                # Heal only (already in hospital)
-                healing_success = await self.treatment.attempt_stabilization_healing(user_id)
-                return {'transport': None, 'healing': healing_success}
+                elif action_needed == 'HEAL':
+                    # Heal only (already in hospital)
+                    healing_success = await self.treatment.attempt_stabilization_healing(user_id)
+                    return {'transport': None, 'healing': healing_success}
                 
-            elif action_needed == 'MONITOR':
-                # Just monitor, no action possible
-                return {'transport': None, 'healing': None, 'status': 'MONITORING'}
+                elif action_needed == 'MONITOR':
+                    # Just monitor, no action possible
+                    return {'transport': None, 'healing': None, 'status': 'MONITORING'}
                 
-            elif action_needed == 'WAIT_FOR_COMBAT_END':
-                # Cannot act while in combat
-                return {'transport': None, 'healing': None, 'status': 'BLOCKED_BY_COMBAT'}
+                elif action_needed == 'WAIT_FOR_COMBAT_END':
+                    # Cannot act while in combat
+                    return {'transport': None, 'healing': None, 'status': 'BLOCKED_BY_COMBAT'}
             
-            return {'error': f'Unknown action: {action_needed}'}
+                return {'error': f'Unknown action: {action_needed}'}
             
         except Exception as e:
             logging.error(f"❌ Emergency intervention failed: {e}")
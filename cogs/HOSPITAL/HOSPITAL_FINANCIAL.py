@@ -14,10 +14,10 @@ class HospitalFinancial:
     def __init__(self, hospital_core):
         self.core = hospital_core
     
-    def calculate_max_affordable_healing(self, user, current_health, max_health):
-        """Calculate maximum healing the user can afford"""
+    def calculate_max_affordable_healing(self, user, current_health, max_health, user_balance=None):
+        """Calculate maximum healing the user can afford; pass user_balance to reuse a BALANCE() read"""
         try:
-            user_balance = BALANCE(user)
+            user_balance = user_balance or BALANCE(user)
             user_cash = user_balance[0]
             user_bank = user_balance[1]
             user_total = user_balance[2]
@@ -62,14 +62,15 @@ class HospitalFinancial:
             logging.error(f"❌ Failed to calculate affordable healing: {e}")
             return 0, 0
     
-    def charge_for_service(self, user, amount, service_type):
+    def charge_for_service(self, user, amount, service_type, user_balance=None):
         """
         Charge user for hospital service. Try cash first, then credit if needed.
         Hospital services are not taxed.
+        Pass user_balance to reuse a BALANCE() read taken just before.
         Returns (success, method, actual_cost)
         """
         try:
-            user_balance = BALANCE(user)
+            user_balance = user_balance or BALANCE(user)
             user_cash = user_balance[0]
             user_bank = user_balance[1]
             user_total = user_balance[2]
@@ -2,6 +2,10 @@ import discord
 import logging
 from datetime import datetime
 
+from SHEKELS.BALANCE import BALANCE
+from SHEKELS.TRANSFERS import UPDATE_BALANCE
+from .HOSPITAL_CYCLE_METRICS import track_db
+
 HEALING_COST_PER_HP = 1000   # Cost in shekels per HP healed
 
 
@@ -59,157 +63,121 @@ class HospitalHealing:
             )
             return False
         
-        await self.core.send_text_to_health_log(
-            f"Beginning stabilization healing for **{user.display_name}** ({current_health}/{max_health} HP) - target: 1 HP minimum",
-            "🏥 Emergency Stabilization Started"
-        )
-        
-        total_hp_healed = 0
-        total_cost = 0
-        healing_sessions = []
-        session_count = 0
-        
-        # Keep healing until conscious (at least 1 HP) or can't afford more
-        while current_health <= 0:
-            session_count += 1
-            
-            # Calculate how much healing they need to reach 1 HP minimum
-            hp_needed_to_stabilize = 1 - current_health  # e.g., if at -5 HP, need 6 HP to reach 1
-            
-            # Calculate how much healing they can afford
-            affordable_hp, session_cost = self.financial.calculate_max_affordable_healing(user, current_health, max_health)
-            
-            # Limit healing to what's needed for stabilization (1 HP)
-            if current_health < 0:
-                # They're unconscious, prioritize getting to 1 HP
-                healing_amount = min(affordable_hp, hp_needed_to_stabilize)
-            else:
-                # This shouldn't happen in this loop, but safety check
-                healing_amount = affordable_hp
-            
-            if healing_amount <= 0:
-                # Can't afford any more healing
-                await self.core.send_warning_to_health_log(
-                    f"Healing session {session_count} for **{user.display_name}** stopped - insufficient funds",
-                    f"Cannot afford stabilization healing at ₪{HEALING_COST_PER_HP:,} per HP"
-                )
-                break
-            
-            # Recalculate cost based on actual healing amount
-            actual_session_cost = healing_amount * HEALING_COST_PER_HP
-            
-            await self.core.send_text_to_health_log(
-                f"Healing session {session_count} for **{user.display_name}**: attempting {healing_amount} HP for ₪{actual_session_cost:,} (stabilization priority)",
-                f"🩺 Stabilization Session {session_count}"
+        # Closed form: one balance read decides how much of the deficit is affordable,
+        # then one charge and one transactional heal + log write
+        hp_needed = 1 - current_health  # e.g., -5 HP needs 6 HP to reach 1 HP
+        try:
+            with track_db():
+                user_balance = BALANCE(user)
+        except Exception as e:
+            logging.error(f"❌ Failed to read balance for {user.display_name}: {e}")
+            user_balance = None
+        
+        affordable_hp = 0
+        if user_balance:
+            affordable_hp, _ = self.financial.calculate_max_affordable_healing(user, current_health, max_health, user_balance)
+        healing_amount = min(affordable_hp, hp_needed)
+        
+        if healing_amount <= 0:
+            self.core.update_healing_attempt(user_id)
+            await self.core.send_error_to_health_log(
+                f"No healing provided to **{user.display_name}** in hospital - insufficient funds for any treatment",
+                f"Patient remains at {current_health} HP. Minimum cost: ₪{HEALING_COST_PER_HP:,} per HP"
             )
-            
-            # Attempt to charge for this healing session
-            success, method, actual_cost = self.financial.charge_for_service(user, actual_session_cost, "healing")
-            
-            if success:
-                # Apply healing
-                new_health = self.core.heal_user(user_id, healing_amount)
-                if new_health is False:
-                    # Healing failed, refund
-                    if method == "cash":
-                        from SHEKELS.TRANSFERS import UPDATE_BALANCE
-                        UPDATE_BALANCE(user, actual_cost, "CASH")
-                    
-                    await self.core.send_error_to_health_log(
-                        f"Healing session {session_count} failed for **{user.display_name}** - database error (refunded)",
-                        f"Failed to update health in database. ₪{actual_cost:,} refunded."
-                    )
-                    break
-                
-                # Log successful healing session
-                self.core.log_hospital_action(
-                    user_id, user.display_name, "HEALING", 
-                    amount=healing_amount, cost=actual_cost, payment_method=method, success=True,
-                    health_before=current_health, health_after=new_health,
-                    details=f"Session {session_count} stabilization: {healing_amount} HP for ₪{actual_cost}"
-                )
-                
-                healing_sessions.append({
-                    'session': session_count,
-                    'hp': healing_amount,
-                    'cost': actual_cost,
-                    'method': method,
-                    'health_before': current_health,
-                    'health_after': new_health
-                })
-                
-                current_health = new_health
-                total_hp_healed += healing_amount
-                total_cost += actual_cost
-                
-                await self.core.send_info_to_health_log(
-                    f"Session {session_count} successful: **{user.display_name}** healed +{healing_amount} HP for ₪{actual_cost:,} ({method}) → {new_health} HP",
-                    "✅ Stabilization Session Complete"
-                )
-                
-                logging.info(f"🩺 Healed {user.display_name}: +{healing_amount} HP for ₪{actual_cost} ({method}). Now at {new_health} HP")
-                
-                # If now conscious (1 HP or more), we can stop
-                if current_health >= 1:
-                    await self.core.send_info_to_health_log(
-                        f"**{user.display_name}** is now stabilized at {current_health} HP! Emergency treatment complete after {session_count} sessions.",
-                        "🎉 Patient Stabilized"
-                    )
-                    break
-            
-            else:
-                # Payment failed
-                self.core.log_hospital_action(
-                    user_id, user.display_name, "HEALING_FAILED", 
-                    amount=healing_amount, cost=actual_session_cost, payment_method=method, success=False,
-                    health_before=current_health, health_after=current_health,
-                    details=f"Session {session_count} payment failed: {method}"
-                )
-                
-                await self.core.send_error_to_health_log(
-                    f"Healing session {session_count} failed for **{user.display_name}** - payment failure ({method})",
-                    f"Attempted to heal {healing_amount} HP for ₪{actual_session_cost:,} but payment failed"
-                )
-                break
+            logging.warning(f"❌ No healing provided to {user.display_name} in hospital (insufficient funds)")
+            return False
         
-        # Update healing attempt timestamp
-        self.core.update_healing_attempt(user_id)
+        session_cost = healing_amount * HEALING_COST_PER_HP
+        with track_db():
+            success, method, actual_cost = self.financial.charge_for_service(user, session_cost, "healing", user_balance)
+        
+        if not success:
+            self.core.update_healing_attempt(user_id)
+            self.core.log_hospital_action(
+                user_id, user.display_name, "HEALING_FAILED", 
+                amount=healing_amount, cost=session_cost, payment_method=method, success=False,
+                health_before=current_health, health_after=current_health,
+                details=f"Stabilization payment failed: {method}"
+            )
+            await self.core.send_error_to_health_log(
+                f"Stabilization healing failed for **{user.display_name}** - payment failure ({method})",
+                f"Attempted to heal {healing_amount} HP for ₪{session_cost:,} but payment failed"
+            )
+            return False
         
-        # Send comprehensive healing summary if any healing occurred
-        if healing_sessions:
-            await self._send_healing_summary(user, initial_health, current_health, total_hp_healed, 
-                                           total_cost, healing_sessions)
+        change = self.core.apply_hospital_healing(
+            user_id, user.display_name, healing_amount, actual_cost, method,
+            details=f"Stabilization: {healing_amount} HP for ₪{actual_cost} ({healing_amount}/{hp_needed} HP needed)"
+        )
+        if not change:
+            # Healing failed, refund
+            if method == "cash":
+                UPDATE_BALANCE(user, actual_cost, "CASH")
             
-            logging.info(f"🏥 Hospital stabilization complete for {user.display_name}: {total_hp_healed} HP healed across {len(healing_sessions)} sessions for ₪{total_cost}")
-            return True
-        
-        else:
-            # No healing occurred
             await self.core.send_error_to_health_log(
-                f"No healing provided to **{user.display_name}** in hospital - insufficient funds for any treatment",
-                f"Patient remains at {current_health} HP. Minimum cost: ₪{HEALING_COST_PER_HP:,} per HP"
+                f"Stabilization healing failed for **{user.display_name}** - database error (refunded)",
+                f"Failed to update health in database. ₪{actual_cost:,} refunded."
             )
-            logging.warning(f"❌ No healing provided to {user.display_name} in hospital (insufficient funds)")
             return False
+        
+        current_health = change['new_health']
+        breakdown = self._compute_breakdown(change['old_health'], change['applied'], method)
+        await self._send_healing_summary(user, initial_health, current_health, change['applied'],
+                                         actual_cost, method, hp_needed, breakdown)
+        
+        logging.info(f"🏥 Hospital stabilization complete for {user.display_name}: {change['applied']} HP healed for ₪{actual_cost} ({method}). Now at {current_health} HP")
+        return True
+    
+    def _compute_breakdown(self, health_before, hp_healed, method):
+        """Split one heal into the stages it covered, for the summary"""
+        breakdown = []
+        
+        # HP spent climbing out of negative health to 0
+        recovery_hp = min(hp_healed, max(0, -health_before))
+        if recovery_hp:
+            breakdown.append({
+                'stage': "Recovery",
+                'hp': recovery_hp,
+                'cost': recovery_hp * HEALING_COST_PER_HP,
+                'method': method,
+                'health_before': health_before,
+                'health_after': health_before + recovery_hp
+            })
+        
+        # The final HP that makes the patient conscious again
+        stabilization_hp = hp_healed - recovery_hp
+        if stabilization_hp:
+            start = health_before + recovery_hp
+            breakdown.append({
+                'stage': "Stabilization",
+                'hp': stabilization_hp,
+                'cost': stabilization_hp * HEALING_COST_PER_HP,
+                'method': method,
+                'health_before': start,
+                'health_after': start + stabilization_hp
+            })
+        
+        return breakdown
     
     async def _send_healing_summary(self, user, initial_health, current_health, total_hp_healed, 
-                                   total_cost, healing_sessions):
-        """Send comprehensive healing summary to health log"""
+                                   total_cost, method, hp_needed, breakdown):
+        """Send one healing summary embed to the health log"""
+        stabilized = current_health >= 1
         embed = discord.Embed(
-            title="🏥 Hospital Stabilization Complete",
+            title="🏥 Hospital Stabilization Complete" if stabilized else "🏥 Hospital Stabilization Incomplete",
             description=f"**{user.display_name}** has received emergency stabilization treatment!",
-            color=0x2ecc71 if current_health >= 1 else 0xe67e22
+            color=0x2ecc71 if stabilized else 0xe67e22
         )
         
         # Summary of total treatment
         embed.add_field(
             name="🩺 Treatment Summary",
-            value=f"Sessions: {len(healing_sessions)}\nTotal HP Restored: {total_hp_healed}\nHealth: {initial_health} → {current_health} HP\nTotal Cost: ₪{total_cost:,}",
+            value=f"HP Restored: {total_hp_healed} of {hp_needed} needed\nHealth: {initial_health} → {current_health} HP\nTotal Cost: ₪{total_cost:,} ({method})",
             inline=False
         )
         
         # Status after treatment
-        if current_health >= 1:
+        if stabilized:
             embed.add_field(
                 name="✅ Final Status",
                 value="Patient stabilized and conscious",
@@ -232,17 +200,14 @@ class HospitalHealing:
                 inline=True
             )
         
-        # Detailed session breakdown if multiple sessions
-        if len(healing_sessions) > 1:
-            session_details = []
-            for session in healing_sessions:
-                session_details.append(
-                    f"Session {session['session']}: +{session['hp']} HP for ₪{session['cost']:,} ({session['method']})"
-                )
-            
+        # Computed breakdown of what the single charge paid for
+        if breakdown:
             embed.add_field(
-                name="📋 Treatment Sessions",
-                value="\n".join(session_details),
+                name="📋 Treatment Breakdown",
+                value="\n".join(
+                    f"{stage['stage']}: +{stage['hp']} HP ({stage['health_before']} → {stage['health_after']}) for ₪{stage['cost']:,}"
+                    for stage in breakdown
+                ),
                 inline=False
             )
         
@@ -252,21 +217,9 @@ class HospitalHealing:
             inline=False
         )
         
-        embed.set_footer(text=f"Hospital provided {len(healing_sessions)} stabilization session(s) • No taxes applied")
+        embed.set_footer(text="Hospital stabilization • One charge • No taxes applied")
         
         await self.core.send_to_health_log(embed)
-        
-        # Send final status message
-        if current_health >= 1:
-            await self.core.send_info_to_health_log(
-                f"🎉 **{user.display_name}** stabilization successful: {total_hp_healed} HP restored across {len(healing_sessions)} sessions for ₪{total_cost:,}. Patient is now conscious and stabilized at {current_health} HP.",
-                "✅ Stabilization Successful"
-            )
-        else:
-            await self.core.send_warning_to_health_log(
-                f"⚠️ **{user.display_name}** stabilization incomplete: {total_hp_healed} HP restored across {len(healing_sessions)} sessions for ₪{total_cost:,}. Patient remains critical due to insufficient funds.",
-                "🔴 Stabilization Incomplete"
-            )
     
     async def attempt_additional_healing(self, user_id, target_hp=None):
         """Attempt additional healing beyond stabilization (for conscious patients)"""
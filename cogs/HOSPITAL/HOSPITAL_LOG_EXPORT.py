@@ -0,0 +1,47 @@
+import csv
+import gzip
+import json
+import logging
+import os
+import tempfile
+
+from .HOSPITAL_ACTION_LOG import LOG_COLUMNS, iter_actions
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+
+
+def export_actions(fmt, user_id=None, since=None, db_path='stats.db'):
+    """
+    Stream matching hospital_action_log rows, oldest first, into a gzipped CSV or
+    NDJSON temp file. Rows go straight from iter_actions() chunks to the
+    compressor, so memory stays at one chunk regardless of history size.
+    Blocking; run it in an executor. Returns (path, rows) and the caller deletes
+    the file, or (None, 0) on error.
+    """
+    if fmt not in EXPORT_FORMATS:
+        logging.error(f"❌ Unknown hospital log export format: {fmt}")
+        return None, 0
+
+    handle, path = tempfile.mkstemp(prefix="hospital_log_", suffix=f".{fmt}.gz")
+    os.close(handle)
+    rows = 0
+    try:
+        with gzip.open(path, 'wt', encoding='utf-8', newline='') as output:
+            if fmt == 'csv':
+                writer = csv.writer(output)
+                writer.writerow(LOG_COLUMNS)
+                for row in iter_actions(user_id, since, db_path=db_path):
+                    writer.writerow([row[column] for column in LOG_COLUMNS])
+                    rows += 1
+            else:
+                for row in iter_actions(user_id, since, db_path=db_path):
+                    row['success'] = bool(row['success'])
+                    output.write(json.dumps(row, ensure_ascii=False))
+                    output.write('\n')
+                    rows += 1
+    except Exception as e:
+        logging.error(f"❌ Failed to export hospital log: {e}")
+        os.remove(path)
+        return None, 0
+
+    return path, rows
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+import discord
+
+from UTILS.CONFIGURATION import (
+    HEALTH_LOG_FLUSH_SECONDS, HEALTH_LOG_MAX_BUFFER,
+    HEALTH_LOG_RATE_LIMIT, HEALTH_LOG_RATE_PERIOD
+)
+
+from .HOSPITAL_CYCLE_METRICS import track_api
+
+MAX_EMBEDS_PER_MESSAGE = 10  # Discord limits
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+
+class HealthLogSink:
+    """
+    Buffered writer for the health log channel.
+
+    Callers add embeds without waiting on Discord. The sink flushes after a
+    short debounce (or when flush() is awaited at the end of a cycle), packs
+    up to 10 embeds into each message, and paces sends to stay under the
+    channel rate limit instead of running into 429s.
+    """
+
+    def __init__(self, resolve_channel):
+        self.resolve_channel = resolve_channel  # async () -> channel or None
+        self.buffer = deque()
+        self.flush_task = None
+        self.lock = asyncio.Lock()
+        self.send_times = deque()  # monotonic times of recent sends, for pacing
+        self.messages_sent = 0
+        self.embeds_sent = 0
+        self.dropped = 0
+        self.rate_limited = 0
+
+    def add(self, embed):
+        """Queue an embed; the oldest entries are dropped if the buffer is full"""
+        if len(self.buffer) >= HEALTH_LOG_MAX_BUFFER:
+            self.buffer.popleft()
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 100 == 0:
+                logging.warning(f"⚠️ Health log buffer full; {self.dropped} entries dropped")
+        self.buffer.append(embed)
+
+        if self.flush_task is None or self.flush_task.done():
+            try:
+                self.flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+            except RuntimeError:
+                pass  # No running loop yet; the next flush() picks it up
+
+    async def _flush_later(self):
+        await asyncio.sleep(HEALTH_LOG_FLUSH_SECONDS)
+        await self.flush()
+
+    def _next_batch(self):
+        """Pop as many queued embeds as fit in one message"""
+        batch = []
+        size = 0
+        while self.buffer and len(batch) < MAX_EMBEDS_PER_MESSAGE:
+            embed_size = len(self.buffer[0])
+            if batch and size + embed_size > MAX_EMBED_CHARS_PER_MESSAGE:
+                break
+            batch.append(self.buffer.popleft())
+            size += embed_size
+        return batch
+
+    async def _wait_for_rate_limit(self):
+        """Sleep until another send fits in the rate window; returns the seconds waited"""
+        now = time.monotonic()
+        while self.send_times and now - self.send_times[0] >= HEALTH_LOG_RATE_PERIOD:
+            self.send_times.popleft()
+        if len(self.send_times) >= HEALTH_LOG_RATE_LIMIT:
+            await asyncio.sleep(HEALTH_LOG_RATE_PERIOD - (now - self.send_times[0]))
+            self.send_times.popleft()
+        self.send_times.append(time.monotonic())
+        return self.send_times[-1] - now
+
+    async def flush(self):
+        """Send everything queued so far"""
+        async with self.lock:
+            if not self.buffer:
+                return
+
+            channel = await self.resolve_channel()
+            if not channel:
+                logging.warning(f"⚠️ No health log channel; discarding {len(self.buffer)} entries")
+                self.buffer.clear()
+                return
+
+            while self.buffer:
+                batch = self._next_batch()
+                waited = await self._wait_for_rate_limit()
+                try:
+                    with track_api(waited):
+                        await channel.send(embeds=batch)
+                    self.messages_sent += 1
+                    self.embeds_sent += len(batch)
+                except discord.HTTPException as e:
+                    if e.status == 429:
+                        # Put the batch back and let the next flush retry it
+                        self.rate_limited += 1
+                        self.buffer.extendleft(reversed(batch))
+                        retry_after = getattr(e, 'retry_after', None) or HEALTH_LOG_RATE_PERIOD
+                        logging.warning(f"⚠️ Health log rate limited; retrying in {retry_after:.1f}s")
+                        self.flush_task = asyncio.get_running_loop().create_task(self._retry_later(retry_after))
+                        return
+                    logging.error(f"❌ Failed to send to health log: {e}")
+                except Exception as e:
+                    logging.error(f"❌ Failed to send to health log: {e}")
+
+    async def _retry_later(self, delay):
+        await asyncio.sleep(delay)
+        await self.flush()
+
+    def stop(self):
+        """Cancel a pending debounce; queued entries stay buffered"""
+        if self.flush_task and not self.flush_task.done():
+            self.flush_task.cancel()
+        self.flush_task = None
+
+    def get_metrics(self):
+        return {
+            'queued': len(self.buffer),
+            'messages_sent': self.messages_sent,
+            'embeds_sent': self.embeds_sent,
+            'embeds_per_message': self.embeds_sent / self.messages_sent if self.messages_sent else 0.0,
+            'dropped': self.dropped,
+            'rate_limited': self.rate_limited
+        }
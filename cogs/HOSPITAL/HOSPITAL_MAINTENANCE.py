@@ -1,7 +1,5 @@
 import sqlite3
 import logging
-import os
-import shutil
 from datetime import datetime, timedelta
 from typing import Optional
 
@@ -14,7 +12,7 @@ try:
         HOSPITAL_LOG_INDEX_OPTIMIZATION,
         HOSPITAL_ENABLE_LOG_BACKUP,
         HOSPITAL_BACKUP_INTERVAL_DAYS,
-        HOSPITAL_BACKUP_LOCATION
+        HOSPITAL_STATS_HOURLY_RETENTION_DAYS
     )
 except ImportError:
     # Default values if not configured
@@ -24,7 +22,10 @@ except ImportError:
     HOSPITAL_LOG_INDEX_OPTIMIZATION = True
     HOSPITAL_ENABLE_LOG_BACKUP = True
     HOSPITAL_BACKUP_INTERVAL_DAYS = 30
-    HOSPITAL_BACKUP_LOCATION = "backups/hospital_logs/"
+    HOSPITAL_STATS_HOURLY_RETENTION_DAYS = 7
+
+from BOT.BACKUP import DatabaseBackup
+from .HOSPITAL_ACTION_LOG import prune_hourly_rollups
 
 
 class HospitalLogMaintenance:
@@ -32,48 +33,15 @@ class HospitalLogMaintenance:
     
     def __init__(self):
         self.db_path = 'stats.db'
-        self.backup_location = HOSPITAL_BACKUP_LOCATION
+        self.backup = DatabaseBackup(self.db_path)
         self.last_cleanup = None
-        self.last_backup = None
-        self._ensure_backup_directory()
-        
-        if HOSPITAL_LOG_INDEX_OPTIMIZATION:
-            self._create_performance_indexes()
+        self.last_backup_result = None
+        # Log indexes are created once by BOT.MIGRATIONS
     
-    def _ensure_backup_directory(self):
-        """Ensure backup directory exists"""
-        if HOSPITAL_ENABLE_LOG_BACKUP:
-            os.makedirs(self.backup_location, exist_ok=True)
-    
-    def _create_performance_indexes(self):
-        """Create database indexes for better performance with large log tables"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Indexes for hospital_action_log table
-            indexes = [
-                "CREATE INDEX IF NOT EXISTS idx_hospital_log_user_id ON hospital_action_log(user_id)",
-                "CREATE INDEX IF NOT EXISTS idx_hospital_log_timestamp ON hospital_action_log(timestamp)",
-                "CREATE INDEX IF NOT EXISTS idx_hospital_log_action_type ON hospital_action_log(action_type)",
-                "CREATE INDEX IF NOT EXISTS idx_hospital_log_success ON hospital_action_log(success)",
-                "CREATE INDEX IF NOT EXISTS idx_hospital_log_user_timestamp ON hospital_action_log(user_id, timestamp)",
-                "CREATE INDEX IF NOT EXISTS idx_hospital_log_type_timestamp ON hospital_action_log(action_type, timestamp)",
-                
-                # Indexes for hospital_locations table
-                "CREATE INDEX IF NOT EXISTS idx_hospital_locations_status ON hospital_locations(in_hospital)",
-                "CREATE INDEX IF NOT EXISTS idx_hospital_locations_transport_time ON hospital_locations(transport_time)",
-            ]
-            
-            for index_sql in indexes:
-                cursor.execute(index_sql)
-            
-            conn.commit()
-            conn.close()
-            logging.info("✅ Hospital database indexes created/verified for performance optimization")
-            
-        except Exception as e:
-            logging.error(f"❌ Failed to create hospital database indexes: {e}")
+    @property
+    def last_backup(self):
+        """Time of the newest backup on disk, so the interval survives restarts"""
+        return self.backup.latest_backup_time()
     
     def get_log_statistics(self):
         """Get statistics about hospital logs"""
@@ -171,63 +139,25 @@ class HospitalLogMaintenance:
             return False
     
     def backup_logs(self, force_backup: bool = False):
-        """Create a backup of hospital logs"""
+        """Back up all of stats.db through the online backup API (blocking; see BOT.BACKUP)"""
         if not HOSPITAL_ENABLE_LOG_BACKUP and not force_backup:
             logging.info("🏥 Log backup is disabled")
             return False
         
         # Check if backup is needed
-        if not force_backup and self.last_backup:
-            time_since_backup = datetime.now() - self.last_backup
+        last_backup = self.last_backup
+        if not force_backup and last_backup:
+            time_since_backup = datetime.now() - last_backup
             if time_since_backup.days < HOSPITAL_BACKUP_INTERVAL_DAYS:
-                logging.info(f"🏥 Hospital log backup not needed (last backup {time_since_backup.days} days ago)")
+                logging.info(f"🏥 Database backup not needed (last backup {time_since_backup.days} days ago)")
                 return False
         
-        try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_filename = f"hospital_logs_backup_{timestamp}.db"
-            backup_path = os.path.join(self.backup_location, backup_filename)
-            
-            # Create backup by copying the database
-            shutil.copy2(self.db_path, backup_path)
-            
-            # Extract only hospital tables to a separate backup file
-            hospital_backup_path = os.path.join(self.backup_location, f"hospital_only_backup_{timestamp}.db")
-            
-            # Create hospital-only backup
-            source_conn = sqlite3.connect(self.db_path)
-            backup_conn = sqlite3.connect(hospital_backup_path)
-            
-            # Copy hospital tables
-            source_conn.execute("ATTACH DATABASE ? AS backup_db", (hospital_backup_path,))
-            
-            # Copy hospital_action_log table
-            source_conn.execute('''
-                CREATE TABLE backup_db.hospital_action_log AS 
-                SELECT * FROM hospital_action_log
-            ''')
-            
-            # Copy hospital_locations table
-            source_conn.execute('''
-                CREATE TABLE backup_db.hospital_locations AS 
-                SELECT * FROM hospital_locations
-            ''')
-            
-            source_conn.close()
-            backup_conn.close()
-            
-            self.last_backup = datetime.now()
-            
-            # Get backup statistics
-            backup_size = os.path.getsize(hospital_backup_path)
-            backup_size_mb = round(backup_size / (1024 * 1024), 2)
-            
-            logging.info(f"✅ Hospital logs backed up to {hospital_backup_path} ({backup_size_mb} MB)")
-            return True
-            
-        except Exception as e:
-            logging.error(f"❌ Failed to backup hospital logs: {e}")
+        result = self.backup.create_backup()
+        if not result:
             return False
+        
+        self.last_backup_result = result
+        return True
     
     def optimize_database(self):
         """Optimize database performance for large log tables"""
@@ -279,6 +209,12 @@ class HospitalLogMaintenance:
         if self.cleanup_old_logs():
             maintenance_performed = True
         
+        # Trim hourly stats rollups; daily rollups keep the totals
+        pruned = prune_hourly_rollups(HOSPITAL_STATS_HOURLY_RETENTION_DAYS, self.db_path)
+        if pruned:
+            logging.info(f"🏥 Pruned {pruned} hourly hospital stats rows")
+            maintenance_performed = True
+        
         # Optimize database
         if self.optimize_database():
             maintenance_performed = True
@@ -299,6 +235,7 @@ class HospitalLogMaintenance:
             'backup_interval_days': HOSPITAL_BACKUP_INTERVAL_DAYS,
             'last_cleanup': self.last_cleanup,
             'last_backup': self.last_backup,
+            'last_backup_result': self.last_backup_result,
             'indexes_enabled': HOSPITAL_LOG_INDEX_OPTIMIZATION,
-            'backup_location': self.backup_location
+            'backup_location': self.backup.backup_dir
         }
\ No newline at end of file
@@ -2,6 +2,7 @@ import logging
 from .HOSPITAL_CYCLE_MANAGER import HospitalCycleManager
 from .HOSPITAL_STATUS_MONITOR import HospitalStatusMonitor
 from .HOSPITAL_EMERGENCY_CHECKER import HospitalEmergencyChecker
+from .HOSPITAL_ADMISSIONS import HospitalAdmissions
 
 class HospitalProcessor:
     """Main hospital processor - delegates to specialized managers"""
@@ -14,6 +15,7 @@ class HospitalProcessor:
         self.cycle_manager = HospitalCycleManager(hospital_core, hospital_treatment)
         self.status_monitor = HospitalStatusMonitor(hospital_core, hospital_treatment)
         self.emergency_checker = HospitalEmergencyChecker(hospital_core, hospital_treatment)
+        self.admissions = HospitalAdmissions(hospital_core, self.cycle_manager)
     
     async def process_unconscious_users(self):
         """Main processing cycle - delegate to cycle manager"""
@@ -1,17 +1,75 @@
+import asyncio
 import discord
 from discord.ext import commands
 from discord import app_commands
+import os
 import sqlite3
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
-from UTILS.CONFIGURATION import GUILD_ID
+from UTILS.CONFIGURATION import GUILD_ID, HOSPITAL_LOG_EXPORT_MAX_BYTES, HOSPITAL_CYCLE_INTERVAL
+from .HOSPITAL_ACTION_LOG import get_action_totals, sum_totals, fetch_action_page
+from .HOSPITAL_LOG_EXPORT import export_actions
 
 GUILD = discord.Object(id=GUILD_ID)
 TRANSPORT_COST = 1000  # Cost in shekels for hospital transport
 HEALING_COST_PER_HP = 1000   # Cost in shekels per HP healed
 
 
+class HospitalLogPageView(discord.ui.View):
+    """Newer/Older buttons for /hospital_log, paging by (timestamp, id) keyset cursors"""
+    
+    def __init__(self, cog, user_id, since, title_suffix, window_text, rows):
+        super().__init__(timeout=300)
+        self.cog = cog
+        self.user_id = user_id
+        self.since = since
+        self.title_suffix = title_suffix
+        self.window_text = window_text
+        self.page = 1
+        self.rows = rows
+        self.has_older = True
+        self._update_buttons()
+    
+    def _update_buttons(self):
+        self.newer_page.disabled = self.page <= 1
+        self.older_page.disabled = not self.has_older
+    
+    async def _show_page(self, interaction, before=None, after=None):
+        page = fetch_action_page(self.user_id, self.since, before=before, after=after)
+        if page is None:
+            await interaction.response.send_message("❌ Failed to retrieve hospital activity log.", ephemeral=True)
+            return
+        rows, has_more = page
+        if not rows:
+            # Nothing further that way (e.g. rows pruned since); stay on this page
+            self.has_older = self.has_older and before is None
+            self._update_buttons()
+            await interaction.response.edit_message(view=self)
+            return
+        
+        if before is not None:
+            self.page += 1
+            self.has_older = has_more
+        else:
+            self.page = 1 if not has_more else max(self.page - 1, 2)
+            self.has_older = True
+        self.rows = rows
+        self._update_buttons()
+        embed = self.cog.build_log_embed(rows, self.title_suffix, self.window_text, self.page)
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    @discord.ui.button(label="Newer", style=discord.ButtonStyle.secondary, emoji="◀️")
+    async def newer_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        first = self.rows[0]
+        await self._show_page(interaction, after=(first['timestamp'], first['id']))
+    
+    @discord.ui.button(label="Older", style=discord.ButtonStyle.secondary, emoji="▶️")
+    async def older_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        last = self.rows[-1]
+        await self._show_page(interaction, before=(last['timestamp'], last['id']))
+
+
 class HospitalStatsCommands(commands.Cog):
     """Discord commands for hospital statistics and logging"""
     
@@ -25,6 +83,7 @@ class HospitalStatsCommands(commands.Cog):
     async def hospital_stats(self, interaction: discord.Interaction):
         """Show overall hospital system statistics"""
         try:
+            self.core.flush_action_log()
             conn = sqlite3.connect('stats.db')
             cursor = conn.cursor()
             
@@ -36,32 +95,30 @@ class HospitalStatsCommands(commands.Cog):
             cursor.execute('SELECT COUNT(*) FROM hospital_locations WHERE transport_time IS NOT NULL')
             total_transports = cursor.fetchone()[0]
             
-            # Recent action statistics (last 24 hours)
-            yesterday = datetime.now() - timedelta(days=1)
+            conn.close()
             
-            cursor.execute('SELECT COUNT(*) FROM hospital_action_log WHERE action_type = "TRANSPORT" AND success = 1 AND timestamp >= ?', (yesterday,))
-            recent_transports = cursor.fetchone()[0]
+            # Action statistics come from the hourly/daily rollups, not the raw log
+            recent = get_action_totals(since_hours=24)
+            all_time = get_action_totals()
+            if recent is None or all_time is None:
+                raise RuntimeError("hospital stats rollups unavailable")
             
-            cursor.execute('SELECT COUNT(*), SUM(amount), SUM(cost) FROM hospital_action_log WHERE action_type = "HEALING" AND success = 1 AND timestamp >= ?', (yesterday,))
-            healing_stats = cursor.fetchone()
-            recent_healing_sessions = healing_stats[0] if healing_stats[0] else 0
-            recent_hp_healed = healing_stats[1] if healing_stats[1] else 0
-            recent_healing_cost = healing_stats[2] if healing_stats[2] else 0
+            recent_transports = sum_totals(recent, "TRANSPORT", success=1)['actions']
             
-            cursor.execute('SELECT COUNT(*) FROM hospital_action_log WHERE action_type LIKE "%DISCHARGE%" AND timestamp >= ?', (yesterday,))
-            recent_discharges = cursor.fetchone()[0]
+            healing_stats = sum_totals(recent, "HEALING", success=1)
+            recent_healing_sessions = healing_stats['actions']
+            recent_hp_healed = healing_stats['amount']
+            recent_healing_cost = healing_stats['cost']
             
-            # All-time statistics
-            cursor.execute('SELECT COUNT(*), SUM(amount), SUM(cost) FROM hospital_action_log WHERE action_type = "HEALING" AND success = 1')
-            all_healing_stats = cursor.fetchone()
-            total_healing_sessions = all_healing_stats[0] if all_healing_stats[0] else 0
-            total_hp_healed = all_healing_stats[1] if all_healing_stats[1] else 0
-            total_healing_cost = all_healing_stats[2] if all_healing_stats[2] else 0
+            recent_discharges = sum_totals(recent, "DISCHARGE", partial=True)['actions']
             
-            cursor.execute('SELECT COUNT(*) FROM hospital_action_log WHERE action_type = "TRANSPORT" AND success = 1')
-            total_successful_transports = cursor.fetchone()[0]
+            # All-time statistics
+            all_healing_stats = sum_totals(all_time, "HEALING", success=1)
+            total_healing_sessions = all_healing_stats['actions']
+            total_hp_healed = all_healing_stats['amount']
+            total_healing_cost = all_healing_stats['cost']
             
-            conn.close()
+            total_successful_transports = sum_totals(all_time, "TRANSPORT", success=1)['actions']
             
             # Get unconscious users not in hospital
             stats_core = self.core.get_stats_core()
@@ -109,7 +166,7 @@ class HospitalStatsCommands(commands.Cog):
             
             embed.add_field(
                 name="ℹ️ System Info",
-                value="• Automatic checks every 5 minutes\n• Comprehensive healing until conscious\n• Multiple healing sessions per cycle\n• No transport during combat\n• No taxes on medical services",
+                value=f"• Admission as soon as a player is knocked out, plus a sweep every {HOSPITAL_CYCLE_INTERVAL // 60} minutes\n• Comprehensive healing until conscious\n• One charge and one heal per stabilization\n• No transport during combat\n• No taxes on medical services",
                 inline=False
             )
             
@@ -120,121 +177,171 @@ class HospitalStatsCommands(commands.Cog):
             logging.error(f"❌ Failed to get hospital stats: {e}")
             await interaction.response.send_message("❌ Failed to retrieve hospital statistics.", ephemeral=True)
     
-    @app_commands.command(name="hospital_log", description="View recent hospital activity")
-    @app_commands.describe(user="Filter by specific user (optional)", hours="Hours of history to show (default: 24)")
+    def _format_action_line(self, row):
+        """One /hospital_log line for an action row"""
+        username, action_type, amount, cost = row['username'], row['action_type'], row['amount'], row['cost']
+        payment_method, success = row['payment_method'], row['success']
+        health_before, health_after = row['health_before'], row['health_after']
+        
+        # Parse timestamp
+        try:
+            dt = datetime.fromisoformat(row['timestamp'])
+            time_str = dt.strftime("%m/%d %H:%M")
+        except:
+            time_str = "Unknown"
+        
+        # Format action based on type
+        status = "✅" if success else "❌"
+        if action_type == "TRANSPORT":
+            return f"`{time_str}` {status} **{username}** transported (₪{cost}, {payment_method})"
+        elif action_type == "HEALING":
+            return f"`{time_str}` {status} **{username}** healed +{amount} HP ({health_before}→{health_after}) (₪{cost}, {payment_method})"
+        elif action_type == "DISCHARGE":
+            return f"`{time_str}` 🚪 **{username}** discharged ({health_after} HP)"
+        elif action_type == "VOLUNTARY_DISCHARGE":
+            return f"`{time_str}` 🚪 **{username}** self-discharged ({health_after} HP)"
+        elif action_type == "ADMIN_DISCHARGE":
+            return f"`{time_str}` 🔧 **{username}** force discharged ({health_after} HP)"
+        return f"`{time_str}` {status} **{username}** {action_type.lower().replace('_', ' ')}"
+    
+    def build_log_embed(self, rows, title_suffix, window_text, page):
+        """Render one /hospital_log page"""
+        embed = discord.Embed(
+            title=f"🏥 Hospital Activity Log{title_suffix}",
+            description=f"Showing activity {window_text}",
+            color=0x3498db
+        )
+        
+        if not rows:
+            embed.add_field(
+                name="📭 No Activity",
+                value="No hospital activity found in the specified time period.",
+                inline=False
+            )
+            embed.set_footer(text="Hospital Activity Log")
+            return embed
+        
+        activity_lines = [self._format_action_line(row) for row in rows]
+        
+        # Keep within the field limit; the rest stay reachable through the buttons
+        activity_text = ""
+        for shown, line in enumerate(activity_lines):
+            if len(activity_text) + len(line) + 40 > 1024:
+                activity_text += f"... and {len(activity_lines) - shown} more entries"
+                break
+            activity_text += line + "\n"
+        
+        embed.add_field(
+            name="📋 Activity",
+            value=activity_text,
+            inline=False
+        )
+        
+        # Summary statistics for this page
+        successful_actions = sum(1 for row in rows if row['success'])
+        total_cost = sum(row['cost'] for row in rows if row['success'] and row['cost'])
+        
+        embed.add_field(
+            name="📊 This Page",
+            value=f"Actions: {len(rows)}\nSuccessful: {successful_actions}\nTotal Cost: ₪{total_cost:,}",
+            inline=True
+        )
+        
+        embed.set_footer(text=f"Hospital Activity Log • Page {page} • {rows[-1]['timestamp']} to {rows[0]['timestamp']} UTC")
+        return embed
+    
+    @staticmethod
+    def _log_window(hours):
+        """(since timestamp or None, description) for an hours option, 0 meaning all history"""
+        if not hours:
+            return None, "from all recorded history"
+        since = (datetime.now(timezone.utc) - timedelta(hours=hours)).strftime('%Y-%m-%d %H:%M:%S')
+        return since, f"from the last {hours} hours"
+    
+    @app_commands.command(name="hospital_log", description="View hospital activity")
+    @app_commands.describe(user="Filter by specific user (optional)", hours="Hours of history to show (default: 24, 0 for all history)")
     @app_commands.guilds(GUILD)
     async def hospital_log(self, interaction: discord.Interaction, user: discord.Member = None, hours: int = 24):
-        """View recent hospital activity log"""
-        if hours < 1 or hours > 168:  # Max 1 week
-            await interaction.response.send_message("❌ Hours must be between 1 and 168 (1 week).", ephemeral=True)
+        """Browse the hospital activity log page by page"""
+        if hours < 0:
+            await interaction.response.send_message("❌ Hours cannot be negative (use 0 for all history).", ephemeral=True)
             return
         
         try:
-            since_time = datetime.now() - timedelta(hours=hours)
+            self.core.flush_action_log()
+            since, window_text = self._log_window(hours)
+            user_id = user.id if user else None
+            title_suffix = f" - {user.display_name}" if user else ""
             
-            conn = sqlite3.connect('stats.db')
-            cursor = conn.cursor()
+            page = fetch_action_page(user_id, since)
+            if page is None:
+                raise RuntimeError("hospital log unavailable")
+            rows, has_more = page
             
-            if user:
-                cursor.execute('''
-                    SELECT timestamp, username, action_type, amount, cost, payment_method, 
-                           success, health_before, health_after, details
-                    FROM hospital_action_log 
-                    WHERE user_id = ? AND timestamp >= ?
-                    ORDER BY timestamp DESC
-                    LIMIT 20
-                ''', (user.id, since_time))
-                title_suffix = f" - {user.display_name}"
+            embed = self.build_log_embed(rows, title_suffix, window_text, 1)
+            if has_more:
+                view = HospitalLogPageView(self, user_id, since, title_suffix, window_text, rows)
+                await interaction.response.send_message(embed=embed, view=view)
             else:
-                cursor.execute('''
-                    SELECT timestamp, username, action_type, amount, cost, payment_method, 
-                           success, health_before, health_after, details
-                    FROM hospital_action_log 
-                    WHERE timestamp >= ?
-                    ORDER BY timestamp DESC
-                    LIMIT 20
-                ''', (since_time,))
-                title_suffix = ""
-            
-            results = cursor.fetchall()
-            conn.close()
-            
-            embed = discord.Embed(
-                title=f"🏥 Hospital Activity Log{title_suffix}",
-                description=f"Showing activity from the last {hours} hours",
-                color=0x3498db
-            )
-            
-            if not results:
-                embed.add_field(
-                    name="📭 No Activity",
-                    value="No hospital activity found in the specified time period.",
-                    inline=False
-                )
-            else:
-                activity_lines = []
-                for result in results:
-                    timestamp, username, action_type, amount, cost, payment_method, success, health_before, health_after, details = result
-                    
-                    # Parse timestamp
-                    try:
-                        dt = datetime.fromisoformat(timestamp)
-                        time_str = dt.strftime("%m/%d %H:%M")
-                    except:
-                        time_str = "Unknown"
-                    
-                    # Format action based on type
-                    if action_type == "TRANSPORT":
-                        status = "✅" if success else "❌"
-                        activity_lines.append(f"`{time_str}` {status} **{username}** transported (₪{cost}, {payment_method})")
-                    
-                    elif action_type == "HEALING":
-                        status = "✅" if success else "❌"
-                        activity_lines.append(f"`{time_str}` {status} **{username}** healed +{amount} HP ({health_before}→{health_after}) (₪{cost}, {payment_method})")
-                    
-                    elif action_type == "DISCHARGE":
-                        activity_lines.append(f"`{time_str}` 🚪 **{username}** discharged ({health_after} HP)")
-                    
-                    elif action_type == "VOLUNTARY_DISCHARGE":
-                        activity_lines.append(f"`{time_str}` 🚪 **{username}** self-discharged ({health_after} HP)")
-                    
-                    elif action_type == "ADMIN_DISCHARGE":
-                        activity_lines.append(f"`{time_str}` 🔧 **{username}** force discharged ({health_after} HP)")
-                    
-                    else:
-                        status = "✅" if success else "❌"
-                        activity_lines.append(f"`{time_str}` {status} **{username}** {action_type.lower().replace('_', ' ')}")
-                
-                # Split into chunks if too long
-                activity_text = "\n".join(activity_lines)
-                if len(activity_text) > 1024:
-                    # Take first entries and add more info
-                    activity_text = "\n".join(activity_lines[:15])
-                    activity_text += f"\n... and {len(activity_lines) - 15} more entries"
-                
-                embed.add_field(
-                    name="📋 Recent Activity",
-                    value=activity_text,
-                    inline=False
-                )
-                
-                # Add summary statistics
-                successful_actions = sum(1 for r in results if r[6])  # success column
-                total_cost = sum(r[4] for r in results if r[6] and r[4])  # cost column for successful actions
-                
-                embed.add_field(
-                    name="📊 Summary",
-                    value=f"Total Actions: {len(results)}\nSuccessful: {successful_actions}\nTotal Cost: ₪{total_cost:,}",
-                    inline=True
-                )
-            
-            embed.set_footer(text=f"Hospital Activity Log • Showing last {len(results) if results else 0} actions")
-            await interaction.response.send_message(embed=embed)
+                await interaction.response.send_message(embed=embed)
             
         except Exception as e:
             logging.error(f"❌ Failed to get hospital log: {e}")
             await interaction.response.send_message("❌ Failed to retrieve hospital activity log.", ephemeral=True)
     
+    @app_commands.command(name="hospital_log_export", description="[ADMIN] Export hospital activity as a compressed file")
+    @app_commands.describe(
+        format="File format",
+        user="Filter by specific user (optional)",
+        hours="Hours of history to export (default: 0 for all history)"
+    )
+    @app_commands.choices(format=[
+        app_commands.Choice(name="CSV", value="csv"),
+        app_commands.Choice(name="NDJSON", value="ndjson")
+    ])
+    @app_commands.guilds(GUILD)
+    async def hospital_log_export(self, interaction: discord.Interaction, format: str = "csv",
+                                  user: discord.Member = None, hours: int = 0):
+        """Stream the matching hospital log into a gzipped CSV or NDJSON attachment"""
+        if not interaction.user.guild_permissions.administrator:
+            await interaction.response.send_message("❌ You need administrator permissions to use this command.", ephemeral=True)
+            return
+        if hours < 0:
+            await interaction.response.send_message("❌ Hours cannot be negative (use 0 for all history).", ephemeral=True)
+            return
+        
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        self.core.flush_action_log()
+        since, window_text = self._log_window(hours)
+        
+        path, rows = await asyncio.get_running_loop().run_in_executor(
+            None, export_actions, format, user.id if user else None, since
+        )
+        if path is None:
+            await interaction.followup.send("❌ Failed to export hospital activity log.", ephemeral=True)
+            return
+        
+        try:
+            size = os.path.getsize(path)
+            if size > HOSPITAL_LOG_EXPORT_MAX_BYTES:
+                await interaction.followup.send(
+                    f"❌ Export is {size / (1024 * 1024):.1f} MB, over the "
+                    f"{HOSPITAL_LOG_EXPORT_MAX_BYTES / (1024 * 1024):.0f} MB upload limit. Narrow it by user or hours.",
+                    ephemeral=True
+                )
+                return
+            
+            scope = f"_{user.id}" if user else ""
+            filename = f"hospital_log{scope}_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.{format}.gz"
+            await interaction.followup.send(
+                f"📦 {rows:,} hospital log entries {window_text} ({size:,} bytes compressed)",
+                file=discord.File(path, filename=filename),
+                ephemeral=True
+            )
+            logging.info(f"📦 {interaction.user.display_name} exported {rows} hospital log rows ({format})")
+        finally:
+            os.remove(path)
+    
     @app_commands.command(name="force_discharge", description="[ADMIN] Force discharge a user from hospital")
     @app_commands.describe(user="The user to discharge from hospital")
     @app_commands.guilds(GUILD)
@@ -37,7 +37,8 @@ class HospitalTreatment:
     # Discharge operations (delegate to HospitalDischarge)
     async def discharge_patient(self, user_id, discharge_type="AUTO", admin_user=None):
         """Discharge a patient from hospital"""
-        return await self.discharge.discharge_patient(user_id, discharge_type, admin_user)
+        async with self.core.patient_lock(user_id):
+            return await self.discharge.discharge_patient(user_id, discharge_type, admin_user)
     
     async def can_discharge_safely(self, user_id):
         """Check if patient can be safely discharged"""
@@ -1,5 +1,8 @@
+import asyncio
 import discord
 from discord.ext import commands
+import io
+import json
 import logging
 
 from UTILS.CONFIGURATION import GUILD_ID
@@ -20,9 +23,9 @@ class HospitalSystem(commands.Cog):
     Main Hospital System cog that coordinates all hospital components.
     
     This system provides:
-    - Automatic transport for unconscious users
+    - Automatic transport as soon as users are knocked out
     - Comprehensive healing until conscious or funds exhausted
-    - Multiple healing sessions per cycle
+    - One charge and one heal per stabilization
     - Detailed logging and statistics (retained indefinitely by default)
     - Financial management with no taxes
     - Discord commands for management and monitoring
@@ -109,6 +112,9 @@ class HospitalSystem(commands.Cog):
         """Called when the cog is loaded"""
         logging.info("🏥 Hospital System cog loaded successfully")
         
+        # Knockouts queue their own admission; the scheduled cycle is a safety sweep
+        self.processor.admissions.start()
+        
         # Send startup message to health log
         await self.core.send_info_to_health_log(
             "Hospital System has been loaded and is now operational. All medical services are available.",
@@ -118,12 +124,16 @@ class HospitalSystem(commands.Cog):
     async def cog_unload(self):
         """Called when the cog is unloaded"""
         logging.info("🏥 Hospital System cog unloaded")
+        self.processor.admissions.stop()
         
         # Send shutdown message to health log
         await self.core.send_warning_to_health_log(
             "Hospital System is being unloaded. Medical services will be temporarily unavailable.",
             "🏥 Hospital System Offline"
         )
+        self.core.action_log.close()
+        await self.core.flush_health_log()
+        self.core.health_log.stop()
     
     # Emergency admin commands that bypass normal restrictions
     
@@ -257,7 +267,7 @@ class HospitalSystem(commands.Cog):
                 name="⚙️ Capabilities",
                 value="• Automatic transport\n"
                       "• Comprehensive healing\n"
-                      "• Multiple sessions per cycle\n"
+                      "• One charge and one heal per stabilization\n"
                       "• Indefinite log retention\n"
                       "• Database optimization\n"
                       "• Automatic backups\n"
@@ -270,9 +280,12 @@ class HospitalSystem(commands.Cog):
             # Health Log status
             health_log_channel = await self.core.get_health_log_channel()
             if health_log_channel:
+                sink = self.core.health_log.get_metrics()
                 embed.add_field(
                     name="📝 Health Log",
-                    value=f"✅ Connected to #{health_log_channel.name}",
+                    value=f"✅ Connected to #{health_log_channel.name}\n"
+                          f"Queued: {sink['queued']} • Sent: {sink['embeds_sent']} in {sink['messages_sent']} messages\n"
+                          f"Dropped: {sink['dropped']} • Rate limited: {sink['rate_limited']}",
                     inline=True
                 )
             else:
@@ -282,6 +295,33 @@ class HospitalSystem(commands.Cog):
                     inline=True
                 )
             
+            # Event-driven admissions
+            admissions = self.processor.admissions.get_metrics()
+            outcomes = ", ".join(f"{outcome.lower()}: {count}" for outcome, count in admissions['outcomes'].items()) or "none yet"
+            embed.add_field(
+                name="🚑 Admissions",
+                value=f"{'✅ Running' if admissions['running'] else '❌ Stopped'}\n"
+                      f"Queued: {admissions['queued']}\n"
+                      f"Outcomes: {outcomes}",
+                inline=True
+            )
+            
+            # Where the last hospital cycle spent its time
+            cycle = self.processor.cycle_manager.metrics.last()
+            if cycle:
+                phases = " • ".join(f"{name} {seconds:.2f}s" for name, seconds in cycle['phases'].items()) or "none"
+                patients = cycle['patients']
+                embed.add_field(
+                    name="⏱️ Last Cycle",
+                    value=f"{cycle['started_at']} UTC • {cycle['duration']:.2f}s\n"
+                          f"Phases: {phases}\n"
+                          f"Patients: {patients['processed']} (p50 {patients['p50']:.2f}s, p95 {patients['p95']:.2f}s)\n"
+                          f"DB: {cycle['db']['queries']} queries, {cycle['db']['seconds']:.2f}s\n"
+                          f"Discord: {cycle['api']['calls']} calls, {cycle['api']['seconds']:.2f}s "
+                          f"(+{cycle['api']['wait_seconds']:.2f}s paced)",
+                    inline=False
+                )
+            
             # Maintenance info
             if hasattr(self.core, 'maintenance') and self.core.maintenance:
                 maintenance_status = self.core.maintenance.get_maintenance_status()
@@ -305,6 +345,23 @@ class HospitalSystem(commands.Cog):
                 f"Error occurred while processing info request from {ctx.author.display_name}"
             )
     
+    @commands.command(name="hospital_metrics")
+    @commands.is_owner()
+    async def cycle_metrics(self, ctx):
+        """Send the hospital cycle timing history as JSON"""
+        metrics = self.processor.cycle_manager.metrics.get_metrics()
+        if not metrics['cycles']:
+            await ctx.send("ℹ️ No hospital cycles recorded since startup")
+            return
+        
+        summary = (
+            f"⏱️ {metrics['cycles']}/{metrics['capacity']} cycles • avg {metrics['avg_duration']:.2f}s, "
+            f"max {metrics['max_duration']:.2f}s • worst patient p95 {metrics['worst_patient_p95']:.2f}s\n"
+            + " • ".join(f"{name} {seconds:.2f}s avg" for name, seconds in metrics['avg_phases'].items())
+        )
+        data = io.BytesIO(json.dumps(metrics, indent=2).encode())
+        await ctx.send(summary, file=discord.File(data, filename="hospital_cycle_metrics.json"))
+    
     @commands.command(name="hospital_maintenance")
     @commands.is_owner()
     async def perform_maintenance_command(self, ctx, force_backup: bool = False):
@@ -318,10 +375,22 @@ class HospitalSystem(commands.Cog):
             )
             
             if hasattr(self.core, 'maintenance') and self.core.maintenance:
-                result = self.perform_maintenance(force_backup)
+                # Backup and VACUUM take a while; keep them off the event loop
+                self.core.flush_action_log()
+                backups_before = self.core.maintenance.last_backup_result
+                result = await asyncio.get_running_loop().run_in_executor(
+                    None, self.core.maintenance.perform_maintenance, force_backup
+                )
                 if result:
                     await ctx.send("✅ Hospital maintenance completed successfully")
                     
+                    backup = self.core.maintenance.last_backup_result
+                    if backup and backup is not backups_before:
+                        await ctx.send(
+                            f"💾 Database backed up to `{backup['path']}` "
+                            f"({backup['size'] / (1024 * 1024):.2f} MB, {backup['seconds']:.1f}s)"
+                        )
+                    
                     await self.core.send_info_to_health_log(
                         "System maintenance completed successfully",
                         "✅ Maintenance Complete"
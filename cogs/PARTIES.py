@@ -6,6 +6,10 @@ import os
 from datetime import datetime, timedelta
 import asyncio
 
+from cogs._COOLDOWNS import COOLDOWNS
+
+PARTY_JOIN_COOLDOWN = timedelta(days=30)
+
 GUILD_ID = 574731470900559872  # Match your bot's guild ID
 GUILD = discord.Object(id=GUILD_ID)
 
@@ -36,7 +40,7 @@ class PartiesCog(commands.Cog):
         self.bot = bot
         self.data_file = "UTILS/parties_data.json"
         self.parties = {}
-        self.user_cooldowns = {}
+        self.user_cooldowns = COOLDOWNS.get_store('party_join')
         self.pending_parties = {}  # Store pending party creations
         self.load_data()
     
@@ -82,26 +86,24 @@ class PartiesCog(commands.Cog):
                         if 'color' not in party_data:
                             party_data['color'] = 0x000000  # Default black color
                     
-                    # Convert string timestamps back to datetime objects
+                    # Saved timestamps are join times; expired ones are simply not loaded
                     cooldown_data = data.get('user_cooldowns', {})
-                    self.user_cooldowns = {}
                     for user_id, timestamp_str in cooldown_data.items():
-                        self.user_cooldowns[int(user_id)] = datetime.fromisoformat(timestamp_str)
+                        self.user_cooldowns.set_until(int(user_id), datetime.fromisoformat(timestamp_str) + PARTY_JOIN_COOLDOWN)
                         
                     # Load pending parties
                     self.pending_parties = data.get('pending_parties', {})
             except (json.JSONDecodeError, ValueError):
                 print("Error loading parties data, starting fresh")
                 self.parties = {}
-                self.user_cooldowns = {}
                 self.pending_parties = {}
     
     def save_data(self):
         """Save parties and cooldown data to file"""
-        # Convert datetime objects to strings for JSON serialization
+        # Persist active cooldowns as join times, matching the existing file format
         cooldown_data = {}
-        for user_id, timestamp in self.user_cooldowns.items():
-            cooldown_data[str(user_id)] = timestamp.isoformat()
+        for user_id, cooldown_end in self.user_cooldowns.export().items():
+            cooldown_data[str(user_id)] = (cooldown_end - PARTY_JOIN_COOLDOWN).isoformat()
         
         data = {
             'parties': self.parties,
@@ -114,24 +116,15 @@ class PartiesCog(commands.Cog):
     
     def is_on_cooldown(self, user_id):
         """Check if user is on cooldown"""
-        if user_id not in self.user_cooldowns:
-            return False
-        
-        cooldown_end = self.user_cooldowns[user_id] + timedelta(days=30)
-        return datetime.now() < cooldown_end
+        return self.user_cooldowns.is_active(user_id)
     
     def get_cooldown_remaining(self, user_id):
         """Get remaining cooldown time"""
-        if user_id not in self.user_cooldowns:
-            return None
-        
-        cooldown_end = self.user_cooldowns[user_id] + timedelta(days=30)
-        remaining = cooldown_end - datetime.now()
-        
-        if remaining.total_seconds() <= 0:
+        remaining = self.user_cooldowns.remaining(user_id)
+        if remaining <= 0:
             return None
         
-        return remaining
+        return timedelta(seconds=remaining)
     
     def is_party_chairman_or_admin(self, user_id, party_name):
         """Check if user is Chairman of the party or Administrator"""
@@ -338,7 +331,7 @@ class PartiesCog(commands.Cog):
             }
             
             # Set cooldown for the user
-            self.user_cooldowns[interaction.user.id] = datetime.now()
+            self.user_cooldowns.set(interaction.user.id, PARTY_JOIN_COOLDOWN.total_seconds())
             
             self.save_data()
             
@@ -412,7 +405,7 @@ class PartiesCog(commands.Cog):
         
         # Join the party
         self.parties[party_name]['members'].append(interaction.user.id)
-        self.user_cooldowns[interaction.user.id] = datetime.now()
+        self.user_cooldowns.set(interaction.user.id, PARTY_JOIN_COOLDOWN.total_seconds())
         
         # Assign party role if it exists
         await self.assign_party_role(interaction.user, party_name)
@@ -3,45 +3,14 @@ import logging
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Any
 
+from cogs._HEALTH import apply_health_delta
+
 class StabilizationDatabase:
     """Handles all stabilization database operations"""
     
     def __init__(self, db_path: str = 'stats.db'):
         self.db_path = db_path
     
-    def init_database(self):
-        """Initialize database tables with proper schema"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Create stabilization table if it doesn't exist
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS stabilization (
-                        user_id INTEGER PRIMARY KEY,
-                        is_unstable BOOLEAN DEFAULT FALSE,
-                        successes INTEGER DEFAULT 0,
-                        failures INTEGER DEFAULT 0,
-                        next_roll_time TIMESTAMP,
-                        last_recovery_time TIMESTAMP,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                ''')
-                
-                # Create index for performance
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_stabilization_next_roll 
-                    ON stabilization(next_roll_time, is_unstable)
-                ''')
-                
-                conn.commit()
-                logging.info("✅ Stabilization database initialized")
-                
-        except Exception as e:
-            logging.error(f"❌ Failed to initialize stabilization database: {e}")
-            raise
-    
     def get_stabilization_status(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Get user's current stabilization status"""
         try:
@@ -235,79 +204,38 @@ class StabilizationDatabase:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
                 
-                # Check what tables exist first
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-                tables = [row[0] for row in cursor.fetchall()]
-                logging.debug(f"Available tables: {tables}")
-                
-                # Try different possible table names/schemas
-                possible_queries = [
-                    # Option 1: user_stats table
+                cursor.execute(
                     "SELECT health as current_health, constitution, level FROM user_stats WHERE user_id = ?",
-                    # Option 2: characters table  
-                    "SELECT health as current_health, constitution, level FROM characters WHERE user_id = ?",
-                    # Option 3: Simple health table
-                    "SELECT health as current_health, 10 as constitution, 1 as level FROM user_health WHERE user_id = ?"
-                ]
+                    (user_id,)
+                )
+                row = cursor.fetchone()
+                if not row:
+                    logging.warning(f"No health data found for user {user_id}")
+                    return None
                 
-                for query in possible_queries:
-                    try:
-                        cursor.execute(query, (user_id,))
-                        row = cursor.fetchone()
-                        if row:
-                            result = dict(row)
-                            # Calculate max health (D&D 5e style)
-                            constitution = result.get('constitution', 10)
-                            level = result.get('level', 1)
-                            con_modifier = (constitution - 10) // 2
-                            max_health = max(level, 8 + con_modifier + (level - 1) * (5 + con_modifier))
-                            
-                            return {
-                                'current_health': result['current_health'],
-                                'max_health': max_health
-                            }
-                    except sqlite3.OperationalError as e:
-                        logging.debug(f"Query failed: {query} - {e}")
-                        continue
+                # Calculate max health (D&D 5e style)
+                constitution = row['constitution'] if row['constitution'] is not None else 10
+                level = row['level'] if row['level'] is not None else 1
+                con_modifier = (constitution - 10) // 2
+                max_health = max(level, 8 + con_modifier + (level - 1) * (5 + con_modifier))
                 
-                logging.warning(f"No health data found for user {user_id} in any table")
-                return None
+                return {
+                    'current_health': row['current_health'],
+                    'max_health': max_health
+                }
                 
         except Exception as e:
             logging.error(f"Error getting health for user {user_id}: {e}")
             return None
     
     def apply_health_change(self, user_id: int, health_change: int) -> Optional[int]:
-        """Apply health change and return new health value - FIXED to use user_stats table"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Get current health first from user_stats table
-                cursor.execute('SELECT health FROM user_stats WHERE user_id = ?', (user_id,))
-                result = cursor.fetchone()
-                
-                if not result:
-                    logging.warning(f"No user stats found for user {user_id}")
-                    return None
-                
-                current_health = result[0]
-                new_health = current_health + health_change
-                
-                # Update health in user_stats table
-                cursor.execute('''
-                    UPDATE user_stats 
-                    SET health = ? 
-                    WHERE user_id = ?
-                ''', (new_health, user_id))
-                
-                conn.commit()
-                logging.debug(f"Applied health change for user {user_id}: {current_health} -> {new_health}")
-                return new_health
-                
-        except Exception as e:
-            logging.error(f"Error applying health change for user {user_id}: {e}")
+        """Apply health change atomically and return new health value"""
+        change = apply_health_delta(user_id, health_change, db_path=self.db_path)
+        if not change:
             return None
+        
+        logging.debug(f"Applied health change for user {user_id}: {change['old_health']} -> {change['new_health']}")
+        return change['new_health']
     
     def clear_stabilization(self, user_id: int) -> bool:
         """Clear stabilization status (user is stable)"""
@@ -318,31 +246,3 @@ class StabilizationDatabase:
             failures=0,
             next_roll_time=None
         )
-    
-    def verify_database_setup(self):
-        """Verify that required tables exist and create them if needed"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Check if user_stats table exists
-                cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='user_stats'")
-                if not cursor.fetchone():
-                    # Create a basic user_stats table if it doesn't exist
-                    cursor.execute('''
-                        CREATE TABLE user_stats (
-                            user_id INTEGER PRIMARY KEY,
-                            health INTEGER DEFAULT 10,
-                            max_health INTEGER DEFAULT 10,
-                            level INTEGER DEFAULT 1,
-                            constitution INTEGER DEFAULT 10,
-                            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                        )
-                    ''')
-                    logging.warning("Created missing user_stats table with default schema")
-                
-                conn.commit()
-                return True
-        except Exception as e:
-            logging.error(f"Database verification failed: {e}")
-            return False
\ No newline at end of file
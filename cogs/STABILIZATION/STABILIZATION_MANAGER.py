@@ -19,13 +19,8 @@ class StabilizationManager:
     def initialize(self):
         """Initialize all stabilization systems"""
         try:
-            # Verify and initialize database
-            if not self.processor.database.verify_database_setup():
-                raise Exception("Database setup verification failed")
-            
-            self.processor.database.init_database()
-            
-            # Start background tasks
+            # Tables and indexes are created by BOT.MIGRATIONS before cogs load,
+            # so only the background tasks need starting here
             self.tasks.start_tasks()
             
             logging.info("✅ Stabilization system fully initialized")
@@ -218,8 +213,7 @@ class StabilizationManager:
             
             # Handle stabilization effects
             if new_health <= 0 and old_health > 0:
-                # Just went unconscious - start stabilization
-                self.start_stabilization(user_id)
+                # Just went unconscious - the DamageApplied event starts stabilization
                 embed.add_field(name="Effect", value="⚠️ Stabilization Started!", inline=False)
             elif new_health <= 0 and old_health <= 0:
                 # Already unconscious - add failure
@@ -17,6 +17,7 @@ except ImportError as e:
     logging.warning("Using fallback configuration - update with your actual values!")
 
 from .STABILIZATION.STABILIZATION_MANAGER import StabilizationManager
+from cogs._EVENTS import EVENT_BUS, DamageApplied
 
 GUILD = discord.Object(id=GUILD_ID)
 
@@ -35,9 +36,21 @@ class StabilizationCog(commands.Cog):
         except Exception as e:
             logging.error(f"❌ Failed to initialize Stabilization Cog: {e}")
             raise
+        
+        self.damage_subscription = EVENT_BUS.subscribe(DamageApplied, self.on_damage_applied, name="stabilization")
+    
+    def on_damage_applied(self, event):
+        """Start stabilization on a knockout; attacks on an unconscious player add failures"""
+        if event.old_health > 0 and event.new_health <= 0:
+            self.manager.start_stabilization(event.user_id)
+        elif event.old_health <= 0 and event.hits:
+            # Crit = 2 failures, normal hit = 1
+            failures = sum(2 if critical_hit else 1 for _, critical_hit in event.hits)
+            self.manager.add_stabilization_failure(event.user_id, failures)
     
     async def cog_unload(self):
         """Clean shutdown when cog is unloaded"""
+        EVENT_BUS.unsubscribe(self.damage_subscription)
         try:
             self.manager.shutdown()
             logging.info("⚠️ Stabilization Cog unloaded")
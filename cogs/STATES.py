@@ -6,6 +6,10 @@ import os
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
 
+from cogs._COOLDOWNS import COOLDOWNS
+
+STATE_CHANGE_COOLDOWN = timedelta(days=30)  # 30 days = ~1 month
+
 class States(commands.Cog):
     """A cog for managing fictional state roles with cooldowns using slash commands."""
     
@@ -13,6 +17,10 @@ class States(commands.Cog):
         self.bot = bot
         self.data_file = "UTILS/states_data.json"
         self.cooldown_data = self.load_cooldown_data()
+        self.state_cooldowns = COOLDOWNS.get_store('state_change')
+        for user_id, user_data in self.cooldown_data.items():
+            if 'cooldown_until' in user_data:
+                self.state_cooldowns.set_until(int(user_id), datetime.fromisoformat(user_data['cooldown_until']))
         
         # Define your state roles here - UPDATE THESE TO MATCH YOUR SERVER ROLES
         self.states = {
@@ -65,15 +73,13 @@ class States(commands.Cog):
             json.dump(self.cooldown_data, f, indent=2)
     
     def get_user_cooldown(self, user_id: int) -> Optional[datetime]:
-        """Get the cooldown end time for a user."""
-        user_data = self.cooldown_data.get(str(user_id))
-        if user_data and 'cooldown_until' in user_data:
-            return datetime.fromisoformat(user_data['cooldown_until'])
-        return None
+        """Get the cooldown end time for a user, or None if they can change states."""
+        return self.state_cooldowns.expires_at(user_id)
     
     def set_user_cooldown(self, user_id: int, state: str):
         """Set a one-month cooldown for a user."""
-        cooldown_end = datetime.now() + timedelta(days=30)  # 30 days = ~1 month
+        self.state_cooldowns.set(user_id, STATE_CHANGE_COOLDOWN.total_seconds())
+        cooldown_end = datetime.now() + STATE_CHANGE_COOLDOWN
         
         if str(user_id) not in self.cooldown_data:
             self.cooldown_data[str(user_id)] = {}
@@ -173,9 +179,8 @@ class States(commands.Cog):
             return
         
         # Check cooldown
-        cooldown_end = self.get_user_cooldown(interaction.user.id)
-        if cooldown_end and datetime.now() < cooldown_end:
-            time_left = cooldown_end - datetime.now()
+        if self.state_cooldowns.is_active(interaction.user.id):
+            time_left = timedelta(seconds=self.state_cooldowns.remaining(interaction.user.id))
             days_left = time_left.days
             hours_left = time_left.seconds // 3600
             
@@ -214,7 +219,7 @@ class States(commands.Cog):
             )
             embed.add_field(
                 name="⏰ Next Change Available",
-                value=f"<t:{int((datetime.now() + timedelta(days=30)).timestamp())}:R>",
+                value=f"<t:{int((datetime.now() + STATE_CHANGE_COOLDOWN).timestamp())}:R>",
                 inline=False
             )
             embed.set_footer(text=f"You are now a citizen of {matching_state}!")
@@ -278,18 +283,17 @@ class States(commands.Cog):
             )
         
         if cooldown_end:
-            if datetime.now() < cooldown_end:
-                embed.add_field(
-                    name="⏰ Next Change Available",
-                    value=f"<t:{int(cooldown_end.timestamp())}:R>",
-                    inline=False
-                )
-            else:
-                embed.add_field(
-                    name="✅ Change Status",
-                    value="You can change states now!",
-                    inline=False
-                )
+            embed.add_field(
+                name="⏰ Next Change Available",
+                value=f"<t:{int(cooldown_end.timestamp())}:R>",
+                inline=False
+            )
+        elif current_state:
+            embed.add_field(
+                name="✅ Change Status",
+                value="You can change states now!",
+                inline=False
+            )
         else:
             embed.add_field(
                 name="✅ Change Status",
@@ -305,6 +309,7 @@ class States(commands.Cog):
     async def reset_cooldown(self, interaction: discord.Interaction, member: discord.Member):
         """Reset a user's state change cooldown (Admin only)."""
         if str(member.id) in self.cooldown_data:
+            self.state_cooldowns.clear(member.id)
             self.cooldown_data[str(member.id)]['cooldown_until'] = datetime.now().isoformat()
             self.save_cooldown_data()
             await interaction.response.send_message(
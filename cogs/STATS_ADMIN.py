@@ -2,10 +2,14 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import logging
+import asyncio
 
 from UTILS.CONFIGURATION import GUILD_ID
 GUILD = discord.Object(id=GUILD_ID)
 
+# Seconds between progress edits while a bulk assignment is being written
+BULK_PROGRESS_INTERVAL = 2
+
 class StatsAdmin(commands.Cog):
     """Admin commands for managing user stats"""
     
@@ -65,9 +69,6 @@ class StatsAdmin(commands.Cog):
             guild = interaction.guild
             users_with_stats = set(stats_core.get_all_users_with_stats())
             
-            assigned_count = 0
-            failed_count = 0
-            
             members_to_assign = [
                 member for member in guild.members 
                 if not member.bot and member.id not in users_with_stats
@@ -85,19 +86,29 @@ class StatsAdmin(commands.Cog):
             )
             await interaction.followup.send(embed=progress_embed)
             
-            for i, member in enumerate(members_to_assign):
-                try:
-                    stats = stats_core.generate_stats()
-                    if stats_core.save_user_stats(member.id, member.display_name, stats):
-                        assigned_count += 1
-                        logging.info(f"✅ Assigned stats to {member.display_name} ({i+1}/{total_members})")
-                    else:
-                        failed_count += 1
-                        logging.error(f"❌ Failed to assign stats to {member.display_name}")
-                        
-                except Exception as e:
-                    failed_count += 1
-                    logging.error(f"❌ Error assigning stats to {member.display_name}: {e}")
+            entries = [
+                (member.id, member.display_name, stats)
+                for member, stats in zip(members_to_assign, stats_core.generate_stats_batch(total_members))
+            ]
+            
+            # Write everything in one transaction off the event loop, reporting progress meanwhile
+            progress = {'written': 0}
+            loop = asyncio.get_running_loop()
+            write_task = loop.run_in_executor(None, stats_core.save_user_stats_bulk, entries, progress)
+            
+            while not write_task.done():
+                await asyncio.wait({write_task}, timeout=BULK_PROGRESS_INTERVAL)
+                if not write_task.done():
+                    progress_embed.description = (
+                        f"Assigning stats to {total_members} members...\n"
+                        f"Written {progress['written']}/{total_members}"
+                    )
+                    await interaction.edit_original_response(embed=progress_embed)
+            
+            saved_ids = await write_task
+            stats_core.invalidate_users(saved_ids)
+            assigned_count = len(saved_ids)
+            failed_count = total_members - assigned_count
             
             completion_embed = discord.Embed(
                 title="📊 Stats Assignment Complete",
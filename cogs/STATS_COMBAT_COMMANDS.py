@@ -12,7 +12,7 @@ GUILD = discord.Object(id=GUILD_ID)
 logger = logging.getLogger(__name__)
 
 class StatsCombatCommands(commands.Cog):
-    """Combat user commands - /attack and /combat_status"""
+    """Combat user commands - /attack, /combat_status and /combat_record"""
     
     def __init__(self, bot):
         self.bot = bot
@@ -129,8 +129,9 @@ class StatsCombatCommands(commands.Cog):
             
             logger.debug("Hospital check passed")
             
+            # Ephemeral, so no public "thinking…" message lands below the combat feed and stops it being edited in place
             logger.debug("Deferring interaction response...")
-            await interaction.response.defer()
+            await interaction.response.defer(ephemeral=True)
             
             # Determine if this is a reaction
             logger.debug("Checking for pending reactions...")
@@ -147,6 +148,7 @@ class StatsCombatCommands(commands.Cog):
             logger.info(f"Executing attack: attacker={attacker.id}, target={target.id}, channel={interaction.channel.id}, is_reaction={is_reaction}")
             await combat_manager.execute_attack(attacker.id, target.id, interaction.channel.id, is_reaction=is_reaction)
             logger.info("Attack execution completed successfully")
+            await interaction.followup.send(f"⚔️ You attacked {target.display_name}. See the combat feed for the result.", ephemeral=True)
             
         except Exception as e:
             logger.error(f"Unexpected error in attack command: {type(e).__name__}: {str(e)}", exc_info=True)
@@ -269,6 +271,152 @@ class StatsCombatCommands(commands.Cog):
             except Exception as followup_error:
                 logger.error(f"Failed to send error message: {followup_error}")
 
+    @app_commands.command(name="combat_record", description="View lifetime combat statistics")
+    @app_commands.describe(member="Player to look up (defaults to you)")
+    @app_commands.guilds(GUILD)
+    async def combat_record(self, interaction: discord.Interaction, member: Optional[discord.Member] = None):
+        """Show hit rate, crit rate, damage, knockouts and rivals from the running totals"""
+        target = member or interaction.user
+        logger.info(f"Combat record command initiated by user {interaction.user.id} for {target.id}")
+        
+        try:
+            combat_core = self.get_combat_core()
+            if not combat_core:
+                await interaction.response.send_message("⛔ Combat system not available.", ephemeral=True)
+                return
+            
+            record = combat_core.get_combat_record(target.id)
+            if not record:
+                await interaction.response.send_message(f"🕊️ **{target.display_name}** has no combat history yet.", ephemeral=True)
+                return
+            
+            embed = discord.Embed(
+                title=f"⚔️ {target.display_name}'s Combat Record",
+                color=0x0099ff,
+                timestamp=discord.utils.utcnow()
+            )
+            embed.set_thumbnail(url=target.display_avatar.url)
+            
+            embed.add_field(
+                name="🗡️ Offense",
+                value=(
+                    f"Attacks: **{record['attacks']}**\n"
+                    f"Hit rate: **{record['hit_rate']:.0%}**\n"
+                    f"Crit rate: **{record['crit_rate']:.0%}**\n"
+                    f"Damage dealt: **{record['damage_dealt']}**"
+                ),
+                inline=True
+            )
+            embed.add_field(
+                name="🛡️ Defense",
+                value=(
+                    f"Attacked: **{record['attacks_received']}**\n"
+                    f"Hits taken: **{record['hits_taken']}**\n"
+                    f"Crits taken: **{record['crits_taken']}**\n"
+                    f"Damage taken: **{record['damage_taken']}**"
+                ),
+                inline=True
+            )
+            embed.add_field(
+                name="💀 Knockouts",
+                value=f"Dealt: **{record['knockouts']}**\nSuffered: **{record['times_knocked_out']}**",
+                inline=True
+            )
+            
+            if record['rivals']:
+                rival_lines = []
+                for rival in record['rivals']:
+                    opponent = self.bot.get_user(rival['user_id'])
+                    name = opponent.display_name if opponent else f"User {rival['user_id']}"
+                    rival_lines.append(
+                        f"**{name}** - {rival['attacks_made']} attacks made, {rival['attacks_received']} received "
+                        f"({rival['damage_dealt']} dealt / {rival['damage_taken']} taken)"
+                    )
+                embed.add_field(name="🎯 Rivals", value="\n".join(rival_lines), inline=False)
+            
+            await interaction.response.send_message(embed=embed)
+            logger.info("Combat record command completed successfully")
+            
+        except Exception as e:
+            logger.error(f"Unexpected error in combat_record command: {type(e).__name__}: {str(e)}", exc_info=True)
+            try:
+                if not interaction.response.is_done():
+                    await interaction.response.send_message("⛔ An error occurred while getting the combat record.", ephemeral=True)
+                else:
+                    await interaction.followup.send("⛔ An error occurred while getting the combat record.", ephemeral=True)
+            except Exception as followup_error:
+                logger.error(f"Failed to send error message: {followup_error}")
+
+    @app_commands.command(name="odds", description="See your exact odds of hitting another user")
+    @app_commands.describe(target="Player you would attack")
+    @app_commands.guilds(GUILD)
+    async def odds(self, interaction: discord.Interaction, target: discord.Member):
+        """Show hit chance, crit chance and the damage distribution against a target"""
+        logger.info(f"Odds command initiated by user {interaction.user.id} against {target.id}")
+        
+        try:
+            combat_core = self.get_combat_core()
+            if not combat_core:
+                await interaction.response.send_message("⛔ Combat system not available.", ephemeral=True)
+                return
+            
+            stats_core = combat_core.get_stats_core()
+            if not stats_core:
+                await interaction.response.send_message("⛔ Stats system not available.", ephemeral=True)
+                return
+            
+            attacker_stats = stats_core.get_user_stats(interaction.user.id)
+            defender_stats = stats_core.get_user_stats(target.id)
+            if not attacker_stats:
+                await interaction.response.send_message("⛔ You don't have stats yet!", ephemeral=True)
+                return
+            if not defender_stats:
+                await interaction.response.send_message(f"⛔ **{target.display_name}** doesn't have stats yet!", ephemeral=True)
+                return
+            
+            odds = combat_core.get_odds(attacker_stats, defender_stats)
+            
+            embed = discord.Embed(
+                title=f"🎲 Odds vs {target.display_name}",
+                color=0x0099ff
+            )
+            embed.add_field(
+                name="🎯 To Hit",
+                value=(
+                    f"Hit: **{odds['hit_chance']:.0%}** (need {max(odds['needed_roll'], 2)}+ on the die)\n"
+                    f"Critical: **{odds['crit_chance']:.0%}**"
+                ),
+                inline=True
+            )
+            embed.add_field(
+                name="💥 Damage",
+                value=(
+                    f"Hit: **{odds['damage_on_hit'][0]}-{odds['damage_on_hit'][1]}**\n"
+                    f"Critical: **{odds['damage_on_crit'][0]}-{odds['damage_on_crit'][1]}**\n"
+                    f"Expected per attack: **{odds['expected_damage']:.2f}**"
+                ),
+                inline=True
+            )
+            
+            distribution = "\n".join(
+                f"{'Miss' if amount == 0 else f'{amount} dmg'}: {chance:.1%}"
+                for amount, chance in odds['distribution'] if chance > 0
+            )
+            embed.add_field(name="📊 Damage Distribution", value=distribution, inline=False)
+            embed.set_footer(text="Odds for a single attack with current stats")
+            
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            
+        except Exception as e:
+            logger.error(f"Unexpected error in odds command: {type(e).__name__}: {str(e)}", exc_info=True)
+            try:
+                if not interaction.response.is_done():
+                    await interaction.response.send_message("⛔ An error occurred while calculating odds.", ephemeral=True)
+                else:
+                    await interaction.followup.send("⛔ An error occurred while calculating odds.", ephemeral=True)
+            except Exception as followup_error:
+                logger.error(f"Failed to send error message: {followup_error}")
+
 async def setup(bot):
     try:
         await bot.add_cog(StatsCombatCommands(bot))
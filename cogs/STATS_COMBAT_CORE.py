@@ -1,13 +1,19 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 import sqlite3
 import random
 import logging
+import asyncio
+import runpy
 from datetime import datetime, timedelta
 from typing import Optional
 
-from UTILS.CONFIGURATION import GUILD_ID
+import UTILS.CONFIGURATION
+from UTILS.CONFIGURATION import GUILD_ID, COMBAT_LOG_PRUNE_INTERVAL_HOURS, COMBAT_RULES
+from cogs._HEALTH import apply_health_delta
+from cogs._COMBAT_LOG import CombatLogRetention, record_combat_action, get_combat_record
+from cogs._COMBAT_ODDS import CombatOdds, rules_fingerprint
 GUILD = discord.Object(id=GUILD_ID)
 
 
@@ -16,33 +22,15 @@ class StatsCombatCore(commands.Cog):
     
     def __init__(self, bot):
         self.bot = bot
-        self.init_database()
+        self.rules = dict(COMBAT_RULES)
+        self.odds = CombatOdds(self.rules)
+        self.log_retention = CombatLogRetention()
+        if self.log_retention.retention_days:
+            self.combat_log_retention_loop.start()
     
-    def init_database(self):
-        """Initialize database tables for combat system"""
-        try:
-            conn = sqlite3.connect('stats.db')
-            cursor = conn.cursor()
-            
-            # Combat log table for tracking fights
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS combat_log (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    attacker_id INTEGER,
-                    defender_id INTEGER,
-                    damage INTEGER,
-                    hit BOOLEAN,
-                    critical_hit BOOLEAN,
-                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            conn.commit()
-            conn.close()
-            logging.info("✅ Combat database initialized successfully")
-            
-        except Exception as e:
-            logging.error(f"❌ Failed to initialize combat database: {e}")
+    def cog_unload(self):
+        """Clean up when cog is unloaded"""
+        self.combat_log_retention_loop.cancel()
     
     def get_stats_core(self):
         """Get the StatsCore cog for accessing core functionality"""
@@ -64,13 +52,15 @@ class StatsCombatCore(commands.Cog):
     
     def make_attack_roll(self, attacker_stats, defender_stats):
         """Make an attack roll using D&D 5e mechanics"""
+        rules = self.rules
+        
         # Roll 1d20
-        roll = random.randint(1, 20)
+        roll = random.randint(1, rules['attack_die'])
         
         # Calculate attack bonus (strength modifier + proficiency)
         str_modifier = self.get_ability_modifier(attacker_stats['strength'])
         level = attacker_stats.get('level', 1)
-        proficiency_bonus = 2 + ((level - 1) // 4)  # D&D proficiency progression
+        proficiency_bonus = rules['base_proficiency'] + ((level - 1) // rules['proficiency_levels'])  # D&D proficiency progression
         attack_bonus = str_modifier + proficiency_bonus
         
         # Calculate total attack
@@ -79,11 +69,11 @@ class StatsCombatCore(commands.Cog):
         # Calculate target AC (10 + dex modifier + natural armor based on level)
         dex_modifier = self.get_ability_modifier(defender_stats['dexterity'])
         defender_level = defender_stats.get('level', 1)
-        natural_armor = (defender_level - 1) // 4  # +1 AC every 4 levels
-        target_ac = 10 + dex_modifier + natural_armor
+        natural_armor = (defender_level - 1) // rules['natural_armor_levels']  # +1 AC every 4 levels
+        target_ac = rules['base_ac'] + dex_modifier + natural_armor
         
         # Determine hit/miss/critical
-        critical_hit = (roll == 20)
+        critical_hit = (roll == rules['attack_die'])
         critical_miss = (roll == 1)
         hit = (total_attack >= target_ac) and not critical_miss
         
@@ -101,63 +91,126 @@ class StatsCombatCore(commands.Cog):
             'critical_miss': critical_miss
         }
     
-    def calculate_damage(self, attacker_stats):
+    def calculate_damage(self, attacker_stats, critical_hit=False):
         """Calculate damage for a successful hit"""
+        rules = self.rules
+        
         # Base damage: 1d6 + strength modifier
-        base_damage = random.randint(1, 6)
+        base_damage = random.randint(1, rules['damage_die'])
         str_modifier = self.get_ability_modifier(attacker_stats['strength'])
         
         # Level-based damage bonus
         level = attacker_stats.get('level', 1)
-        level_bonus = (level - 1) // 2  # +1 damage every 2 levels
+        level_bonus = (level - 1) // rules['damage_bonus_levels']  # +1 damage every 2 levels
         
-        total_damage = base_damage + str_modifier + level_bonus
-        return max(1, total_damage)  # Minimum 1 damage
+        total_damage = max(rules['min_damage'], base_damage + str_modifier + level_bonus)
+        if critical_hit:
+            total_damage *= rules['crit_multiplier']  # Critical hits double damage
+        return total_damage
+    
+    def get_odds(self, attacker_stats, defender_stats):
+        """
+        Look up exact hit/crit/damage odds. The tables match self.rules, which only
+        changes through $reload_combat_rules; that command rebuilds them.
+        """
+        return self.odds.get_odds(attacker_stats, defender_stats)
+    
+    def apply_damage_change(self, user_id, damage, hits=()):
+        """Apply damage atomically and return the full change record (old/new health, transition)"""
+        return apply_health_delta(user_id, -damage, hits=hits)
     
     def apply_damage(self, user_id, damage):
         """Apply damage to a user and return new health"""
+        change = self.apply_damage_change(user_id, damage)
+        return change['new_health'] if change else None
+    
+    def log_combat_action(self, attacker_id, defender_id, damage, hit, critical_hit, knockout=False):
+        """Log combat action and update running totals in the same transaction"""
         try:
             conn = sqlite3.connect('stats.db')
-            cursor = conn.cursor()
-            
-            # Get current health
-            cursor.execute('SELECT health FROM user_stats WHERE user_id = ?', (user_id,))
-            result = cursor.fetchone()
-            
-            if not result:
-                conn.close()
-                return None
-            
-            current_health = result[0]
-            new_health = current_health - damage
-            
-            # Update health in database
-            cursor.execute('UPDATE user_stats SET health = ? WHERE user_id = ?', (new_health, user_id))
-            conn.commit()
+            with conn:
+                record_combat_action(conn.cursor(), attacker_id, defender_id, damage, hit, critical_hit, knockout)
             conn.close()
             
-            return new_health
-            
         except Exception as e:
-            logging.error(f"❌ Failed to apply damage: {e}")
-            return None
+            logging.error(f"❌ Failed to log combat action: {e}")
     
-    def log_combat_action(self, attacker_id, defender_id, damage, hit, critical_hit):
-        """Log combat action to database"""
-        try:
-            conn = sqlite3.connect('stats.db')
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO combat_log (attacker_id, defender_id, damage, hit, critical_hit)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (attacker_id, defender_id, damage, hit, critical_hit))
+    def get_combat_record(self, user_id):
+        """Get lifetime combat totals and top rivals for a user"""
+        return get_combat_record(user_id)
+    
+    async def run_log_retention(self):
+        """Roll up and prune expired combat_log rows one short batch at a time"""
+        cutoff = self.log_retention.get_cutoff()
+        total_pruned = 0
+        self.log_retention.last_error = None
+        
+        while True:
+            try:
+                pruned = self.log_retention.prune_batch(cutoff)
+            except Exception as e:
+                # Kept in the status so a schema problem doesn't fail silently every run
+                self.log_retention.last_error = str(e)
+                logging.error(f"❌ Combat log retention batch failed: {e}")
+                break
             
-            conn.commit()
-            conn.close()
+            total_pruned += pruned
+            if pruned < self.log_retention.batch_size:
+                break
             
+            # Release the write lock and let other coroutines run between batches
+            await asyncio.sleep(0)
+        
+        self.log_retention.last_run = datetime.now()
+        if total_pruned:
+            logging.info(f"⚔️ Rolled {total_pruned} combat log entries older than {self.log_retention.retention_days} days into daily totals")
+        return total_pruned
+    
+    @tasks.loop(hours=COMBAT_LOG_PRUNE_INTERVAL_HOURS)
+    async def combat_log_retention_loop(self):
+        """Periodically apply the combat log retention policy"""
+        await self.run_log_retention()
+    
+    @combat_log_retention_loop.before_loop
+    async def before_combat_log_retention_loop(self):
+        """Wait until the bot is ready before starting the loop"""
+        await self.bot.wait_until_ready()
+    
+    @commands.command(name="reload_combat_rules")
+    @commands.is_owner()
+    async def reload_combat_rules(self, ctx):
+        """Owner-only: re-read COMBAT_RULES from the configuration file and rebuild the odds tables"""
+        try:
+            # Run the file in its own namespace; reloading the module would rebind every
+            # other setting for modules that read UTILS.CONFIGURATION lazily
+            rules = dict(runpy.run_path(UTILS.CONFIGURATION.__file__)['COMBAT_RULES'])
         except Exception as e:
-            logging.error(f"❌ Failed to log combat action: {e}")
+            logging.error(f"❌ Failed to reload combat rules: {e}")
+            await ctx.send(f"❌ Failed to reload combat rules: {e}")
+            return
+        
+        if rules_fingerprint(rules) == self.odds.fingerprint:
+            await ctx.send("🎲 Combat rules unchanged.")
+            return
+        
+        self.rules = rules
+        self.odds = CombatOdds(self.rules)
+        metrics = self.odds.get_metrics()
+        await ctx.send(f"🎲 Combat rules reloaded; odds rebuilt for {metrics['matchups']} matchups.")
+    
+    @commands.command(name="combat_log_retention")
+    @commands.is_owner()
+    async def combat_log_retention(self, ctx):
+        """Owner-only: run the combat log retention pass now"""
+        pruned = await self.run_log_retention()
+        status = self.log_retention.get_status()
+        if status['last_error']:
+            await ctx.send(f"❌ Combat log retention failed after {pruned} entries: {status['last_error']}")
+            return
+        await ctx.send(
+            f"⚔️ Rolled up {pruned} combat log entries "
+            f"(retention {status['retention_days']} days, {status['rows_rolled_up']} total since startup)"
+        )
 
 async def setup(bot):
     await bot.add_cog(StatsCombatCore(bot))
@@ -2,19 +2,26 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import logging
-from datetime import datetime, timedelta
 from typing import Optional
 
-from UTILS.CONFIGURATION import GUILD_ID
+from UTILS.CONFIGURATION import GUILD_ID, ACTION_COOLDOWN_SECONDS
+from cogs._HEALTH import KNOCKED_OUT
+from cogs._COOLDOWNS import COOLDOWNS
+from cogs._COMBAT_FEED import CombatFeed
 GUILD = discord.Object(id=GUILD_ID)
 
 
 class StatsCombatManager(commands.Cog):
-    """Combat execution manager - orchestrates attacks and creates combat embeds"""
+    """Combat execution manager - orchestrates attacks and posts them to the combat feed"""
     
     def __init__(self, bot):
         self.bot = bot
-        self.action_cooldowns = {}  # user_id: datetime when cooldown ends
+        self.action_cooldowns = COOLDOWNS.get_store('combat_action')  # shared with /loot
+        self.combat_feed = CombatFeed(bot)
+    
+    def cog_unload(self):
+        """Clean up when cog is unloaded"""
+        self.combat_feed.stop()
     
     def get_combat_core(self):
         """Get the combat core cog"""
@@ -26,68 +33,43 @@ class StatsCombatManager(commands.Cog):
     
     def is_on_cooldown(self, user_id):
         """Check if user is on action cooldown"""
-        if user_id not in self.action_cooldowns:
-            return False
-        
-        cooldown_end = self.action_cooldowns[user_id]
-        return datetime.now() < cooldown_end
+        return self.action_cooldowns.is_active(user_id)
     
     def set_cooldown(self, user_id):
         """Set 6-second action cooldown for user"""
-        self.action_cooldowns[user_id] = datetime.now() + timedelta(seconds=6)
+        self.action_cooldowns.set(user_id, ACTION_COOLDOWN_SECONDS)
     
     def get_cooldown_remaining(self, user_id):
         """Get remaining cooldown time in seconds"""
-        if user_id not in self.action_cooldowns:
-            return 0
-        
-        remaining = self.action_cooldowns[user_id] - datetime.now()
-        return max(0, remaining.total_seconds())
+        return self.action_cooldowns.remaining(user_id)
     
-    def create_combat_embed(self, attacker, defender, attacker_stats, defender_stats, attack_result, damage, new_health, action_type="Attack"):
-        """Create combat result embed"""
-        embed = discord.Embed(
-            title=f"⚔️ {action_type}",
-            color=0xff0000 if attack_result['hit'] else 0x808080,
-            timestamp=discord.utils.utcnow()
-        )
-        
-        # Attack details
+    def format_combat_line(self, attacker, defender, attacker_stats, defender_stats, attack_result, damage, new_health, action_type="Attack"):
+        """One combat feed line for an attack"""
+        icon = {"Attack": "⚔️", "Retaliation": "⚡", "Automatic Retaliation": "⏰"}.get(action_type, "⚔️")
+        line = f"{icon} **{attacker.display_name}** → **{defender.display_name}**: "
+        
+        roll_text = f"{attack_result['roll']} + {attack_result['attack_bonus']} = {attack_result['total']} vs AC {attack_result['target_ac']}"
         if attack_result['critical_hit']:
-            attack_desc = f"🎯 **CRITICAL HIT!** Natural 20!"
+            line += f"🎯 **CRITICAL HIT!** {damage} damage"
         elif attack_result['critical_miss']:
-            attack_desc = f"💥 **CRITICAL MISS!** Natural 1!"
+            line += "💥 **critical miss**"
         elif attack_result['hit']:
-            attack_desc = f"✅ **Hit!** ({attack_result['roll']} + {attack_result['attack_bonus']} = {attack_result['total']} vs AC {attack_result['target_ac']})"
+            line += f"✅ {damage} damage ({roll_text})"
         else:
-            attack_desc = f"❌ **Miss!** ({attack_result['roll']} + {attack_result['attack_bonus']} = {attack_result['total']} vs AC {attack_result['target_ac']})"
-        
-        embed.add_field(name="🎲 Attack Roll", value=attack_desc, inline=False)
+            line += f"❌ miss ({roll_text})"
         
-        # Damage and health
         if attack_result['hit']:
-            damage_text = f"💔 **{damage} damage** dealt"
-            if attack_result['critical_hit']:
-                damage_text += " (critical damage!)"
-            
-            health_status = f"❤️ {new_health} HP"
-            embed.add_field(name="💥 Damage", value=damage_text, inline=True)
-            embed.add_field(name="🩺 Health", value=health_status, inline=True)
-        
-        # Combatants current status
-        attacker_hp = attacker_stats.get('health', 0)
-        defender_hp = new_health if attack_result['hit'] else defender_stats.get('health', 0)
+            line += f" • {defender.display_name} ❤️{new_health}"
+            if new_health <= 0:
+                line += " 💀"
         
-        attacker_status = f"❤️{attacker_hp}"
-        defender_status = f"❤️{defender_hp}"
-        
-        embed.add_field(
-            name="👥 Participants",
-            value=f"⚔️ **{attacker.display_name}** {attacker_status}\n🛡️ **{defender.display_name}** {defender_status}",
-            inline=False
-        )
+        # Odds this attack had, from the precomputed tables
+        combat_core = self.get_combat_core()
+        if combat_core:
+            odds = combat_core.get_odds(attacker_stats, defender_stats)
+            line += f" *({odds['hit_chance']:.0%} to hit)*"
         
-        return embed
+        return line
     
     async def execute_attack(self, attacker_id, defender_id, channel_id, is_automatic=False, is_reaction=False):
         """Execute an attack between two players"""
@@ -115,37 +97,25 @@ class StatsCombatManager(commands.Cog):
         
         new_health = defender_stats['health']
         damage = 0
+        knockout = False
         
         if attack_result['hit']:
-            damage = combat_core.calculate_damage(attacker_stats)
-            if attack_result['critical_hit']:
-                damage *= 2  # Critical hits double damage
+            damage = combat_core.calculate_damage(attacker_stats, attack_result['critical_hit'])
             
-            old_health = defender_stats['health']
-            new_health = combat_core.apply_damage(defender_id, damage)
-            
-            # Handle stabilization system integration
-            stabilization_system = combat_core.get_stabilization_system()
-            if stabilization_system and old_health <= 0 and new_health is not None:
-                # Taking damage while unconscious adds failures
-                if attack_result['critical_hit']:
-                    stabilization_system.add_stabilization_failure(defender_id, 2)  # Crit = 2 failures
-                else:
-                    stabilization_system.add_stabilization_failure(defender_id, 1)  # Normal = 1 failure
-            elif stabilization_system and old_health > 0 and new_health <= 0:
-                # Just became unconscious - start stabilization
-                stabilization_system.start_stabilization(defender_id)
+            # Old health comes from the same atomic update, not the (possibly stale) stats read above.
+            # Stabilization reacts to the DamageApplied event this publishes.
+            change = combat_core.apply_damage_change(defender_id, damage, hits=((attacker_id, attack_result['critical_hit']),))
+            if change:
+                new_health = change['new_health']
+                knockout = change['transition'] == KNOCKED_OUT
         
         # Log the combat action
-        combat_core.log_combat_action(attacker_id, defender_id, damage, attack_result['hit'], attack_result['critical_hit'])
+        combat_core.log_combat_action(attacker_id, defender_id, damage, attack_result['hit'], attack_result['critical_hit'], knockout)
         
-        # Send combat result
-        channel = self.bot.get_channel(channel_id)
-        if channel:
-            attacker = self.bot.get_user(attacker_id)
-            defender = self.bot.get_user(defender_id)
-            
-            # Determine action type for embed
+        # Add the result to the channel's live combat feed
+        attacker = self.bot.get_user(attacker_id)
+        defender = self.bot.get_user(defender_id)
+        if attacker and defender:
             if is_automatic:
                 action_type = "Automatic Retaliation"
             elif is_reaction:
@@ -153,22 +123,11 @@ class StatsCombatManager(commands.Cog):
             else:
                 action_type = "Attack"
             
-            embed = self.create_combat_embed(
+            self.combat_feed.add(channel_id, self.format_combat_line(
                 attacker, defender,
                 attacker_stats, defender_stats,
                 attack_result, damage, new_health, action_type
-            )
-            
-            if is_automatic:
-                embed.description = f"⏰ **{attacker.display_name}** took too long and automatically retaliates against **{defender.display_name}**!"
-            elif is_reaction:
-                embed.description = f"⚡ **{attacker.display_name}** retaliates against **{defender.display_name}**!"
-            else:
-                embed.description = f"⚔️ **{attacker.display_name}** attacks **{defender.display_name}**!"
-            
-            # Ping the defender when they're attacked
-            ping_message = f"{defender.mention}"
-            await channel.send(content=ping_message, embed=embed)
+            ))
         
         # Set attacker's cooldown
         self.set_cooldown(attacker_id)
@@ -177,15 +136,16 @@ class StatsCombatManager(commands.Cog):
         if combat_reactions:
             combat_reactions.clear_reaction(attacker_id)
         
-        # If defender is conscious and this wasn't a reaction, give them a reaction window
+        # If defender is conscious and this wasn't a reaction, give them a reaction window.
+        # This is the only time the feed pings anyone.
         if new_health > 0 and not is_reaction and not is_automatic and combat_reactions:
             combat_reactions.set_reaction_window(defender_id, attacker_id, channel_id)
-            
-            # Send reaction prompt with ping
-            if channel:
-                embed = combat_reactions.create_reaction_prompt_embed(defender, attacker)
-                ping_message = f"{defender.mention}"
-                await channel.send(content=ping_message, embed=embed)
+            if attacker and defender:
+                self.combat_feed.add(
+                    channel_id,
+                    combat_reactions.format_reaction_prompt(defender, attacker),
+                    ping_user_id=defender_id
+                )
 
 async def setup(bot):
     await bot.add_cog(StatsCombatManager(bot))
@@ -1,13 +1,16 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
 import logging
 from datetime import datetime, timedelta
 from typing import Optional
 
 from UTILS.CONFIGURATION import GUILD_ID
+from cogs._TIMERS import TimerHeap
 GUILD = discord.Object(id=GUILD_ID)
 
+REACTION_WINDOW_SECONDS = 6
+
 
 class StatsCombatReactions(commands.Cog):
     """Combat reaction system - handles 6-second reaction windows and automatic retaliation"""
@@ -15,11 +18,11 @@ class StatsCombatReactions(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.pending_reactions = {}  # user_id: {'attacker_id': int, 'timeout': datetime, 'channel_id': int}
-        self.reaction_timeout_loop.start()
+        self.reaction_timers = TimerHeap('Reaction window')
     
     def cog_unload(self):
         """Clean up when cog is unloaded"""
-        self.reaction_timeout_loop.cancel()
+        self.reaction_timers.stop()
     
     def get_combat_core(self):
         """Get the combat core cog"""
@@ -33,9 +36,10 @@ class StatsCombatReactions(commands.Cog):
         """Set 6-second reaction window for defender"""
         self.pending_reactions[defender_id] = {
             'attacker_id': attacker_id,
-            'timeout': datetime.now() + timedelta(seconds=6),
+            'timeout': datetime.now() + timedelta(seconds=REACTION_WINDOW_SECONDS),
             'channel_id': channel_id
         }
+        self.reaction_timers.schedule(defender_id, REACTION_WINDOW_SECONDS, self.on_reaction_timeout)
     
     def has_pending_reaction(self, user_id):
         """Check if user has a pending reaction"""
@@ -49,6 +53,7 @@ class StatsCombatReactions(commands.Cog):
         """Clear pending reaction for user"""
         if user_id in self.pending_reactions:
             del self.pending_reactions[user_id]
+        self.reaction_timers.cancel(user_id)
     
     def create_reaction_prompt_embed(self, defender, attacker):
         """Create embed prompting for reaction"""
@@ -74,6 +79,12 @@ class StatsCombatReactions(commands.Cog):
         
         return embed
     
+    def format_reaction_prompt(self, defender, attacker):
+        """Combat feed line announcing a reaction window"""
+        return (f"⚡ **{defender.display_name}**, you have {REACTION_WINDOW_SECONDS} seconds to react! "
+                f"`/attack @{attacker.display_name}` to retaliate, attack someone else, or `/retreat` "
+                f"— otherwise you retaliate automatically.")
+    
     async def execute_automatic_retaliation(self, defender_id):
         """Execute automatic retaliation when reaction times out"""
         reaction_data = self.get_pending_reaction(defender_id)
@@ -94,15 +105,12 @@ class StatsCombatReactions(commands.Cog):
                 defender_stats = stats_core.get_user_stats(defender_id)
                 if defender_stats and defender_stats['health'] <= 0:
                     # Defender is unconscious, can't retaliate
-                    channel = self.bot.get_channel(channel_id)
-                    if channel:
-                        defender = self.bot.get_user(defender_id)
-                        embed = discord.Embed(
-                            title="💀 No Retaliation",
-                            description=f"**{defender.display_name}** is unconscious and cannot retaliate!",
-                            color=0x808080
+                    combat_manager = self.get_combat_manager()
+                    defender = self.bot.get_user(defender_id)
+                    if combat_manager and defender:
+                        combat_manager.combat_feed.add(
+                            channel_id, f"💀 **{defender.display_name}** is unconscious and cannot retaliate!"
                         )
-                        await channel.send(embed=embed)
                     return
         
         # Execute automatic retaliation via combat manager
@@ -110,28 +118,14 @@ class StatsCombatReactions(commands.Cog):
         if combat_manager:
             await combat_manager.execute_attack(defender_id, attacker_id, channel_id, is_automatic=True, is_reaction=True)
     
-    @tasks.loop(seconds=1)
-    async def reaction_timeout_loop(self):
-        """Check for reaction timeouts and execute automatic retaliations"""
-        current_time = datetime.now()
-        expired_reactions = []
-        
-        for defender_id, reaction_data in self.pending_reactions.items():
-            if current_time >= reaction_data['timeout']:
-                expired_reactions.append(defender_id)
-        
-        for defender_id in expired_reactions:
-            try:
-                await self.execute_automatic_retaliation(defender_id)
-            except Exception as e:
-                logging.error(f"❌ Error in reaction timeout: {e}")
-                # Clean up the expired reaction
-                self.clear_reaction(defender_id)
-    
-    @reaction_timeout_loop.before_loop
-    async def before_reaction_timeout_loop(self):
-        """Wait until the bot is ready before starting the loop"""
-        await self.bot.wait_until_ready()
+    async def on_reaction_timeout(self, defender_id):
+        """Timer callback: the defender's reaction window has expired"""
+        try:
+            await self.execute_automatic_retaliation(defender_id)
+        except Exception as e:
+            logging.error(f"❌ Error in reaction timeout: {e}")
+            # Clean up the expired reaction
+            self.clear_reaction(defender_id)
     
     @app_commands.command(name="retreat", description="Retreat from combat (clear any pending reactions)")
     @app_commands.guilds(GUILD)
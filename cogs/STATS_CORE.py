@@ -7,6 +7,7 @@ import logging
 from typing import Optional
 
 from UTILS.CONFIGURATION import GUILD_ID
+from cogs._STATS_CACHE import STATS_CACHE
 GUILD = discord.Object(id=GUILD_ID)
 
 
@@ -17,53 +18,18 @@ DEFAULT_LEVEL_COSTS = {
     18: 265000, 19: 305000, 20: 355000
 }
 
+STANDARD_ARRAY = [15, 14, 13, 12, 10, 8]
+
+# Rows per executemany call when bulk-writing stats; progress is reported per chunk
+BULK_WRITE_CHUNK_SIZE = 500
+
 class StatsCore(commands.Cog):
     """Core stats system - handles stat generation, storage, and basic viewing"""
     
     def __init__(self, bot):
         self.bot = bot
-        self.init_database()
-    
-    def init_database(self):
-        """Initialize the stats database"""
-        try:
-            conn = sqlite3.connect('stats.db')
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS user_stats (
-                    user_id INTEGER PRIMARY KEY,
-                    username TEXT,
-                    strength INTEGER,
-                    dexterity INTEGER,
-                    constitution INTEGER,
-                    intelligence INTEGER,
-                    wisdom INTEGER,
-                    charisma INTEGER,
-                    health INTEGER,
-                    level INTEGER DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS level_costs (
-                    level INTEGER PRIMARY KEY,
-                    cost INTEGER NOT NULL
-                )
-            ''')
-            
-            cursor.execute('SELECT COUNT(*) FROM level_costs')
-            if cursor.fetchone()[0] == 0:
-                for level, cost in DEFAULT_LEVEL_COSTS.items():
-                    cursor.execute('INSERT INTO level_costs (level, cost) VALUES (?, ?)', (level, cost))
-            
-            conn.commit()
-            conn.close()
-            logging.info("✅ Stats database initialized successfully")
-            
-        except Exception as e:
-            logging.error(f"❌ Failed to initialize stats database: {e}")
+        # Schema is created by BOT.MIGRATIONS before cogs load
+        STATS_CACHE.load_all()
     
     def get_constitution_modifier(self, constitution):
         """Calculate D&D ability modifier from ability score"""
@@ -81,7 +47,7 @@ class StatsCore(commands.Cog):
     
     def generate_stats(self):
         """Generate a random set of ability scores using the standard array"""
-        stats = [15, 14, 13, 12, 10, 8]
+        stats = list(STANDARD_ARRAY)
         random.shuffle(stats)
         constitution = stats[2]
         level = 1
@@ -97,6 +63,26 @@ class StatsCore(commands.Cog):
             'health': self.calculate_health(constitution, level)
         }
     
+    def generate_stats_batch(self, count: int):
+        """Generate stats for many members at once"""
+        # Constitution only ever takes a standard array value, so health is a table lookup
+        health_by_constitution = {score: self.calculate_health(score) for score in STANDARD_ARRAY}
+        
+        batch = []
+        for _ in range(count):
+            scores = random.sample(STANDARD_ARRAY, len(STANDARD_ARRAY))
+            batch.append({
+                'strength': scores[0],
+                'dexterity': scores[1],
+                'constitution': scores[2],
+                'intelligence': scores[3],
+                'wisdom': scores[4],
+                'charisma': scores[5],
+                'level': 1,
+                'health': health_by_constitution[scores[2]]
+            })
+        return batch
+    
     def save_user_stats(self, user_id: int, username: str, stats: dict):
         """Save user stats to database"""
         try:
@@ -116,14 +102,70 @@ class StatsCore(commands.Cog):
             
             conn.commit()
             conn.close()
+            
+            # INSERT OR REPLACE resets created_at, so let the next read repopulate
+            STATS_CACHE.invalidate(user_id)
             return True
             
         except Exception as e:
             logging.error(f"❌ Failed to save stats for {username}: {e}")
             return False
     
+    def save_user_stats_bulk(self, entries, progress=None):
+        """
+        Save (user_id, username, stats) entries in a single transaction.
+        If a progress dict is given, progress['written'] is updated after each chunk
+        so callers on another thread can report it. Returns the saved user ids ([] on
+        failure); this runs in an executor, so the caller passes them to
+        invalidate_users() back on the event loop.
+        """
+        rows = [
+            (
+                user_id, username,
+                stats['strength'], stats['dexterity'], stats['constitution'],
+                stats['intelligence'], stats['wisdom'], stats['charisma'],
+                stats['health'], stats.get('level', 1)
+            )
+            for user_id, username, stats in entries
+        ]
+        
+        try:
+            conn = sqlite3.connect('stats.db')
+            try:
+                cursor = conn.cursor()
+                for start in range(0, len(rows), BULK_WRITE_CHUNK_SIZE):
+                    cursor.executemany('''
+                        INSERT OR REPLACE INTO user_stats 
+                        (user_id, username, strength, dexterity, constitution, intelligence, wisdom, charisma, health, level)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', rows[start:start + BULK_WRITE_CHUNK_SIZE])
+                    if progress is not None:
+                        progress['written'] = min(start + BULK_WRITE_CHUNK_SIZE, len(rows))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+            
+        except Exception as e:
+            logging.error(f"❌ Failed to bulk save stats for {len(rows)} users: {e}")
+            return []
+        
+        logging.info(f"✅ Bulk saved stats for {len(rows)} users")
+        return [user_id for user_id, _, _ in entries]
+    
+    def invalidate_users(self, user_ids):
+        """Drop rewritten users from the cache; call on the event loop, since write listeners update shared state"""
+        for user_id in user_ids:
+            STATS_CACHE.invalidate(user_id)
+    
     def get_user_stats(self, user_id: int):
-        """Get user stats from database"""
+        """Get user stats, served from the cache when possible"""
+        cached = STATS_CACHE.get(user_id)
+        if cached is not None:
+            return cached
+        
         try:
             conn = sqlite3.connect('stats.db')
             cursor = conn.cursor()
@@ -133,7 +175,7 @@ class StatsCore(commands.Cog):
             conn.close()
             
             if result:
-                return {
+                stats = {
                     'user_id': result[0],
                     'username': result[1],
                     'strength': result[2],
@@ -146,6 +188,8 @@ class StatsCore(commands.Cog):
                     'level': result[9],
                     'created_at': result[10]
                 }
+                STATS_CACHE.put(user_id, stats)
+                return dict(stats)
             return None
             
         except Exception as e:
@@ -165,6 +209,10 @@ class StatsCore(commands.Cog):
             logging.error(f"❌ Failed to get users with stats: {e}")
             return []
     
+    def get_cache_metrics(self):
+        """Get user_stats cache hit/miss metrics"""
+        return STATS_CACHE.get_metrics()
+    
     def create_stats_embed(self, user: discord.Member, stats: dict):
         """Create a Discord embed for displaying stats"""
         embed = discord.Embed(
@@ -267,6 +315,25 @@ class StatsCore(commands.Cog):
         embed = self.create_stats_embed(target, stats)
         await interaction.response.send_message(embed=embed)
 
+    @commands.command(name="stats_cache")
+    @commands.is_owner()
+    async def stats_cache_info(self, ctx):
+        """Show user_stats cache metrics"""
+        metrics = self.get_cache_metrics()
+        
+        embed = discord.Embed(
+            title="🗃️ Stats Cache",
+            color=0x3498db
+        )
+        embed.add_field(name="Cached Users", value=f"{metrics['size']:,}", inline=True)
+        embed.add_field(name="Hits", value=f"{metrics['hits']:,}", inline=True)
+        embed.add_field(name="Misses", value=f"{metrics['misses']:,}", inline=True)
+        embed.add_field(name="Hit Rate", value=f"{metrics['hit_rate']:.1%}", inline=True)
+        embed.add_field(name="Invalidations", value=f"{metrics['invalidations']:,}", inline=True)
+        embed.add_field(name="Loaded", value="✅" if metrics['loaded'] else "❌", inline=True)
+        
+        await ctx.send(embed=embed)
+
 async def setup(bot):
     await bot.add_cog(StatsCore(bot))
     logging.info("✅ Stats Core cog loaded successfully")  # Correct message
\ No newline at end of file
@@ -0,0 +1,339 @@
+import discord
+from discord.ext import commands, tasks
+from discord import app_commands
+import random
+import logging
+from datetime import datetime
+
+from UTILS.CONFIGURATION import GUILD_ID, ENCOUNTER_TICK_SECONDS, ENCOUNTER_IDLE_TICKS, ENCOUNTER_SUMMARY_LINES
+from cogs._HEALTH import apply_health_deltas, KNOCKED_OUT
+from cogs._COMBAT_LOG import record_combat_action
+GUILD = discord.Object(id=GUILD_ID)
+
+
+class StatsEncounters(commands.Cog):
+    """Multi-participant encounters: queued actions resolved together once per tick"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        # channel_id: {'started_by', 'started_at', 'round', 'idle_ticks', 'queue': {attacker_id: target_id}, 'participants': set}
+        self.encounters = {}
+        self.encounter_tick_loop.start()
+
+    def cog_unload(self):
+        """Clean up when cog is unloaded"""
+        self.encounter_tick_loop.cancel()
+
+    def get_combat_core(self):
+        """Get the combat core cog"""
+        return self.bot.get_cog('StatsCombatCore')
+
+    def get_combat_manager(self):
+        """Get the combat manager cog"""
+        return self.bot.get_cog('StatsCombatManager')
+
+    def get_display_name(self, guild, user_id):
+        """Current display name for a participant"""
+        member = guild.get_member(user_id) if guild else None
+        if member:
+            return member.display_name
+        user = self.bot.get_user(user_id)
+        return user.display_name if user else f"User {user_id}"
+
+    def seconds_until_tick(self):
+        """Seconds until the next tick resolves queued actions"""
+        next_tick = self.encounter_tick_loop.next_iteration
+        if not next_tick:
+            return ENCOUNTER_TICK_SECONDS
+        return max(0.0, (next_tick - discord.utils.utcnow()).total_seconds())
+
+    def resolve_actions(self, combat_core, stats_core, queue):
+        """
+        Roll every queued action in initiative order against in-memory health,
+        then write all damage and combat log rows in one transaction.
+        StabilizationCog reacts to the resulting DamageApplied events.
+        Returns (results, changes), or None if the batch write failed.
+        """
+        involved = set(queue) | set(queue.values())
+        stats = {user_id: stats_core.get_user_stats(user_id) for user_id in involved}
+        health = {user_id: user_stats['health'] for user_id, user_stats in stats.items() if user_stats}
+
+        # Initiative: higher dexterity acts first, ties broken randomly
+        order = [(attacker_id, target_id) for attacker_id, target_id in queue.items()
+                 if stats.get(attacker_id) and stats.get(target_id)]
+        order.sort(key=lambda action: (-stats[action[0]]['dexterity'], random.random()))
+
+        results = []
+        damage_by_target = {}
+        for attacker_id, target_id in order:
+            if health[attacker_id] <= 0:
+                results.append({'attacker_id': attacker_id, 'target_id': target_id, 'skipped': True})
+                continue
+
+            attack_result = combat_core.make_attack_roll(stats[attacker_id], stats[target_id])
+            damage = 0
+            if attack_result['hit']:
+                damage = combat_core.calculate_damage(stats[attacker_id], attack_result['critical_hit'])
+
+            was_down = health[target_id] <= 0
+            health[target_id] -= damage
+            damage_by_target[target_id] = damage_by_target.get(target_id, 0) + damage
+            results.append({
+                'attacker_id': attacker_id,
+                'target_id': target_id,
+                'skipped': False,
+                'attack': attack_result,
+                'damage': damage,
+                'knockout': damage > 0 and not was_down and health[target_id] <= 0
+            })
+
+        def log_actions(cursor, changes):
+            # Credit knockouts only where the committed update actually crossed 0 HP
+            knocked_out = {change['user_id'] for change in changes if change['transition'] == KNOCKED_OUT}
+            credited = {result['target_id'] for result in results if not result['skipped'] and result['knockout']}
+            for result in reversed(results):
+                if result['skipped']:
+                    continue
+                target_id = result['target_id']
+                if target_id not in knocked_out:
+                    result['knockout'] = False
+                elif target_id not in credited and result['damage']:
+                    # Health changed since the stats were read; credit the last hit
+                    result['knockout'] = True
+                    credited.add(target_id)
+
+            # A savepoint keeps a failed log write from rolling back the damage itself
+            cursor.execute('SAVEPOINT encounter_log')
+            try:
+                for result in results:
+                    if result['skipped']:
+                        continue
+                    attack_result = result['attack']
+                    record_combat_action(cursor, result['attacker_id'], result['target_id'], result['damage'],
+                                         attack_result['hit'], attack_result['critical_hit'], result['knockout'])
+            except Exception as e:
+                cursor.execute('ROLLBACK TO SAVEPOINT encounter_log')
+                logging.error(f"❌ Failed to log encounter actions; damage still applied: {e}")
+            cursor.execute('RELEASE SAVEPOINT encounter_log')
+
+        hits_by_user = {}
+        for result in results:
+            if not result['skipped'] and result['damage']:
+                hits_by_user.setdefault(result['target_id'], []).append(
+                    (result['attacker_id'], result['attack']['critical_hit']))
+
+        deltas = [(target_id, -damage) for target_id, damage in damage_by_target.items() if damage]
+        changes = apply_health_deltas(deltas, in_transaction=log_actions, hits_by_user=hits_by_user)
+        if changes is None:
+            return None
+        return results, changes
+
+    def create_tick_embed(self, guild, encounter, results, changes):
+        """One summary embed for every action resolved this tick"""
+        embed = discord.Embed(
+            title=f"⚔️ Encounter - Round {encounter['round']}",
+            color=0xff0000 if any(not r['skipped'] and r['attack']['hit'] for r in results) else 0x808080,
+            timestamp=discord.utils.utcnow()
+        )
+
+        lines = []
+        for result in results:
+            attacker = self.get_display_name(guild, result['attacker_id'])
+            target = self.get_display_name(guild, result['target_id'])
+            if result['skipped']:
+                lines.append(f"💤 **{attacker}** was knocked out before acting")
+                continue
+
+            attack_result = result['attack']
+            if attack_result['critical_hit']:
+                outcome = f"🎯 **CRITICAL!** {result['damage']} damage"
+            elif attack_result['hit']:
+                outcome = f"✅ {result['damage']} damage"
+            elif attack_result['critical_miss']:
+                outcome = "💥 critical miss"
+            else:
+                outcome = "❌ miss"
+            if result['knockout']:
+                outcome += " 💀"
+            lines.append(f"⚔️ **{attacker}** → **{target}**: {outcome}")
+
+        if len(lines) > ENCOUNTER_SUMMARY_LINES:
+            hidden = len(lines) - ENCOUNTER_SUMMARY_LINES
+            lines = lines[:ENCOUNTER_SUMMARY_LINES] + [f"*...and {hidden} more actions*"]
+        embed.description = "\n".join(lines)[:4096]
+
+        knocked_out = [self.get_display_name(guild, change['user_id'])
+                       for change in changes if change['transition'] == KNOCKED_OUT]
+        if knocked_out:
+            embed.add_field(name="💀 Knocked Out", value=", ".join(knocked_out)[:1024], inline=False)
+
+        damaged = [f"**{self.get_display_name(guild, change['user_id'])}** ❤️{change['new_health']}"
+                   for change in sorted(changes, key=lambda change: change['new_health'])]
+        if damaged:
+            embed.add_field(name="🩺 Health", value="\n".join(damaged)[:1024], inline=False)
+
+        embed.set_footer(text=f"{len(encounter['participants'])} participants • Queue actions with /encounter_attack")
+        return embed
+
+    async def resolve_tick(self, channel_id, encounter):
+        """Resolve one encounter's queued actions and post the summary"""
+        channel = self.bot.get_channel(channel_id)
+        if not channel:
+            self.encounters.pop(channel_id, None)
+            return
+
+        if not encounter['queue']:
+            encounter['idle_ticks'] += 1
+            if encounter['idle_ticks'] >= ENCOUNTER_IDLE_TICKS:
+                self.encounters.pop(channel_id, None)
+                await channel.send("🕊️ The encounter has ended after a lull in the fighting.")
+            return
+
+        combat_core = self.get_combat_core()
+        stats_core = combat_core.get_stats_core() if combat_core else None
+        if not stats_core:
+            logging.error("❌ Combat system not available for encounter tick")
+            return
+
+        queue, encounter['queue'] = encounter['queue'], {}
+        encounter['idle_ticks'] = 0
+        encounter['round'] += 1
+
+        resolved = self.resolve_actions(combat_core, stats_core, queue)
+        if resolved is None:
+            logging.error(f"❌ Encounter tick in channel {channel_id} failed; {len(queue)} actions discarded")
+            await channel.send("❌ This round could not be resolved. Please queue your actions again.")
+            return
+        results, changes = resolved
+
+        combat_manager = self.get_combat_manager()
+        if combat_manager:
+            for attacker_id in queue:
+                combat_manager.set_cooldown(attacker_id)
+
+        if results:
+            await channel.send(embed=self.create_tick_embed(channel.guild, encounter, results, changes))
+
+    @tasks.loop(seconds=ENCOUNTER_TICK_SECONDS)
+    async def encounter_tick_loop(self):
+        """Resolve every active encounter once per tick"""
+        for channel_id, encounter in list(self.encounters.items()):
+            try:
+                await self.resolve_tick(channel_id, encounter)
+            except Exception as e:
+                logging.error(f"❌ Error resolving encounter tick in channel {channel_id}: {e}")
+
+    @encounter_tick_loop.before_loop
+    async def before_encounter_tick_loop(self):
+        """Wait until the bot is ready before starting the loop"""
+        await self.bot.wait_until_ready()
+
+    @app_commands.command(name="encounter_start", description="Start a multi-player encounter in this channel")
+    @app_commands.guilds(GUILD)
+    async def encounter_start(self, interaction: discord.Interaction):
+        """Start an encounter; queued actions resolve together every tick"""
+        if interaction.channel.id in self.encounters:
+            await interaction.response.send_message("⛔ An encounter is already running in this channel.", ephemeral=True)
+            return
+
+        self.encounters[interaction.channel.id] = {
+            'started_by': interaction.user.id,
+            'started_at': datetime.now(),
+            'round': 0,
+            'idle_ticks': 0,
+            'queue': {},
+            'participants': set()
+        }
+        logging.info(f"⚔️ Encounter started in channel {interaction.channel.id} by {interaction.user.id}")
+
+        embed = discord.Embed(
+            title="⚔️ An Encounter Begins!",
+            description=(
+                f"**{interaction.user.display_name}** has started an encounter.\n\n"
+                f"Use `/encounter_attack` to queue an attack. All queued actions resolve together "
+                f"every {ENCOUNTER_TICK_SECONDS} seconds, fastest (highest Dexterity) first."
+            ),
+            color=0xff8800
+        )
+        await interaction.response.send_message(embed=embed)
+
+    @app_commands.command(name="encounter_attack", description="Queue an attack for the next encounter round")
+    @app_commands.describe(target="The user to attack")
+    @app_commands.guilds(GUILD)
+    async def encounter_attack(self, interaction: discord.Interaction, target: discord.Member):
+        """Queue (or replace) your action for the next tick"""
+        try:
+            encounter = self.encounters.get(interaction.channel.id)
+            if not encounter:
+                await interaction.response.send_message("⛔ There is no encounter in this channel. Start one with `/encounter_start`.", ephemeral=True)
+                return
+
+            if target == interaction.user:
+                await interaction.response.send_message("⛔ You cannot attack yourself!", ephemeral=True)
+                return
+
+            if target.bot:
+                await interaction.response.send_message("⛔ You cannot attack bots!", ephemeral=True)
+                return
+
+            combat_core = self.get_combat_core()
+            stats_core = combat_core.get_stats_core() if combat_core else None
+            if not stats_core:
+                await interaction.response.send_message("⛔ Combat system not available.", ephemeral=True)
+                return
+
+            attacker_stats = stats_core.get_user_stats(interaction.user.id)
+            if not attacker_stats:
+                await interaction.response.send_message("⛔ You don't have stats yet!", ephemeral=True)
+                return
+
+            if not stats_core.get_user_stats(target.id):
+                await interaction.response.send_message("⛔ That user doesn't have stats yet!", ephemeral=True)
+                return
+
+            if attacker_stats['health'] <= 0:
+                await interaction.response.send_message("⛔ You are unconscious and cannot take actions!", ephemeral=True)
+                return
+
+            if combat_core.is_user_in_hospital(target.id):
+                await interaction.response.send_message("⛔ You cannot attack someone who is in the hospital!", ephemeral=True)
+                return
+
+            replaced = interaction.user.id in encounter['queue']
+            encounter['queue'][interaction.user.id] = target.id
+            encounter['participants'].update((interaction.user.id, target.id))
+
+            verb = "Changed your action to attack" if replaced else "Queued an attack on"
+            await interaction.response.send_message(
+                f"⚔️ {verb} **{target.display_name}**. Resolves in {self.seconds_until_tick():.0f}s.",
+                ephemeral=True
+            )
+
+        except Exception as e:
+            logging.error(f"❌ Error in encounter_attack command: {e}")
+            if not interaction.response.is_done():
+                await interaction.response.send_message("⛔ An error occurred while queueing the attack.", ephemeral=True)
+
+    @app_commands.command(name="encounter_end", description="End the encounter in this channel")
+    @app_commands.guilds(GUILD)
+    async def encounter_end(self, interaction: discord.Interaction):
+        """End the encounter; only its starter or a moderator can do this"""
+        encounter = self.encounters.get(interaction.channel.id)
+        if not encounter:
+            await interaction.response.send_message("⛔ There is no encounter in this channel.", ephemeral=True)
+            return
+
+        if interaction.user.id != encounter['started_by'] and not interaction.user.guild_permissions.manage_messages:
+            await interaction.response.send_message("⛔ Only the player who started the encounter or a moderator can end it.", ephemeral=True)
+            return
+
+        self.encounters.pop(interaction.channel.id, None)
+        pending = len(encounter['queue'])
+        note = f" {pending} queued actions were cancelled." if pending else ""
+        await interaction.response.send_message(
+            f"🕊️ The encounter has ended after {encounter['round']} rounds with {len(encounter['participants'])} participants.{note}"
+        )
+
+async def setup(bot):
+    await bot.add_cog(StatsEncounters(bot))
+    logging.info("✅ Stats Encounters cog loaded successfully")
@@ -5,17 +5,157 @@ import sqlite3
 import logging
 
 from UTILS.CONFIGURATION import GUILD_ID
+from cogs._RANKINGS import RANKED_STATS, LEADERBOARDS, LEADERBOARD_ORDERS
 GUILD = discord.Object(id=GUILD_ID)
 
+STAT_LEADERBOARD_PAGE_SIZE = 10
+TOP_PLAYERS_PAGE_SIZE = 15
+
+STAT_EMOJIS = {
+    'level': '🌟',
+    'health': '❤️',
+    'strength': '💪',
+    'dexterity': '🏃', 
+    'constitution': '🛡️',
+    'intelligence': '🧠',
+    'wisdom': '👁️',
+    'charisma': '💬'
+}
+
+
+class LeaderboardPageView(discord.ui.View):
+    """Previous/Next buttons for browsing a leaderboard page by page"""
+    
+    def __init__(self, cog, guild, board, page, page_size, total_pages):
+        super().__init__(timeout=300)
+        self.cog = cog
+        self.guild = guild
+        self.board = board
+        self.page = page
+        self.page_size = page_size
+        self.total_pages = total_pages
+        self._update_buttons()
+    
+    def _update_buttons(self):
+        self.previous_page.disabled = self.page <= 1
+        self.next_page.disabled = self.page >= self.total_pages
+    
+    async def _show_page(self, interaction, page):
+        embed, self.total_pages = self.cog.build_leaderboard_embed(self.guild, self.board, page, self.page_size)
+        if embed is None:
+            await interaction.response.send_message("❌ No stats found in the database.", ephemeral=True)
+            return
+        self.page = min(page, self.total_pages)
+        self._update_buttons()
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary, emoji="◀️")
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show_page(interaction, self.page - 1)
+    
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary, emoji="▶️")
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show_page(interaction, self.page + 1)
+
 
 class StatsLeaderboards(commands.Cog):
     """Leaderboards and ranking system for user stats"""
     
     def __init__(self, bot):
         self.bot = bot
+        LEADERBOARDS.load()
+    
+    def fetch_leaderboard_page(self, board, page, page_size):
+        """Get (entries, total) from the in-memory boards, falling back to an indexed query"""
+        entries, total = LEADERBOARDS.get_page(board, page, page_size)
+        if LEADERBOARDS.loaded:
+            return entries, total
+        
+        try:
+            conn = sqlite3.connect('stats.db')
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            
+            # Board names map to fixed column tuples, so the ORDER BY is safe to format
+            order_by = ', '.join(f"{column} DESC" for column in LEADERBOARD_ORDERS[board])
+            offset = (max(page, 1) - 1) * page_size
+            cursor.execute(f'''
+                SELECT user_id, username, {', '.join(RANKED_STATS)}
+                FROM user_stats 
+                ORDER BY {order_by}, user_id
+                LIMIT ? OFFSET ?
+            ''', (page_size, offset))
+            entries = [dict(row, position=position) for position, row in enumerate(cursor.fetchall(), offset + 1)]
+            
+            cursor.execute('SELECT COUNT(*) FROM user_stats')
+            total = cursor.fetchone()[0]
+            conn.close()
+            return entries, total
+            
+        except Exception as e:
+            logging.error(f"❌ Failed to query leaderboard {board}: {e}")
+            return [], 0
+    
+    def build_leaderboard_embed(self, guild, board, page, page_size):
+        """Render one leaderboard page; returns (embed, total_pages), embed is None when empty"""
+        entries, total = self.fetch_leaderboard_page(board, page, page_size)
+        if not total:
+            return None, 1
+        total_pages = max(1, -(-total // page_size))
+        if page > total_pages:
+            page = total_pages
+            entries, total = self.fetch_leaderboard_page(board, page, page_size)
+        
+        if board == 'overall':
+            embed = discord.Embed(title="🏆 Top Players", color=0xffd700)
+            footer = "Use /stats [player] to view detailed stats • /my_ranking to see your position"
+        else:
+            embed = discord.Embed(title=f"🏆 {board.title()} Leaderboard", color=0xffd700)
+            footer = "Use /stats to view your complete character sheet"
+        
+        leaderboard_text = "Ranked by Level (then Health)\n\n" if board == 'overall' else ""
+        for entry in entries:
+            i = entry['position']
+            # Try to get current member to get updated display name
+            member = guild.get_member(entry['user_id']) if guild else None
+            display_name = member.display_name if member else entry['username']
+            
+            if board == 'overall':
+                medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"**{i}.**"
+                leaderboard_text += f"{medal} **{display_name}** - Level {entry['level']} ({entry['health']} HP)\n"
+                
+                # Add a gap every 5 players for readability
+                if i % 5 == 0 and entry is not entries[-1]:
+                    leaderboard_text += "\n"
+            else:
+                value = entry[board]
+                medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
+                if board == "health":
+                    leaderboard_text += f"{medal} **{display_name}** - {value} HP\n"
+                elif board == "level":
+                    leaderboard_text += f"{medal} **{display_name}** - Level {value}\n"
+                else:
+                    leaderboard_text += f"{medal} **{display_name}** - {value}\n"
+        
+        embed.description = leaderboard_text
+        embed.set_footer(text=f"Page {page}/{total_pages} • {footer}")
+        return embed, total_pages
+    
+    async def send_leaderboard(self, interaction, board, page, page_size):
+        """Send a leaderboard page with browsing buttons when there is more than one page"""
+        embed, total_pages = self.build_leaderboard_embed(interaction.guild, board, page, page_size)
+        if embed is None:
+            await interaction.followup.send("❌ No stats found in the database.")
+            return
+        
+        if total_pages > 1:
+            view = LeaderboardPageView(self, interaction.guild, board, min(page, total_pages), page_size, total_pages)
+            await interaction.followup.send(embed=embed, view=view)
+        else:
+            await interaction.followup.send(embed=embed)
     
     @app_commands.command(name="stats_leaderboard", description="View stats leaderboard")
-    @app_commands.describe(stat="Which stat to sort by")
+    @app_commands.describe(stat="Which stat to sort by", page="Page to start on")
     @app_commands.choices(stat=[
         app_commands.Choice(name="Level", value="level"),
         app_commands.Choice(name="Health", value="health"),
@@ -27,74 +167,17 @@ class StatsLeaderboards(commands.Cog):
         app_commands.Choice(name="Charisma", value="charisma")
     ])
     @app_commands.guilds(GUILD)
-    async def stats_leaderboard(self, interaction: discord.Interaction, stat: str = "level"):
+    async def stats_leaderboard(self, interaction: discord.Interaction, stat: str = "level", page: int = 1):
         """View a leaderboard for a specific stat"""
         await interaction.response.defer()
         
         try:
-            conn = sqlite3.connect('stats.db')
-            cursor = conn.cursor()
-            
-            # Validate stat parameter to prevent SQL injection
-            valid_stats = ['level', 'health', 'strength', 'dexterity', 'constitution', 'intelligence', 'wisdom', 'charisma']
-            if stat not in valid_stats:
+            # Validate stat parameter to prevent SQL injection in the fallback query
+            if stat not in RANKED_STATS:
                 await interaction.followup.send("❌ Invalid stat parameter.")
                 return
             
-            # Get top 10 users for the specified stat (safe since we validated the parameter)
-            query = f'''
-                SELECT user_id, username, {stat} 
-                FROM user_stats 
-                ORDER BY {stat} DESC 
-                LIMIT 10
-            '''
-            cursor.execute(query)
-            
-            results = cursor.fetchall()
-            conn.close()
-            
-            if not results:
-                await interaction.followup.send("❌ No stats found in the database.")
-                return
-            
-            # Create leaderboard embed
-            embed = discord.Embed(
-                title=f"🏆 {stat.title()} Leaderboard",
-                color=0xffd700
-            )
-            
-            stat_emojis = {
-                'level': '🌟',
-                'health': '❤️',
-                'strength': '💪',
-                'dexterity': '🏃', 
-                'constitution': '🛡️',
-                'intelligence': '🧠',
-                'wisdom': '👁️',
-                'charisma': '💬'
-            }
-            
-            leaderboard_text = ""
-            for i, (user_id, username, value) in enumerate(results, 1):
-                # Try to get current member to get updated display name
-                try:
-                    member = interaction.guild.get_member(user_id)
-                    display_name = member.display_name if member else username
-                except:
-                    display_name = username
-                
-                medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
-                if stat == "health":
-                    leaderboard_text += f"{medal} **{display_name}** - {value} HP\n"
-                elif stat == "level":
-                    leaderboard_text += f"{medal} **{display_name}** - Level {value}\n"
-                else:
-                    leaderboard_text += f"{medal} **{display_name}** - {value}\n"
-            
-            embed.description = leaderboard_text
-            embed.set_footer(text="Use /stats to view your complete character sheet")
-            
-            await interaction.followup.send(embed=embed)
+            await self.send_leaderboard(interaction, stat, max(page, 1), STAT_LEADERBOARD_PAGE_SIZE)
             
         except Exception as e:
             logging.error(f"❌ Error in stats_leaderboard command: {e}")
@@ -117,8 +200,11 @@ class StatsLeaderboards(commands.Cog):
                 await interaction.followup.send("❌ You don't have stats yet! An admin can assign them using `/assign_stats`.")
                 return
             
-            conn = sqlite3.connect('stats.db')
-            cursor = conn.cursor()
+            ranks = LEADERBOARDS.get_ranks(interaction.user.id)
+            if not ranks:
+                await interaction.followup.send("❌ Rankings are not available right now.")
+                return
+            total_users = LEADERBOARDS.total_players
             
             embed = discord.Embed(
                 title=f"📊 {interaction.user.display_name}'s Rankings",
@@ -126,34 +212,11 @@ class StatsLeaderboards(commands.Cog):
             )
             embed.set_thumbnail(url=interaction.user.display_avatar.url)
             
-            # Get rankings for each stat
-            stats_to_check = ['level', 'health', 'strength', 'dexterity', 'constitution', 'intelligence', 'wisdom', 'charisma']
-            stat_emojis = {
-                'level': '🌟',
-                'health': '❤️',
-                'strength': '💪',
-                'dexterity': '🏃', 
-                'constitution': '🛡️',
-                'intelligence': '🧠',
-                'wisdom': '👁️',
-                'charisma': '💬'
-            }
-            
             rankings = []
             
-            for stat in stats_to_check:
-                # Count how many users have a higher value in this stat
-                cursor.execute(f'''
-                    SELECT COUNT(*) + 1 as rank
-                    FROM user_stats 
-                    WHERE {stat} > ?
-                ''', (user_stats[stat],))
-                
-                rank = cursor.fetchone()[0]
-                
-                # Get total number of users with stats
-                cursor.execute('SELECT COUNT(*) FROM user_stats')
-                total_users = cursor.fetchone()[0]
+            for stat in RANKED_STATS:
+                rank = ranks[stat]
+                percentile = LEADERBOARDS.get_percentile(rank)
                 
                 value = user_stats[stat]
                 if stat == "health":
@@ -163,9 +226,7 @@ class StatsLeaderboards(commands.Cog):
                 else:
                     value_str = str(value)
                 
-                rankings.append(f"{stat_emojis[stat]} **{stat.title()}**: {value_str} (#{rank}/{total_users})")
-            
-            conn.close()
+                rankings.append(f"{STAT_EMOJIS[stat]} **{stat.title()}**: {value_str} (#{rank}/{total_users}, top {percentile:.0f}%)")
             
             # Split rankings into two columns
             mid_point = len(rankings) // 2
@@ -184,10 +245,11 @@ class StatsLeaderboards(commands.Cog):
                 inline=True
             )
             
-            # Calculate overall rank (based on level)
+            # Overall rank uses the /top_players order (level, then health); tied players share it
+            overall_rank = ranks['overall']
             embed.add_field(
                 name="🏆 Overall Rank",
-                value=f"**#{rankings[0].split('#')[1].split('/')[0]}** out of {total_users} players",
+                value=f"**#{overall_rank}** out of {total_users} players (top {LEADERBOARDS.get_percentile(overall_rank):.1f}%)",
                 inline=False
             )
             
@@ -198,57 +260,14 @@ class StatsLeaderboards(commands.Cog):
             await interaction.followup.send(f"❌ An error occurred: {str(e)}")
     
     @app_commands.command(name="top_players", description="View overall top players by level")
+    @app_commands.describe(page="Page to start on")
     @app_commands.guilds(GUILD)
-    async def top_players(self, interaction: discord.Interaction):
-        """Show the top 15 players by level with all their stats"""
+    async def top_players(self, interaction: discord.Interaction, page: int = 1):
+        """Show the top players by level, 15 per page"""
         await interaction.response.defer()
         
         try:
-            conn = sqlite3.connect('stats.db')
-            cursor = conn.cursor()
-            
-            # Get top 15 players by level
-            cursor.execute('''
-                SELECT user_id, username, level, health, strength, dexterity, constitution, intelligence, wisdom, charisma
-                FROM user_stats 
-                ORDER BY level DESC, health DESC
-                LIMIT 15
-            ''')
-            
-            results = cursor.fetchall()
-            conn.close()
-            
-            if not results:
-                await interaction.followup.send("❌ No player data found.")
-                return
-            
-            embed = discord.Embed(
-                title="🏆 Top Players",
-                description="Ranked by Level (then Health)",
-                color=0xffd700
-            )
-            
-            # Create a formatted leaderboard
-            leaderboard_text = ""
-            for i, (user_id, username, level, health, str_val, dex, con, int_val, wis, cha) in enumerate(results, 1):
-                # Try to get current member name
-                try:
-                    member = interaction.guild.get_member(user_id)
-                    display_name = member.display_name if member else username
-                except:
-                    display_name = username
-                
-                medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"**{i}.**"
-                leaderboard_text += f"{medal} **{display_name}** - Level {level} ({health} HP)\n"
-                
-                # Add a gap every 5 players for readability
-                if i % 5 == 0 and i < 15:
-                    leaderboard_text += "\n"
-            
-            embed.description = leaderboard_text
-            embed.set_footer(text="Use /stats [player] to view detailed stats • /my_ranking to see your position")
-            
-            await interaction.followup.send(embed=embed)
+            await self.send_leaderboard(interaction, 'overall', max(page, 1), TOP_PLAYERS_PAGE_SIZE)
             
         except Exception as e:
             logging.error(f"❌ Error in top_players command: {e}")
@@ -5,6 +5,7 @@ import sqlite3
 import logging
 
 from UTILS.CONFIGURATION import GUILD_ID
+from cogs._STATS_CACHE import STATS_CACHE
 GUILD = discord.Object(id=GUILD_ID)
 
 
@@ -100,6 +101,8 @@ class StatsLeveling(commands.Cog):
             ''', (new_level, new_health, user_id))
             conn.commit()
             conn.close()
+            
+            STATS_CACHE.update_fields(user_id, level=new_level, health=new_health)
             return True
             
         except Exception as e:
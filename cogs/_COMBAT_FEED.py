@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import time
+from collections import deque
+
+import discord
+
+from UTILS.CONFIGURATION import COMBAT_FEED_LINES, COMBAT_FEED_EDIT_INTERVAL, COMBAT_FEED_PING_COOLDOWN
+
+
+class CombatFeed:
+    """
+    One live combat message per channel, showing the latest actions.
+
+    Actions are appended in memory and flushed at most once per
+    COMBAT_FEED_EDIT_INTERVAL: a flush edits the live message in place, and
+    only reposts it at the bottom of the channel when other messages have
+    buried it. Edits never notify, so pings go out as a separate short
+    message, at most once per user per COMBAT_FEED_PING_COOLDOWN in a channel.
+    """
+
+    def __init__(self, bot, max_lines=COMBAT_FEED_LINES, interval=COMBAT_FEED_EDIT_INTERVAL,
+                 ping_cooldown=COMBAT_FEED_PING_COOLDOWN):
+        self.bot = bot
+        self.max_lines = max_lines
+        self.interval = interval
+        self.ping_cooldown = ping_cooldown
+        # channel_id: {'lines', 'pings', 'pinged', 'message', 'ping_message_id', 'task', 'last_flush'}
+        self.channels = {}
+        self.actions = 0
+        self.messages_sent = 0
+        self.edits = 0
+        self.deletes = 0
+        self.ping_messages = 0
+        self.pings = 0
+
+    def _get_state(self, channel_id):
+        state = self.channels.get(channel_id)
+        if state is None:
+            state = {
+                'lines': deque(maxlen=self.max_lines),
+                'pings': set(),
+                'pinged': {},  # user_id: monotonic time of their last ping here
+                'message': None,
+                'ping_message_id': None,
+                'task': None,
+                'last_flush': 0.0
+            }
+            self.channels[channel_id] = state
+        return state
+
+    def add(self, channel_id, line, ping_user_id=None):
+        """Queue a feed line; ping_user_id is mentioned on the next flush"""
+        state = self._get_state(channel_id)
+        state['lines'].append(f"<t:{int(time.time())}:T> {line}")
+        if ping_user_id:
+            state['pings'].add(ping_user_id)
+        self.actions += 1
+
+        if state['task'] is None or state['task'].done():
+            state['task'] = asyncio.create_task(self._flush_later(channel_id))
+
+    async def _flush_later(self, channel_id):
+        """Wait out the rest of the debounce interval, then flush everything queued meanwhile"""
+        state = self.channels[channel_id]
+        delay = state['last_flush'] + self.interval - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        # Lines added from here on schedule the next flush
+        state['task'] = None
+        state['last_flush'] = time.monotonic()
+        try:
+            await self.flush(channel_id)
+        except Exception as e:
+            logging.error(f"❌ Failed to update combat feed in channel {channel_id}: {e}")
+
+    def render(self, state):
+        embed = discord.Embed(
+            title="⚔️ Combat Feed",
+            description="\n".join(state['lines'])[-4096:],
+            color=0xff0000,
+            timestamp=discord.utils.utcnow()
+        )
+        embed.set_footer(text=f"Latest {len(state['lines'])} actions • /attack • /retreat • /odds")
+        return embed
+
+    async def flush(self, channel_id):
+        """Push the current feed to Discord, editing in place where possible"""
+        state = self.channels.get(channel_id)
+        channel = self.bot.get_channel(channel_id)
+        if not state or not channel:
+            self.channels.pop(channel_id, None)
+            return
+
+        await self._update_feed(channel, state)
+        await self._send_pings(channel, state)
+
+    async def _update_feed(self, channel, state):
+        embed = self.render(state)
+        message = state['message']
+
+        # Our own ping message below the feed doesn't count as burying it
+        at_bottom = message and channel.last_message_id in (message.id, state['ping_message_id'])
+        if at_bottom:
+            try:
+                await message.edit(embed=embed)
+                self.edits += 1
+                return
+            except discord.NotFound:
+                message = state['message'] = None
+
+        state['message'] = await channel.send(embed=embed)
+        self.messages_sent += 1
+
+        # Keep one live feed message per channel
+        if message:
+            try:
+                await message.delete()
+                self.deletes += 1
+            except discord.HTTPException:
+                pass
+
+    async def _send_pings(self, channel, state):
+        """Mention users who were handed a reaction window, unless they were pinged here recently"""
+        now = time.monotonic()
+        pings = [
+            user_id for user_id in state['pings']
+            if now - state['pinged'].get(user_id, float('-inf')) >= self.ping_cooldown
+        ]
+        state['pings'] = set()
+        if not pings:
+            return
+
+        for user_id in pings:
+            state['pinged'][user_id] = now
+        for user_id in [user_id for user_id, pinged_at in state['pinged'].items() if now - pinged_at >= self.ping_cooldown]:
+            del state['pinged'][user_id]
+
+        message = await channel.send(
+            content=f"{' '.join(f'<@{user_id}>' for user_id in pings)} ⚔️ You have a reaction window, see the combat feed above",
+            allowed_mentions=discord.AllowedMentions(users=True, roles=False, everyone=False)
+        )
+        state['ping_message_id'] = message.id
+        self.ping_messages += 1
+        self.pings += len(pings)
+
+    def stop(self):
+        """Cancel pending flushes"""
+        for state in self.channels.values():
+            if state['task']:
+                state['task'].cancel()
+                state['task'] = None
+
+    def get_metrics(self):
+        api_calls = self.messages_sent + self.edits + self.deletes + self.ping_messages
+        return {
+            'channels': len(self.channels),
+            'actions': self.actions,
+            'messages_sent': self.messages_sent,
+            'edits': self.edits,
+            'deletes': self.deletes,
+            'ping_messages': self.ping_messages,
+            'pings': self.pings,
+            'api_calls': api_calls,
+            'actions_per_api_call': self.actions / api_calls if api_calls else 0.0
+        }
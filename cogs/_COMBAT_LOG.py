@@ -0,0 +1,221 @@
+import sqlite3
+import logging
+from datetime import datetime, timedelta
+
+try:
+    from UTILS.CONFIGURATION import COMBAT_LOG_RETENTION_DAYS, COMBAT_LOG_PRUNE_BATCH_SIZE
+except ImportError:
+    COMBAT_LOG_RETENTION_DAYS = 30
+    COMBAT_LOG_PRUNE_BATCH_SIZE = 1000
+
+# Adds a batch's totals onto whatever is already rolled up for that user and day
+ROLLUP_UPSERT_SQL = '''
+    INSERT INTO combat_daily_stats
+        (user_id, day, attacks, hits, crits, damage_dealt, attacks_received, hits_taken, crits_taken, damage_taken)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(user_id, day) DO UPDATE SET
+        attacks = attacks + excluded.attacks,
+        hits = hits + excluded.hits,
+        crits = crits + excluded.crits,
+        damage_dealt = damage_dealt + excluded.damage_dealt,
+        attacks_received = attacks_received + excluded.attacks_received,
+        hits_taken = hits_taken + excluded.hits_taken,
+        crits_taken = crits_taken + excluded.crits_taken,
+        damage_taken = damage_taken + excluded.damage_taken
+'''
+
+ROLLUP_COLUMNS = ['attacks', 'hits', 'crits', 'damage_dealt', 'attacks_received', 'hits_taken', 'crits_taken', 'damage_taken']
+
+
+# Running totals kept in step with every combat_log insert
+ATTACKER_TOTALS_SQL = '''
+    INSERT INTO combat_player_totals (user_id, attacks, hits, crits, damage_dealt, knockouts)
+    VALUES (:attacker_id, 1, :hit, :crit, :damage, :knockout)
+    ON CONFLICT(user_id) DO UPDATE SET
+        attacks = attacks + 1,
+        hits = hits + excluded.hits,
+        crits = crits + excluded.crits,
+        damage_dealt = damage_dealt + excluded.damage_dealt,
+        knockouts = knockouts + excluded.knockouts
+'''
+
+DEFENDER_TOTALS_SQL = '''
+    INSERT INTO combat_player_totals (user_id, attacks_received, hits_taken, crits_taken, damage_taken, times_knocked_out)
+    VALUES (:defender_id, 1, :hit, :crit, :damage, :knockout)
+    ON CONFLICT(user_id) DO UPDATE SET
+        attacks_received = attacks_received + 1,
+        hits_taken = hits_taken + excluded.hits_taken,
+        crits_taken = crits_taken + excluded.crits_taken,
+        damage_taken = damage_taken + excluded.damage_taken,
+        times_knocked_out = times_knocked_out + excluded.times_knocked_out
+'''
+
+PAIR_TOTALS_SQL = '''
+    INSERT INTO combat_pair_totals (attacker_id, defender_id, attacks, hits, crits, damage, knockouts)
+    VALUES (:attacker_id, :defender_id, 1, :hit, :crit, :damage, :knockout)
+    ON CONFLICT(attacker_id, defender_id) DO UPDATE SET
+        attacks = attacks + 1,
+        hits = hits + excluded.hits,
+        crits = crits + excluded.crits,
+        damage = damage + excluded.damage,
+        knockouts = knockouts + excluded.knockouts
+'''
+
+PLAYER_TOTAL_COLUMNS = ROLLUP_COLUMNS + ['knockouts', 'times_knocked_out']
+
+
+def record_combat_action(cursor, attacker_id, defender_id, damage, hit, critical_hit, knockout=False):
+    """Insert a combat_log row and bump the running totals on the caller's transaction"""
+    params = {
+        'attacker_id': attacker_id,
+        'defender_id': defender_id,
+        'damage': damage,
+        'hit': 1 if hit else 0,
+        'crit': 1 if critical_hit else 0,
+        'knockout': 1 if knockout else 0
+    }
+    cursor.execute('''
+        INSERT INTO combat_log (attacker_id, defender_id, damage, hit, critical_hit)
+        VALUES (:attacker_id, :defender_id, :damage, :hit, :crit)
+    ''', params)
+    cursor.execute(ATTACKER_TOTALS_SQL, params)
+    cursor.execute(DEFENDER_TOTALS_SQL, params)
+    cursor.execute(PAIR_TOTALS_SQL, params)
+
+
+def get_combat_record(user_id, rival_limit=3, db_path='stats.db'):
+    """
+    Get a player's lifetime combat totals plus their most frequent opponents.
+    Returns None if the player has never fought.
+    """
+    try:
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute(f'''
+            SELECT {', '.join(PLAYER_TOTAL_COLUMNS)}
+            FROM combat_player_totals
+            WHERE user_id = ?
+        ''', (user_id,))
+        row = cursor.fetchone()
+        if not row:
+            conn.close()
+            return None
+
+        # Both directions of every pairing, folded per opponent
+        cursor.execute('''
+            SELECT opponent_id, SUM(attacks_made), SUM(attacks_received), SUM(damage_dealt), SUM(damage_taken)
+            FROM (
+                SELECT defender_id AS opponent_id, attacks AS attacks_made, 0 AS attacks_received,
+                       damage AS damage_dealt, 0 AS damage_taken
+                FROM combat_pair_totals
+                WHERE attacker_id = :user_id
+
+                UNION ALL
+
+                SELECT attacker_id, 0, attacks, 0, damage
+                FROM combat_pair_totals
+                WHERE defender_id = :user_id
+            )
+            WHERE opponent_id != :user_id
+            GROUP BY opponent_id
+            ORDER BY SUM(attacks_made) + SUM(attacks_received) DESC
+            LIMIT :limit
+        ''', {'user_id': user_id, 'limit': rival_limit})
+        rivals = cursor.fetchall()
+        conn.close()
+
+    except Exception as e:
+        logging.error(f"❌ Failed to get combat record for user {user_id}: {e}")
+        return None
+
+    record = dict(zip(PLAYER_TOTAL_COLUMNS, row))
+    record['hit_rate'] = record['hits'] / record['attacks'] if record['attacks'] else 0.0
+    record['crit_rate'] = record['crits'] / record['attacks'] if record['attacks'] else 0.0
+    record['rivals'] = [
+        {
+            'user_id': opponent_id,
+            'attacks_made': attacks_made,
+            'attacks_received': attacks_received,
+            'damage_dealt': damage_dealt,
+            'damage_taken': damage_taken
+        }
+        for opponent_id, attacks_made, attacks_received, damage_dealt, damage_taken in rivals
+    ]
+    return record
+
+
+class CombatLogRetention:
+    """Rolls raw combat_log rows past the retention window into combat_daily_stats"""
+
+    def __init__(self, db_path='stats.db', retention_days=COMBAT_LOG_RETENTION_DAYS, batch_size=COMBAT_LOG_PRUNE_BATCH_SIZE):
+        self.db_path = db_path
+        self.retention_days = retention_days
+        self.batch_size = batch_size
+        self.last_run = None
+        self.last_error = None
+        self.rows_rolled_up = 0
+
+    def get_cutoff(self):
+        """combat_log timestamps are CURRENT_TIMESTAMP, i.e. UTC text"""
+        return (datetime.utcnow() - timedelta(days=self.retention_days)).strftime('%Y-%m-%d %H:%M:%S')
+
+    def prune_batch(self, cutoff):
+        """
+        Roll up and delete at most batch_size expired rows in one short transaction.
+        Returns the number of rows removed (0 when nothing is left to prune).
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, attacker_id, defender_id, damage, hit, critical_hit, substr(timestamp, 1, 10)
+                FROM combat_log
+                WHERE timestamp < ?
+                ORDER BY timestamp
+                LIMIT ?
+            ''', (cutoff, self.batch_size))
+            rows = cursor.fetchall()
+            if not rows:
+                return 0
+
+            totals = {}
+            for _, attacker_id, defender_id, damage, hit, critical_hit, day in rows:
+                damage = damage or 0
+                attacker = totals.setdefault((attacker_id, day), dict.fromkeys(ROLLUP_COLUMNS, 0))
+                attacker['attacks'] += 1
+                attacker['hits'] += 1 if hit else 0
+                attacker['crits'] += 1 if critical_hit else 0
+                attacker['damage_dealt'] += damage
+
+                defender = totals.setdefault((defender_id, day), dict.fromkeys(ROLLUP_COLUMNS, 0))
+                defender['attacks_received'] += 1
+                defender['hits_taken'] += 1 if hit else 0
+                defender['crits_taken'] += 1 if critical_hit else 0
+                defender['damage_taken'] += damage
+
+            cursor.executemany(ROLLUP_UPSERT_SQL, [
+                (user_id, day, *(counts[column] for column in ROLLUP_COLUMNS))
+                for (user_id, day), counts in totals.items()
+            ])
+            cursor.executemany('DELETE FROM combat_log WHERE id = ?', [(row[0],) for row in rows])
+            conn.commit()
+
+            self.rows_rolled_up += len(rows)
+            return len(rows)
+
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def get_status(self):
+        """Get retention settings and progress"""
+        return {
+            'retention_days': self.retention_days,
+            'batch_size': self.batch_size,
+            'last_run': self.last_run,
+            'last_error': self.last_error,
+            'rows_rolled_up': self.rows_rolled_up
+        }
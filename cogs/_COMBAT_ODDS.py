@@ -0,0 +1,143 @@
+import logging
+
+from cogs.STATS_CORE import STANDARD_ARRAY
+
+MAX_LEVEL = 20
+
+
+def ability_modifier(score):
+    """Same modifier as StatsCombatCore.get_ability_modifier"""
+    return (score - 10) // 2
+
+
+def rules_fingerprint(rules):
+    """Hashable snapshot of the combat rules the tables were built from"""
+    return tuple(sorted(rules.items()))
+
+
+class CombatOdds:
+    """
+    Exact attack odds for the rules in COMBAT_RULES.
+
+    Hit chance depends only on the d20 target number (target AC - attack bonus)
+    and damage only on the attacker's damage bonus, so both are tabulated once
+    per distinct value. Every standard-array (STR, level) x (DEX, level) matchup
+    is then indexed at build time, making lookups a single dict access.
+    """
+
+    def __init__(self, rules):
+        self.rules = dict(rules)
+        self.fingerprint = rules_fingerprint(rules)
+        self._hit_table = {}  # needed roll: (hit_chance, crit_chance)
+        self._damage_table = {}  # damage bonus: {'normal': [(damage, p)], 'critical': [...], 'expected_normal': x, 'expected_critical': y}
+        self._matchups = {}  # (strength, attacker_level, dexterity, defender_level): odds dict
+        self.build()
+
+    # Modifiers, mirroring make_attack_roll / calculate_damage
+
+    def attack_bonus(self, strength, level):
+        return ability_modifier(strength) + self.rules['base_proficiency'] + (level - 1) // self.rules['proficiency_levels']
+
+    def target_ac(self, dexterity, level):
+        return self.rules['base_ac'] + ability_modifier(dexterity) + (level - 1) // self.rules['natural_armor_levels']
+
+    def damage_bonus(self, strength, level):
+        return ability_modifier(strength) + (level - 1) // self.rules['damage_bonus_levels']
+
+    # Table construction
+
+    def _hit_row(self, needed):
+        """Chance that 1d20 hits when the roll must be at least `needed`"""
+        row = self._hit_table.get(needed)
+        if row is None:
+            die = self.rules['attack_die']
+            # A natural max always hits; a natural 1 always misses
+            hits = sum(1 for roll in range(1, die + 1) if roll == die or (roll != 1 and roll >= needed))
+            row = (hits / die, 1 / die)
+            self._hit_table[needed] = row
+        return row
+
+    def _damage_row(self, bonus):
+        """Exact damage distributions for a normal hit and a critical hit"""
+        row = self._damage_table.get(bonus)
+        if row is None:
+            die = self.rules['damage_die']
+            normal = {}
+            for face in range(1, die + 1):
+                damage = max(self.rules['min_damage'], face + bonus)
+                normal[damage] = normal.get(damage, 0) + 1 / die
+
+            critical = {}
+            for damage, chance in normal.items():
+                critical_damage = damage * self.rules['crit_multiplier']
+                critical[critical_damage] = critical.get(critical_damage, 0) + chance
+
+            row = {
+                'normal': sorted(normal.items()),
+                'critical': sorted(critical.items()),
+                'expected_normal': sum(damage * chance for damage, chance in normal.items()),
+                'expected_critical': sum(damage * chance for damage, chance in critical.items())
+            }
+            self._damage_table[bonus] = row
+        return row
+
+    def _compute(self, strength, attacker_level, dexterity, defender_level):
+        needed = self.target_ac(dexterity, defender_level) - self.attack_bonus(strength, attacker_level)
+        hit_chance, crit_chance = self._hit_row(needed)
+        damage = self._damage_row(self.damage_bonus(strength, attacker_level))
+        normal_chance = hit_chance - crit_chance
+
+        # Damage per attack, including misses as 0
+        distribution = {0: 1 - hit_chance}
+        for amount, chance in damage['normal']:
+            distribution[amount] = distribution.get(amount, 0) + normal_chance * chance
+        for amount, chance in damage['critical']:
+            distribution[amount] = distribution.get(amount, 0) + crit_chance * chance
+
+        return {
+            'needed_roll': needed,
+            'hit_chance': hit_chance,
+            'crit_chance': crit_chance,
+            'expected_damage': normal_chance * damage['expected_normal'] + crit_chance * damage['expected_critical'],
+            'damage_on_hit': (damage['normal'][0][0], damage['normal'][-1][0]),
+            'damage_on_crit': (damage['critical'][0][0], damage['critical'][-1][0]),
+            'distribution': sorted(distribution.items())
+        }
+
+    def build(self):
+        """Precompute every standard-array matchup at levels 1-20"""
+        self._hit_table = {}
+        self._damage_table = {}
+        self._matchups = {}
+
+        scores = sorted(set(STANDARD_ARRAY))
+        levels = range(1, MAX_LEVEL + 1)
+        for strength in scores:
+            for attacker_level in levels:
+                for dexterity in scores:
+                    for defender_level in levels:
+                        key = (strength, attacker_level, dexterity, defender_level)
+                        self._matchups[key] = self._compute(*key)
+
+        logging.info(f"✅ Combat odds tables built: {len(self._matchups)} matchups, "
+                     f"{len(self._hit_table)} hit rows, {len(self._damage_table)} damage rows")
+
+    def get_odds(self, attacker_stats, defender_stats):
+        """Odds for one attack between two stat rows"""
+        key = (
+            attacker_stats['strength'], attacker_stats.get('level', 1),
+            defender_stats['dexterity'], defender_stats.get('level', 1)
+        )
+        odds = self._matchups.get(key)
+        if odds is None:
+            # Scores outside the standard array are computed once and then cached
+            odds = self._compute(*key)
+            self._matchups[key] = odds
+        return odds
+
+    def get_metrics(self):
+        return {
+            'matchups': len(self._matchups),
+            'hit_rows': len(self._hit_table),
+            'damage_rows': len(self._damage_table)
+        }
@@ -0,0 +1,113 @@
+import time
+import logging
+from datetime import datetime, timedelta
+
+# Seconds between full sweeps of a store; lookups expire entries lazily in between
+COOLDOWN_SWEEP_INTERVAL = 300
+
+
+class CooldownStore:
+    """
+    Per-user cooldowns stored as a single monotonic expiry per key.
+    Expired entries are dropped on lookup and by a periodic sweep on writes,
+    so the store only ever holds users who are actually on cooldown.
+    """
+
+    def __init__(self, name, sweep_interval=COOLDOWN_SWEEP_INTERVAL):
+        self.name = name
+        self.sweep_interval = sweep_interval
+        self._expiries = {}  # key: time.monotonic() deadline
+        self._last_sweep = time.monotonic()
+        self.expired = 0
+
+    def set(self, key, seconds):
+        """Start (or restart) a cooldown lasting `seconds`"""
+        now = time.monotonic()
+        self._expiries[key] = now + seconds
+        if now - self._last_sweep >= self.sweep_interval:
+            self.sweep()
+
+    def set_until(self, key, when):
+        """Start a cooldown ending at a wall-clock datetime (used when loading saved data)"""
+        seconds = (when - datetime.now()).total_seconds()
+        if seconds > 0:
+            self.set(key, seconds)
+        else:
+            self._expiries.pop(key, None)
+
+    def remaining(self, key):
+        """Seconds left on the cooldown, 0.0 if none"""
+        deadline = self._expiries.get(key)
+        if deadline is None:
+            return 0.0
+
+        left = deadline - time.monotonic()
+        if left <= 0:
+            del self._expiries[key]
+            self.expired += 1
+            return 0.0
+        return left
+
+    def is_active(self, key):
+        return self.remaining(key) > 0
+
+    def expires_at(self, key):
+        """Wall-clock end of the cooldown for display, or None"""
+        left = self.remaining(key)
+        return datetime.now() + timedelta(seconds=left) if left else None
+
+    def clear(self, key):
+        """End a cooldown early"""
+        self._expiries.pop(key, None)
+
+    def sweep(self):
+        """Drop every expired entry; returns how many were removed"""
+        now = time.monotonic()
+        stale = [key for key, deadline in self._expiries.items() if deadline <= now]
+        for key in stale:
+            del self._expiries[key]
+        self.expired += len(stale)
+        self._last_sweep = now
+        return len(stale)
+
+    def export(self):
+        """Active cooldowns as {key: wall-clock expiry datetime}, for cogs that persist them"""
+        self.sweep()
+        return {key: self.expires_at(key) for key in list(self._expiries)}
+
+    def __len__(self):
+        return len(self._expiries)
+
+    def get_metrics(self):
+        return {
+            'active': len(self._expiries),
+            'expired': self.expired
+        }
+
+
+class CooldownService:
+    """Registry of named cooldown stores shared by every cog"""
+
+    def __init__(self):
+        self._stores = {}
+
+    def get_store(self, name, sweep_interval=COOLDOWN_SWEEP_INTERVAL):
+        """Get the store for name, creating it on first use"""
+        store = self._stores.get(name)
+        if store is None:
+            store = CooldownStore(name, sweep_interval)
+            self._stores[name] = store
+            logging.debug(f"Created cooldown store '{name}'")
+        return store
+
+    def sweep_all(self):
+        """Sweep every store; returns the total number of entries removed"""
+        return sum(store.sweep() for store in self._stores.values())
+
+    def get_metrics(self):
+        """Get per-store cooldown counts for monitoring"""
+        return {name: store.get_metrics() for name, store in self._stores.items()}
+
+
+# Shared by combat, looting, parties and states
+COOLDOWNS = CooldownService()
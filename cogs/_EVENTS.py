@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import time
+from collections import namedtuple
+
+from UTILS.CONFIGURATION import EVENT_QUEUE_SIZE
+
+# Event types. Subscribers register per type and receive the immutable tuple.
+DamageApplied = namedtuple('DamageApplied', 'user_id amount old_health new_health hits')  # hits: ((attacker_id, critical_hit), ...)
+BecameUnconscious = namedtuple('BecameUnconscious', 'user_id old_health new_health')
+Healed = namedtuple('Healed', 'user_id amount old_health new_health')
+
+EVENT_TYPES = (DamageApplied, BecameUnconscious, Healed)
+
+
+class Subscription:
+    """One subscriber's bounded queue and the worker task draining it"""
+
+    def __init__(self, event_type, handler, name, max_queue):
+        self.event_type = event_type
+        self.handler = handler
+        self.name = name
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self.task = None
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.handler_seconds = 0.0
+
+    def offer(self, event):
+        """Enqueue without blocking the publisher; a full queue drops the event"""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 100 == 0:
+                logging.warning(f"⚠️ Event subscriber {self.name} is falling behind; {self.dropped} events dropped")
+            return
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    async def run(self):
+        while True:
+            event = await self.queue.get()
+            started = time.perf_counter()
+            try:
+                result = self.handler(event)
+                if asyncio.iscoroutine(result):
+                    await result
+                self.delivered += 1
+            except Exception as e:
+                self.errors += 1
+                logging.error(f"❌ Event subscriber {self.name} failed on {type(event).__name__}: {e}")
+            finally:
+                self.handler_seconds += time.perf_counter() - started
+                self.queue.task_done()
+
+    def get_metrics(self):
+        return {
+            'event': self.event_type.__name__,
+            'queued': self.queue.qsize(),
+            'max_depth': self.max_depth,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'avg_handler_ms': self.handler_seconds / self.delivered * 1000 if self.delivered else 0.0
+        }
+
+
+class EventBus:
+    """
+    In-process publish/subscribe for cross-cog events.
+
+    publish() is synchronous and never blocks, so it can be called from the
+    database helpers; each subscriber drains its own bounded queue in a
+    worker task, so a slow subscriber only delays (or drops) its own events.
+    """
+
+    def __init__(self, max_queue=EVENT_QUEUE_SIZE):
+        self.max_queue = max_queue
+        self._subscriptions = {event_type: [] for event_type in EVENT_TYPES}
+        self._published = {event_type.__name__: 0 for event_type in EVENT_TYPES}
+        self._loop = None
+
+    def subscribe(self, event_type, handler, name=None, max_queue=None):
+        """Register a sync or async handler for one event type; returns the subscription"""
+        if event_type not in self._subscriptions:
+            raise ValueError(f"Unknown event type: {event_type}")
+
+        subscription = Subscription(event_type, handler, name or getattr(handler, '__qualname__', repr(handler)),
+                                    max_queue or self.max_queue)
+        self._subscriptions[event_type].append(subscription)
+        self._start_worker(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Stop a subscription; events still queued for it are discarded"""
+        subscribers = self._subscriptions.get(subscription.event_type, [])
+        if subscription in subscribers:
+            subscribers.remove(subscription)
+        if subscription.task:
+            subscription.task.cancel()
+            subscription.task = None
+
+    def _start_worker(self, subscription):
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Started by start() once the loop is running
+        subscription.task = self._loop.create_task(subscription.run())
+
+    def start(self):
+        """Start workers for subscriptions registered before the event loop was running"""
+        for subscribers in self._subscriptions.values():
+            for subscription in subscribers:
+                if subscription.task is None:
+                    self._start_worker(subscription)
+
+    def stop(self):
+        """Cancel every worker task"""
+        for subscribers in self._subscriptions.values():
+            for subscription in subscribers:
+                if subscription.task:
+                    subscription.task.cancel()
+                    subscription.task = None
+
+    def publish(self, event):
+        """Fan an event out to its subscribers without waiting for them"""
+        subscribers = self._subscriptions.get(type(event))
+        if subscribers is None:
+            raise ValueError(f"Unknown event type: {type(event).__name__}")
+        self._published[type(event).__name__] += 1
+        if not subscribers:
+            return
+
+        # asyncio queues are not thread-safe; hop onto the loop when called from an executor thread
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if self._loop and running_loop is not self._loop and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._deliver, subscribers, event)
+        else:
+            self._deliver(subscribers, event)
+
+    def _deliver(self, subscribers, event):
+        for subscription in list(subscribers):
+            subscription.offer(event)
+
+    def get_metrics(self):
+        return {
+            'published': dict(self._published),
+            'subscribers': {
+                subscription.name: subscription.get_metrics()
+                for subscribers in self._subscriptions.values()
+                for subscription in subscribers
+            }
+        }
+
+
+EVENT_BUS = EventBus()
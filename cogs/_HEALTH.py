@@ -0,0 +1,132 @@
+import sqlite3
+import logging
+
+from cogs._STATS_CACHE import STATS_CACHE
+from cogs._EVENTS import EVENT_BUS, DamageApplied, BecameUnconscious, Healed
+
+# Consciousness transitions reported with every health change
+KNOCKED_OUT = "knocked_out"
+REVIVED = "revived"
+
+# SET expressions all see the pre-update row, so previous_health captures the old
+# value and the clamped new value in the same statement. A NULL bound disables
+# that side of the clamp.
+HEALTH_DELTA_SQL = '''
+    UPDATE user_stats
+    SET previous_health = health,
+        health = CASE
+            WHEN :max_health IS NOT NULL AND health + :delta > :max_health THEN :max_health
+            WHEN :min_health IS NOT NULL AND health + :delta < :min_health THEN :min_health
+            ELSE health + :delta
+        END
+    WHERE user_id = :user_id
+    RETURNING previous_health, health
+'''
+
+def get_transition(old_health, new_health):
+    """Classify a health change by whether it crossed the consciousness threshold"""
+    if old_health > 0 and new_health <= 0:
+        return KNOCKED_OUT
+    if old_health <= 0 and new_health > 0:
+        return REVIVED
+    return None
+
+
+def _execute_delta(cursor, user_id, delta, min_health=None, max_health=None, hits=()):
+    """Run the single-statement update and build the change record"""
+    cursor.execute(HEALTH_DELTA_SQL, {
+        'user_id': user_id,
+        'delta': delta,
+        'min_health': min_health,
+        'max_health': max_health
+    })
+    row = cursor.fetchone()
+    if not row:
+        return None
+
+    old_health, new_health = row
+    return {
+        'user_id': user_id,
+        'old_health': old_health,
+        'new_health': new_health,
+        'requested': delta,
+        'applied': new_health - old_health,
+        'transition': get_transition(old_health, new_health),
+        'hits': tuple(hits)
+    }
+
+
+def _publish(changes):
+    """Refresh the stats cache and publish health events"""
+    for change in changes:
+        STATS_CACHE.update_fields(change['user_id'], health=change['new_health'])
+
+        user_id, old_health, new_health = change['user_id'], change['old_health'], change['new_health']
+        if change['applied'] < 0:
+            EVENT_BUS.publish(DamageApplied(user_id, -change['applied'], old_health, new_health, change['hits']))
+        elif change['applied'] > 0:
+            EVENT_BUS.publish(Healed(user_id, change['applied'], old_health, new_health))
+        if change['transition'] == KNOCKED_OUT:
+            EVENT_BUS.publish(BecameUnconscious(user_id, old_health, new_health))
+
+        if change['transition']:
+            logging.info(f"🩺 User {user_id} {change['transition']}: {old_health} → {new_health} HP")
+
+
+def apply_health_delta(user_id, delta, min_health=None, max_health=None, db_path='stats.db', hits=()):
+    """
+    Atomically add delta to a user's health, optionally clamped.
+    hits lists the (attacker_id, critical_hit) attacks that caused damage.
+    Returns the change record, or None if the user has no stats.
+    """
+    try:
+        with sqlite3.connect(db_path) as conn:
+            change = _execute_delta(conn.cursor(), int(user_id), int(delta), min_health, max_health, hits)
+        conn.close()
+
+    except Exception as e:
+        logging.error(f"❌ Failed to apply health change for user {user_id}: {e}")
+        return None
+
+    if change is None:
+        logging.warning(f"No user stats found for user {user_id}")
+        return None
+
+    _publish([change])
+    return change
+
+
+def apply_health_deltas(deltas, db_path='stats.db', in_transaction=None, hits_by_user=None):
+    """
+    Apply several health deltas in one transaction.
+    Each entry is (user_id, delta) or (user_id, delta, min_health, max_health).
+    hits_by_user maps user_id to the (attacker_id, critical_hit) attacks behind its delta.
+    in_transaction(cursor, changes), if given, runs before the commit so related
+    writes land atomically with the health changes.
+    Returns the change records for users that exist ([] if none do), or None on
+    error, in which case nothing is applied.
+    """
+    changes = []
+    try:
+        with sqlite3.connect(db_path) as conn:
+            cursor = conn.cursor()
+            for entry in deltas:
+                user_id, delta = int(entry[0]), int(entry[1])
+                min_health = entry[2] if len(entry) > 2 else None
+                max_health = entry[3] if len(entry) > 3 else None
+
+                change = _execute_delta(cursor, user_id, delta, min_health, max_health,
+                                        (hits_by_user or {}).get(user_id, ()))
+                if change is not None:
+                    changes.append(change)
+
+            if in_transaction:
+                in_transaction(cursor, changes)
+        conn.close()
+
+    except Exception as e:
+        logging.error(f"❌ Failed to apply batched health changes: {e}")
+        return None
+
+    _publish(changes)
+    return changes
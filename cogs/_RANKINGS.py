@@ -0,0 +1,194 @@
+import sqlite3
+import bisect
+import logging
+
+from cogs._STATS_CACHE import STATS_CACHE
+
+RANKED_STATS = ['level', 'health', 'strength', 'dexterity', 'constitution', 'intelligence', 'wisdom', 'charisma']
+
+# Sort columns for each materialized leaderboard, highest first
+LEADERBOARD_ORDERS = {stat: (stat,) for stat in RANKED_STATS}
+LEADERBOARD_ORDERS['overall'] = ('level', 'health')
+
+# Dirty users are re-read in chunks to stay under SQLite's bound-parameter limit
+DIRTY_FETCH_CHUNK_SIZE = 500
+
+
+def _descending(value):
+    # NULLs sort last, matching SQLite's ORDER BY ... DESC
+    return -value if value is not None else float('inf')
+
+
+class LeaderboardCache:
+    """
+    Fully sorted in-memory leaderboards, one per stat plus an overall board.
+    Loaded with one scan, then kept current from StatsCache write notifications
+    so pages beyond the top entries never rescan user_stats.
+    """
+
+    def __init__(self, db_path='stats.db'):
+        self.db_path = db_path
+        self._rows = {}
+        self._boards = {name: [] for name in LEADERBOARD_ORDERS}
+        self._dirty = set()
+        self.loaded = False
+        self.incremental_updates = 0
+        STATS_CACHE.add_write_listener(self._on_stats_write)
+
+    def _sort_key(self, board, user_id, row):
+        return tuple(_descending(row.get(column)) for column in LEADERBOARD_ORDERS[board]) + (user_id,)
+
+    def load(self):
+        """Build every board from a single scan of user_stats"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT user_id, username, {', '.join(RANKED_STATS)} FROM user_stats")
+            rows = cursor.fetchall()
+            conn.close()
+
+        except Exception as e:
+            logging.error(f"❌ Failed to load leaderboards: {e}")
+            self.loaded = False
+            return False
+
+        self._rows = {row['user_id']: dict(row) for row in rows}
+        self._boards = {
+            board: sorted(self._sort_key(board, user_id, row) for user_id, row in self._rows.items())
+            for board in LEADERBOARD_ORDERS
+        }
+        self._dirty = set()
+        self.loaded = True
+        logging.info(f"✅ Leaderboards loaded with {len(self._rows)} players")
+        return True
+
+    def _remove(self, user_id):
+        row = self._rows.pop(user_id, None)
+        if row is None:
+            return
+        for board, keys in self._boards.items():
+            index = bisect.bisect_left(keys, self._sort_key(board, user_id, row))
+            if index < len(keys) and keys[index][-1] == user_id:
+                del keys[index]
+
+    def _insert(self, user_id, row):
+        self._rows[user_id] = row
+        for board, keys in self._boards.items():
+            bisect.insort(keys, self._sort_key(board, user_id, row))
+
+    def _on_stats_write(self, user_id, fields):
+        """StatsCache listener: reposition the user, or mark them for a re-read"""
+        if not self.loaded:
+            return
+        if user_id is None:
+            self.loaded = False
+            return
+
+        row = self._rows.get(user_id)
+        if fields is None or row is None:
+            self._dirty.add(user_id)
+            return
+
+        changed = {column: value for column, value in fields.items() if column in row}
+        if not changed:
+            return
+
+        self._remove(user_id)
+        row.update(changed)
+        self._insert(user_id, row)
+        self.incremental_updates += 1
+
+    def _flush_dirty(self):
+        """Re-read users whose rows were replaced since the last read"""
+        dirty, self._dirty = self._dirty, set()
+        dirty = list(dirty)
+
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            fresh = {}
+            for start in range(0, len(dirty), DIRTY_FETCH_CHUNK_SIZE):
+                chunk = dirty[start:start + DIRTY_FETCH_CHUNK_SIZE]
+                cursor.execute(
+                    f"SELECT user_id, username, {', '.join(RANKED_STATS)} FROM user_stats "
+                    f"WHERE user_id IN ({', '.join('?' * len(chunk))})",
+                    chunk
+                )
+                fresh.update((row['user_id'], dict(row)) for row in cursor.fetchall())
+            conn.close()
+
+        except Exception as e:
+            logging.error(f"❌ Failed to refresh leaderboard entries: {e}")
+            self._dirty.update(dirty)
+            return
+
+        for user_id in dirty:
+            self._remove(user_id)
+            if user_id in fresh:
+                self._insert(user_id, fresh[user_id])
+        self.incremental_updates += len(dirty)
+
+    def get_page(self, board, page=1, page_size=10):
+        """
+        Get one page of a board as (entries, total_players). Each entry is the
+        player's cached row plus its 1-based 'position' on the board.
+        """
+        if not self.loaded and not self.load():
+            return [], 0
+        if self._dirty:
+            self._flush_dirty()
+
+        keys = self._boards[board]
+        start = (max(page, 1) - 1) * page_size
+        entries = []
+        for position, key in enumerate(keys[start:start + page_size], start + 1):
+            entry = dict(self._rows[key[-1]])
+            entry['position'] = position
+            entries.append(entry)
+        return entries, len(keys)
+
+    def get_ranks(self, user_id):
+        """
+        Get {board: rank} for a player, or None if they have no stats.
+        Ranks are competition ranks (players strictly ahead + 1), so tied players
+        share a rank; the user_id tie-break only orders the pages.
+        """
+        if not self.loaded and not self.load():
+            return None
+        if self._dirty:
+            self._flush_dirty()
+
+        row = self._rows.get(user_id)
+        if row is None:
+            return None
+        # Replacing the user_id tie-break with -inf sorts ahead of every tied player
+        return {
+            board: bisect.bisect_left(keys, self._sort_key(board, user_id, row)[:-1] + (float('-inf'),)) + 1
+            for board, keys in self._boards.items()
+        }
+
+    @property
+    def total_players(self):
+        return len(self._rows)
+
+    def get_percentile(self, rank):
+        """Share of players ranked at or above this rank, as a 'top X%' figure"""
+        if not self._rows:
+            return 0.0
+        return rank / len(self._rows) * 100
+
+    def get_metrics(self):
+        """Get leaderboard cache state for monitoring"""
+        return {
+            'players': len(self._rows),
+            'boards': len(self._boards),
+            'dirty': len(self._dirty),
+            'incremental_updates': self.incremental_updates,
+            'loaded': self.loaded
+        }
+
+
+# Shared by the leaderboard commands; fed by STATS_CACHE write notifications
+LEADERBOARDS = LeaderboardCache()
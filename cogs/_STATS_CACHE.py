@@ -0,0 +1,106 @@
+import sqlite3
+import logging
+
+
+class StatsCache:
+    """In-process write-through cache of user_stats rows keyed by user_id"""
+
+    def __init__(self, db_path='stats.db'):
+        self.db_path = db_path
+        self._rows = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.loaded = False
+        # Bumped on every write so derived caches (rankings) know to refresh
+        self.version = 0
+        self._write_listeners = []
+
+    def add_write_listener(self, callback):
+        """
+        Register callback(user_id, fields) for every write. fields is None when
+        the row was replaced, and user_id is None when the whole cache was reset.
+        """
+        if callback not in self._write_listeners:
+            self._write_listeners.append(callback)
+
+    def _notify(self, user_id, fields):
+        self.version += 1
+        for callback in list(self._write_listeners):
+            try:
+                callback(user_id, fields)
+            except Exception as e:
+                logging.error(f"❌ Stats cache write listener failed: {e}")
+
+    def load_all(self):
+        """Populate the cache with every user_stats row (called at startup)"""
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM user_stats')
+            rows = cursor.fetchall()
+            conn.close()
+
+            self._rows = {row['user_id']: dict(row) for row in rows}
+            self.loaded = True
+            self._notify(None, None)
+            logging.info(f"✅ Stats cache loaded with {len(self._rows)} users")
+            return True
+
+        except Exception as e:
+            logging.error(f"❌ Failed to load stats cache: {e}")
+            self._rows = {}
+            self.loaded = False
+            return False
+
+    def get(self, user_id):
+        """Return a copy of the cached row, or None on a miss"""
+        row = self._rows.get(user_id)
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return dict(row)
+
+    def put(self, user_id, stats):
+        """Store a full user_stats row"""
+        self._rows[user_id] = dict(stats)
+
+    def update_fields(self, user_id, **fields):
+        """Update individual columns of a cached row; uncached users are left alone"""
+        row = self._rows.get(user_id)
+        if row is not None:
+            row.update(fields)
+        self._notify(user_id, fields)
+
+    def invalidate(self, user_id):
+        """Drop a user so the next read goes back to the database"""
+        if self._rows.pop(user_id, None) is not None:
+            self.invalidations += 1
+        self._notify(user_id, None)
+
+    def clear(self):
+        """Drop every cached row"""
+        self.invalidations += len(self._rows)
+        self._rows = {}
+        self.loaded = False
+        self._notify(None, None)
+
+    def get_metrics(self):
+        """Get hit/miss counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._rows),
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            'loaded': self.loaded,
+            'version': self.version
+        }
+
+
+# Shared by every cog and helper that reads or writes user_stats
+STATS_CACHE = StatsCache()
@@ -0,0 +1,127 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+
+
+class TimerHeap:
+    """
+    Keyed one-shot timers on a min-heap, served by a single task that sleeps
+    until the earliest deadline. Nothing wakes up while no timers are pending.
+    """
+
+    def __init__(self, name='timers'):
+        self.name = name
+        self._heap = []  # (deadline, seq, key); cancelled entries are skipped lazily
+        self._entries = {}  # key: (deadline, seq, callback)
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._firing = set()  # callback tasks still running; held so they aren't garbage collected
+        self.fired = 0
+        self.cancelled = 0
+
+    def schedule(self, key, delay, callback):
+        """Call `await callback(key)` after delay seconds, replacing any timer for key"""
+        deadline = time.monotonic() + delay
+        seq = next(self._seq)
+        self._entries[key] = (deadline, seq, callback)
+        heapq.heappush(self._heap, (deadline, seq, key))
+
+        # Only a new earliest deadline changes how long the runner should sleep
+        if self._heap[0][1] == seq:
+            self._wakeup.set()
+        self._ensure_running()
+
+    def cancel(self, key):
+        """Cancel the timer for key; returns True if one was pending"""
+        if self._entries.pop(key, None) is None:
+            return False
+
+        self.cancelled += 1
+        if self._heap and self._heap[0][2] == key:
+            self._wakeup.set()
+        elif len(self._heap) > 2 * len(self._entries) + 64:
+            self._compact()
+        return True
+
+    def remaining(self, key):
+        """Seconds until key fires, or None if it is not scheduled"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return max(0.0, entry[0] - time.monotonic())
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stop(self):
+        """Cancel the runner and any callbacks still running, and drop every pending timer"""
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        for task in list(self._firing):
+            task.cancel()
+        self._firing.clear()
+        self._heap = []
+        self._entries = {}
+
+    def get_metrics(self):
+        """Get timer counts for monitoring"""
+        return {
+            'pending': len(self._entries),
+            'heap_size': len(self._heap),
+            'fired': self.fired,
+            'cancelled': self.cancelled,
+            'firing': len(self._firing),
+            'running': bool(self._task and not self._task.done())
+        }
+
+    def _is_live(self, heap_entry):
+        _, seq, key = heap_entry
+        entry = self._entries.get(key)
+        return entry is not None and entry[1] == seq
+
+    def _compact(self):
+        self._heap = [heap_entry for heap_entry in self._heap if self._is_live(heap_entry)]
+        heapq.heapify(self._heap)
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while True:
+            while self._heap and not self._is_live(self._heap[0]):
+                heapq.heappop(self._heap)
+
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = self._heap[0][0] - time.monotonic()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            _, _, key = heapq.heappop(self._heap)
+            _, _, callback = self._entries.pop(key)
+            self.fired += 1
+            # Fire in its own task so a slow callback never delays the next deadline
+            task = asyncio.create_task(self._fire(key, callback))
+            self._firing.add(task)
+            task.add_done_callback(self._firing.discard)
+
+    async def _fire(self, key, callback):
+        try:
+            await callback(key)
+        except Exception as e:
+            logging.error(f"❌ {self.name} timer for {key} failed: {e}")